@@ -0,0 +1 @@
+"""Offline benchmarks for the agent loop (run with python -m benchmarks.<name>)"""
@@ -0,0 +1,215 @@
+"""
+Load-test the agent loop against local stand-in servers.
+
+    python -m benchmarks.bench_agent --target langgraph --users 20 --turns 4
+
+Targets:
+  openai           main.get_travel_agent_response (raw OpenAI client, threads)
+  langgraph        the react agent from langchain/main.py via agent.invoke (threads)
+  langgraph-async  the same agent via the ainvoke runner chat_ui uses (asyncio tasks)
+
+Reports p50/p95/p99 turn latency, throughput, prompt/completion tokens per
+LLM call, the share of prompt tokens a prefix cache would serve and memory
+growth per conversation thread.
+"""
+import argparse
+import asyncio
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.mock_servers import MockConfig, MockServers
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+QUESTIONS = [
+    "What's the weather like in Paris?",
+    "Find hotels in London for next month",
+    "Help me plan a 5-day trip to Italy",
+    "Help me find flights from New York to Tokyo",
+    "What's the weather like in Rome?",
+    "I have a $2000 budget for a week-long trip, where should I go?",
+]
+
+
+def percentiles(samples):
+    if len(samples) < 2:
+        value = samples[0] if samples else 0.0
+        return {"p50": value, "p95": value, "p99": value}
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {"p50": cuts[49], "p95": cuts[94], "p99": cuts[98]}
+
+
+def load_langgraph_cli():
+    """Import langchain/main.py under another name (the folder shadows the langchain package)"""
+    spec = importlib.util.spec_from_file_location("travel_langgraph_cli", os.path.join(REPO_ROOT, "langchain", "main.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_threads(users, turns, make_session):
+    """Each user runs its turns sequentially on its own thread"""
+    def user(u):
+        turn = make_session(u)
+        latencies = []
+        for t in range(turns):
+            start = time.perf_counter()
+            turn(QUESTIONS[(u + t) % len(QUESTIONS)])
+            latencies.append(time.perf_counter() - start)
+        return latencies
+
+    with ThreadPoolExecutor(max_workers=users) as pool:
+        return [lat for lats in pool.map(user, range(users)) for lat in lats]
+
+
+# Each target imports/builds its front end, then returns (run(users, turns), checkpointer)
+# so that startup cost stays out of the measurements
+
+def bench_openai():
+    import main as cli
+    from travel_core.prompts import system_message
+
+    cli.get_client()
+
+    def make_session(u):
+        history = [system_message()]
+
+        def turn(question):
+            nonlocal history
+            history = cli.get_travel_agent_response(question, history)
+        return turn
+
+    return (lambda users, turns: run_threads(users, turns, make_session)), None
+
+
+def bench_langgraph():
+    agent = load_langgraph_cli().get_agent()
+
+    def make_session(u):
+        config = {"configurable": {"thread_id": f"bench-{uuid.uuid4().hex}"}}
+        return lambda question: agent.invoke({"messages": [{"role": "user", "content": question}]}, config=config)
+
+    return (lambda users, turns: run_threads(users, turns, make_session)), agent.checkpointer
+
+
+def bench_langgraph_async():
+    from travel_core.agent_runner import arun_agent
+
+    agent = load_langgraph_cli().get_agent()
+
+    async def user(u, turns):
+        thread_id = f"bench-{uuid.uuid4().hex}"
+        latencies = []
+        for t in range(turns):
+            start = time.perf_counter()
+            await arun_agent(agent, QUESTIONS[(u + t) % len(QUESTIONS)], thread_id)
+            latencies.append(time.perf_counter() - start)
+        return latencies
+
+    async def run_all(users, turns):
+        results = await asyncio.gather(*(user(u, turns) for u in range(users)))
+        return [lat for lats in results for lat in lats]
+
+    return (lambda users, turns: asyncio.run(run_all(users, turns))), agent.checkpointer
+
+
+TARGETS = {
+    "openai": bench_openai,
+    "langgraph": bench_langgraph,
+    "langgraph-async": bench_langgraph_async,
+}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", choices=sorted(TARGETS), default="langgraph")
+    parser.add_argument("--users", type=int, default=10, help="concurrent conversations")
+    parser.add_argument("--turns", type=int, default=4, help="turns per conversation")
+    parser.add_argument("--llm-latency-ms", type=float, default=300)
+    parser.add_argument("--tool-latency-ms", type=float, default=150)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of upstream requests failing with 500")
+    parser.add_argument("--serp-payload-kb", type=int, default=30)
+    parser.add_argument("--no-cache", action="store_true", help="disable the weather/SERP caches")
+    parser.add_argument("--json", help="also write the report to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    config = MockConfig(
+        llm_latency=args.llm_latency_ms / 1000,
+        tool_latency=args.tool_latency_ms / 1000,
+        error_rate=args.error_rate,
+        serp_payload_kb=args.serp_payload_kb,
+    )
+    workdir = tempfile.mkdtemp(prefix="travel-bench-")
+
+    with MockServers(config) as servers:
+        # Must be set before travel_core is imported: its singletons read the environment
+        os.environ.update(servers.env())
+        os.environ.update({
+            "CHECKPOINT_BACKEND": "sqlite",
+            "CHECKPOINT_DB_PATH": os.path.join(workdir, "checkpoints.sqlite3"),
+            "SERP_CACHE_PATH": os.path.join(workdir, "serp_cache.sqlite3"),
+            "SEMANTIC_CACHE_ENABLED": "0",
+        })
+        if args.no_cache:
+            os.environ.update({"WEATHER_CACHE_TTL": "0", "SERP_CACHE_TTL": "0"})
+        sys.path.insert(0, REPO_ROOT)
+
+        # The front ends print every tool call and answer; keep that off the terminal
+        with contextlib.redirect_stdout(io.StringIO()):
+            run, checkpointer = TARGETS[args.target]()
+            tracemalloc.start()
+            baseline = tracemalloc.get_traced_memory()[0]
+            start = time.perf_counter()
+            latencies = run(args.users, args.turns)
+            wall = time.perf_counter() - start
+        memory_growth = tracemalloc.get_traced_memory()[0] - baseline
+        tracemalloc.stop()
+
+        prompt_tokens = [r[0] for r in servers.usage.requests]
+        completion_tokens = [r[1] for r in servers.usage.requests]
+        cached_tokens = sum(r[3] for r in servers.usage.requests)
+        report = {
+            "target": args.target,
+            "users": args.users,
+            "turns_per_user": args.turns,
+            "turns": len(latencies),
+            "wall_seconds": wall,
+            "throughput_turns_per_second": len(latencies) / wall if wall else 0.0,
+            "turn_latency_seconds": percentiles(latencies),
+            "llm_calls": len(prompt_tokens),
+            "llm_calls_per_turn": len(prompt_tokens) / max(1, len(latencies)),
+            "prompt_tokens_per_call": {**percentiles(prompt_tokens), "max": max(prompt_tokens, default=0)},
+            "completion_tokens_total": sum(completion_tokens),
+            "prompt_tokens_total": sum(prompt_tokens),
+            "cached_prompt_token_ratio": cached_tokens / sum(prompt_tokens) if prompt_tokens else 0.0,
+            "upstream_tool_requests": dict(servers.usage.tool_requests),
+            "injected_errors": servers.usage.errors,
+            "python_heap_growth_per_thread_bytes": memory_growth / max(1, args.users),
+        }
+        if checkpointer is not None:
+            db = os.environ["CHECKPOINT_DB_PATH"]
+            size = sum(os.path.getsize(p) for p in (db, db + "-wal") if os.path.exists(p))
+            report["checkpoint_bytes_per_thread"] = size / max(1, args.users)
+
+    print(json.dumps(report, indent=2))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Import-time (cold start) profile of the entry points.
+
+    python -m benchmarks.import_profile --repeat 3 --top 10
+
+Each entry point is imported in a fresh interpreter under `-X importtime`.
+The report has the wall time of the import, the time of the first lazy
+build (OpenAI client / agent graph) and the slowest top-level packages by
+their own import time. The minimum over --repeat runs is reported.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.bench_agent import REPO_ROOT
+
+LOAD_LANGGRAPH_CLI = (
+    "import importlib.util;"
+    "spec = importlib.util.spec_from_file_location('travel_langgraph_cli', 'langchain/main.py');"
+    "cli = importlib.util.module_from_spec(spec); spec.loader.exec_module(cli)"
+)
+
+# name -> (import statement, first-use statement or None)
+ENTRY_POINTS = {
+    "main": ("import main as cli", "cli.get_client()"),
+    "langchain-cli": (LOAD_LANGGRAPH_CLI, "cli.get_agent()"),
+    "chat_ui": ("import chat_ui as cli", "cli.initialize_agent()"),
+}
+
+CHILD = """
+import time
+start = time.perf_counter()
+{load}
+loaded = time.perf_counter()
+{first_use}
+print("PROFILE", loaded - start, time.perf_counter() - loaded)
+"""
+
+
+def parse_importtime(stderr):
+    """Own import time in seconds per top-level package"""
+    by_package = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, _cumulative, name = line[len("import time:"):].split("|", 2)
+        if not self_us.strip().isdigit():
+            continue  # header line
+        package = name.strip().split(".")[0]
+        by_package[package] = by_package.get(package, 0.0) + int(self_us) / 1e6
+    return by_package
+
+
+def profile_once(load, first_use, env):
+    code = CHILD.format(load=load, first_use=first_use or "pass")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True,
+    )
+    marker = [line for line in proc.stdout.splitlines() if line.startswith("PROFILE ")]
+    if proc.returncode or not marker:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "no output")
+    _, import_s, first_use_s = marker[-1].split()
+    return float(import_s), float(first_use_s), parse_importtime(proc.stderr)
+
+
+def profile(name, repeat, top, env):
+    load, first_use = ENTRY_POINTS[name]
+    runs = [profile_once(load, first_use, env) for _ in range(repeat)]
+    packages = {}
+    for _, _, by_package in runs:
+        for package, seconds in by_package.items():
+            packages[package] = min(seconds, packages.get(package, seconds))
+    slowest = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+    return {
+        "import_seconds": min(r[0] for r in runs),
+        "first_use_seconds": min(r[1] for r in runs) if first_use else None,
+        "modules_imported_seconds": sum(packages.values()),
+        "slowest_packages": [{"package": p, "seconds": round(s, 4)} for p, s in slowest],
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entry", choices=sorted(ENTRY_POINTS), action="append",
+                        help="entry point to profile (repeatable, default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="fresh interpreters per entry point")
+    parser.add_argument("--top", type=int, default=10, help="slowest packages to list")
+    parser.add_argument("--json", help="also write the report to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    workdir = tempfile.mkdtemp(prefix="travel-import-profile-")
+    env = dict(
+        os.environ,
+        # Keep the profiled processes off real credentials and the repo's cache files
+        OPENAI_API_KEY=os.getenv("OPENAI_API_KEY") or "profile",
+        CHECKPOINT_DB_PATH=os.path.join(workdir, "checkpoints.sqlite3"),
+        SERP_CACHE_PATH=os.path.join(workdir, "serp_cache.sqlite3"),
+        PYTHONDONTWRITEBYTECODE="1",
+    )
+
+    report = {}
+    for name in args.entry or list(ENTRY_POINTS):
+        try:
+            report[name] = profile(name, args.repeat, args.top, env)
+        except RuntimeError as e:
+            report[name] = {"error": str(e)}
+
+    print(json.dumps(report, indent=2))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,388 @@
+"""
+Local stand-ins for OpenWeatherMap (current and forecast), SerpAPI (web,
+flights and hotels) and the OpenAI chat completions endpoint, so the agent
+loop can be load-tested without network access.
+
+Every endpoint has configurable latency (mean + jitter), error rate and
+payload size. The chat completions stand-in follows a tiny script: a user
+message about weather or flights/hotels gets a tool call, a tool result gets
+a final answer. It supports both plain and streaming (SSE) responses,
+records the prompt/completion tokens of every request and reports cached
+prompt tokens the way OpenAI's prefix cache would.
+"""
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+CITY_PATTERN = re.compile(r"\bin ([A-Z][a-zA-Z]+(?: [A-Z][a-zA-Z]+)*)")
+
+
+def estimate_tokens(text):
+    return (len(text) + 3) // 4
+
+
+class MockConfig:
+    """Knobs for the stand-in servers; latencies are in seconds"""
+
+    def __init__(self, llm_latency=0.3, tool_latency=0.15, jitter=0.25, error_rate=0.0,
+                 serp_payload_kb=30, answer_words=120):
+        self.llm_latency = llm_latency
+        self.tool_latency = tool_latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.serp_payload_kb = serp_payload_kb
+        self.answer_words = answer_words
+
+
+class UsageLog:
+    """Thread-safe record of every chat completion request"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = []  # (prompt_tokens, completion_tokens, prompt_bytes, cached_tokens)
+        self.tool_requests = {"weather": 0, "forecast": 0, "serp": 0}
+        self.errors = 0
+
+    def add(self, prompt_tokens, completion_tokens, prompt_bytes, cached_tokens=0):
+        with self._lock:
+            self.requests.append((prompt_tokens, completion_tokens, prompt_bytes, cached_tokens))
+
+    def count_tool(self, name):
+        with self._lock:
+            self.tool_requests[name] += 1
+
+    def count_error(self):
+        with self._lock:
+            self.errors += 1
+
+
+class PrefixCache:
+    """
+    Mimics OpenAI prompt caching: a request's longest previously seen prefix
+    (system prompt, tools, then messages) counts as cached once it is at
+    least 1024 tokens, in 128-token steps
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._seen = set()
+
+    def cached_tokens(self, body):
+        messages = body.get("messages", [])
+        head = 1 if messages and messages[0].get("role") == "system" else 0
+        segments = messages[:head] + [body.get("tools", [])] + messages[head:]
+        digest, tokens, cached, prefixes = hashlib.sha256(), 0, 0, []
+        for segment in segments:
+            text = json.dumps(segment, sort_keys=True)
+            digest.update(text.encode())
+            tokens += estimate_tokens(text)
+            prefixes.append((digest.hexdigest(), tokens))
+        with self._lock:
+            for key, length in prefixes:
+                if key in self._seen:
+                    cached = length
+            self._seen.update(key for key, _ in prefixes)
+        return cached // 128 * 128 if cached >= 1024 else 0
+
+
+def weather_payload(city):
+    return {
+        "coord": {"lon": 2.35, "lat": 48.85},
+        "weather": [{"id": 800, "main": "Clear", "description": "clear sky", "icon": "01d"}],
+        "base": "stations",
+        "main": {"temp": 18.4, "feels_like": 17.9, "temp_min": 16.1, "temp_max": 20.2,
+                 "pressure": 1018, "humidity": 62},
+        "visibility": 10000,
+        "wind": {"speed": 3.6, "deg": 240},
+        "clouds": {"all": 0},
+        "dt": int(time.time()),
+        "sys": {"country": "FR", "sunrise": 0, "sunset": 0},
+        "timezone": 3600,
+        "id": abs(hash(city)) % 10 ** 7,
+        "name": city,
+        "cod": 200,
+    }
+
+
+def forecast_payload(city, days=5):
+    """Five days of 3-hourly steps, shaped like the OpenWeatherMap forecast response"""
+    start = int(time.time()) // 86400 * 86400
+    steps = []
+    for i in range(days * 8):
+        dt = start + i * 3 * 3600
+        temp = 14.0 + 6.0 * math.sin((i % 8) / 8 * 2 * math.pi)
+        steps.append({
+            "dt": dt,
+            "main": {"temp": temp, "temp_min": temp - 1, "temp_max": temp + 1, "humidity": 70},
+            "weather": [{"id": 500, "main": "Rain", "description": "light rain"}] if i % 5 == 0
+            else [{"id": 801, "main": "Clouds", "description": "few clouds"}],
+            "pop": 0.4 if i % 5 == 0 else 0.1,
+            "rain": {"3h": 0.8} if i % 5 == 0 else {},
+            "dt_txt": time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(dt)),
+        })
+    return {"cod": "200", "cnt": len(steps), "list": steps, "city": {"name": city, "country": "FR"}}
+
+
+def serp_payload(query, size_kb):
+    results = []
+    i = 0
+    while len(json.dumps(results)) < size_kb * 1024:
+        results.append({
+            "position": i + 1,
+            "title": f"{query} - result {i + 1}",
+            "link": f"https://example.com/{i}",
+            "snippet": f"Deals and travel information for {query}. " * 4,
+            "displayed_link": "example.com",
+            "source": "Example",
+        })
+        i += 1
+    return {
+        "search_metadata": {"id": uuid.uuid4().hex, "status": "Success"},
+        "search_parameters": {"q": query, "engine": "google"},
+        "answer_box": {"title": query, "snippet": f"Typical prices for {query} start at $120."},
+        "organic_results": results,
+    }
+
+
+def flights_payload(params):
+    """google_flights engine: a few itineraries between the requested airports"""
+    origin, destination = params.get("departure_id", "JFK"), params.get("arrival_id", "CDG")
+    day = params.get("outbound_date", "2025-06-05")
+
+    def leg(src, dst, dep, arr, minutes, number):
+        return {
+            "departure_airport": {"id": src, "time": f"{day} {dep}"},
+            "arrival_airport": {"id": dst, "time": f"{day} {arr}"},
+            "duration": minutes, "airline": "Mock Air", "flight_number": number,
+        }
+
+    def offer(legs, price):
+        return {"flights": legs, "total_duration": sum(l["duration"] for l in legs), "price": price, "type": "One way"}
+
+    return {
+        "search_metadata": {"id": uuid.uuid4().hex, "status": "Success"},
+        "best_flights": [offer([leg(origin, destination, "08:00", "15:10", 430, "MA 100")], 540)],
+        "other_flights": [
+            offer([leg(origin, "KEF", "20:40", "06:00", 330, "MA 210"),
+                   leg("KEF", destination, "07:40", "13:05", 205, "MA 211")], 410),
+            offer([leg(origin, destination, "18:30", "01:45", 435, "MA 102")], 575),
+        ],
+    }
+
+
+def hotels_payload(params):
+    """google_hotels engine: a few properties in the requested place"""
+    place = params.get("q", "Paris").split(",")[0]
+    properties = [
+        (f"Grand {place} Hotel", 260, 4.6, 5),
+        (f"{place} Central Inn", 140, 4.2, 3),
+        (f"Budget Stay {place}", 85, 3.6, 2),
+    ]
+    return {
+        "search_metadata": {"id": uuid.uuid4().hex, "status": "Success"},
+        "properties": [
+            {
+                "name": name,
+                "rate_per_night": {"lowest": f"${price}", "extracted_lowest": price},
+                "total_rate": {"lowest": f"${price * 3}", "extracted_lowest": price * 3},
+                "overall_rating": rating, "reviews": 1000, "extracted_hotel_class": stars,
+                "gps_coordinates": {"latitude": 48.85, "longitude": 2.35},
+            }
+            for name, price, rating, stars in properties
+        ],
+    }
+
+
+def plan_reply(body, config):
+    """(content, tool_calls) the scripted model answers with"""
+    messages = body.get("messages", [])
+    last = messages[-1] if messages else {}
+    if last.get("role") == "tool" or not body.get("tools") or body.get("tool_choice") == "none":
+        return " ".join(["Here is a cheerful travel suggestion."] * max(1, config.answer_words // 6)), []
+
+    text = last.get("content") or ""
+    if isinstance(text, list):
+        text = " ".join(part.get("text", "") for part in text if isinstance(part, dict))
+    lowered = text.lower()
+    if "weather" in lowered:
+        match = CITY_PATTERN.search(text)
+        args = {"city": match.group(1) if match else "Paris"}
+        return None, [("get_weather", args)]
+    if "flight" in lowered or "hotel" in lowered:
+        return None, [("get_flight_and_hotel_information", {"query": text})]
+    return " ".join(["Tell me more about your budget and dates!"] * max(1, config.answer_words // 8)), []
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    config = None
+    usage = None
+    prefixes = None
+
+    def log_message(self, *args):
+        pass
+
+    def _sleep(self, mean):
+        if mean > 0:
+            time.sleep(max(0.0, random.uniform(mean * (1 - self.config.jitter), mean * (1 + self.config.jitter))))
+
+    def _fail(self):
+        if random.random() < self.config.error_rate:
+            self.usage.count_error()
+            self._send_json({"error": "injected failure"}, status=500)
+            return True
+        return False
+
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        if url.path.endswith("/weather"):
+            self.usage.count_tool("weather")
+            self._sleep(self.config.tool_latency)
+            if not self._fail():
+                self._send_json(weather_payload(params.get("q", "Paris")))
+        elif url.path.endswith("/forecast"):
+            self.usage.count_tool("forecast")
+            self._sleep(self.config.tool_latency)
+            if not self._fail():
+                self._send_json(forecast_payload(params.get("q", "Paris")))
+        elif url.path.endswith("/search"):
+            self.usage.count_tool("serp")
+            self._sleep(self.config.tool_latency * 2)
+            if self._fail():
+                return
+            engine = params.get("engine")
+            if engine == "google_flights":
+                self._send_json(flights_payload(params))
+            elif engine == "google_hotels":
+                self._send_json(hotels_payload(params))
+            else:
+                self._send_json(serp_payload(params.get("q", ""), self.config.serp_payload_kb))
+        else:
+            self._send_json({"error": "not found"}, status=404)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", "0"))
+        raw = self.rfile.read(length)
+        if not urlparse(self.path).path.endswith("/chat/completions"):
+            self._send_json({"error": "not found"}, status=404)
+            return
+        body = json.loads(raw or b"{}")
+        self._sleep(self.config.llm_latency)
+        if self._fail():
+            return
+
+        content, calls = plan_reply(body, self.config)
+        prompt_tokens = estimate_tokens(json.dumps(body.get("messages", []))) + estimate_tokens(json.dumps(body.get("tools", [])))
+        completion_tokens = estimate_tokens(content or json.dumps([c[1] for c in calls]))
+        cached_tokens = min(prompt_tokens, self.prefixes.cached_tokens(body))
+        self.usage.add(prompt_tokens, completion_tokens, len(raw), cached_tokens)
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                 "total_tokens": prompt_tokens + completion_tokens,
+                 "prompt_tokens_details": {"cached_tokens": cached_tokens}}
+        tool_calls = [
+            {"id": f"call_{uuid.uuid4().hex[:12]}", "type": "function",
+             "function": {"name": name, "arguments": json.dumps(args)}}
+            for name, args in calls
+        ]
+        if body.get("stream"):
+            self._stream(body, content, tool_calls, usage)
+            return
+        message = {"role": "assistant", "content": content}
+        if tool_calls:
+            message["tool_calls"] = tool_calls
+        self._send_json({
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "gpt-4o-mini"),
+            "choices": [{"index": 0, "message": message,
+                         "finish_reason": "tool_calls" if tool_calls else "stop"}],
+            "usage": usage,
+        })
+
+    def _stream(self, body, content, tool_calls, usage):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        base = {"id": f"chatcmpl-{uuid.uuid4().hex[:12]}", "object": "chat.completion.chunk",
+                "created": int(time.time()), "model": body.get("model", "gpt-4o-mini")}
+
+        def send(choices, **extra):
+            self.wfile.write(b"data: " + json.dumps({**base, "choices": choices, **extra}).encode() + b"\n\n")
+            self.wfile.flush()
+
+        send([{"index": 0, "delta": {"role": "assistant", "content": ""}, "finish_reason": None}])
+        if tool_calls:
+            deltas = [dict(call, index=i) for i, call in enumerate(tool_calls)]
+            send([{"index": 0, "delta": {"tool_calls": deltas}, "finish_reason": None}])
+        else:
+            for word in content.split(" "):
+                send([{"index": 0, "delta": {"content": word + " "}, "finish_reason": None}])
+        send([{"index": 0, "delta": {}, "finish_reason": "tool_calls" if tool_calls else "stop"}])
+        if (body.get("stream_options") or {}).get("include_usage"):
+            send([], usage=usage)
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+        self.close_connection = True
+
+
+class MockServers:
+    """All three stand-ins on one local port; use as a context manager"""
+
+    def __init__(self, config=None, host="127.0.0.1", port=0):
+        self.config = config or MockConfig()
+        self.usage = UsageLog()
+        handler = type("Handler", (_Handler,), {"config": self.config, "usage": self.usage, "prefixes": PrefixCache()})
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def env(self):
+        """Environment variables pointing every client at the stand-ins"""
+        return {
+            "OPENAI_API_KEY": "sk-local-benchmark",
+            "OPENAI_BASE_URL": f"{self.base_url}/v1",
+            "OPENAI_API_BASE": f"{self.base_url}/v1",
+            "WEATHER_API_KEY": "local",
+            "WEATHER_API_URL": f"{self.base_url}/data/2.5/weather",
+            "WEATHER_FORECAST_API_URL": f"{self.base_url}/data/2.5/forecast",
+            "SERP_API_KEY": "local",
+            "SERP_API_URL": f"{self.base_url}/search",
+        }
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name="mock-servers", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
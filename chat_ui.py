@@ -1,11 +1,11 @@
 import streamlit as st
-from langchain.chat_models import init_chat_model
-from langgraph.prebuilt import create_react_agent
-from langgraph.checkpoint.memory import InMemorySaver
-from langchain_core.messages import AIMessage
 import os
-import requests
+import uuid
 from dotenv import load_dotenv
+from travel_core.weather_cache import weather_cache
+from travel_core.tracing import tracer
+# langchain, langgraph and the agent helpers are imported inside the functions
+# that need them, so a fresh worker renders the page before paying for them
 
 # Load environment variables
 load_dotenv()
@@ -71,123 +71,104 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Quick action buttons: (label, key, prompt)
+QUICK_ACTIONS = [
+    ("🌤️ Check Weather", "weather_btn", "What's the weather like in Paris?"),
+    ("✈️ Find Flights", "flights_btn", "Help me find flights from New York to Tokyo"),
+    ("🏨 Search Hotels", "hotels_btn", "Find hotels in London for next month"),
+    ("🗺️ Plan Trip", "plan_btn", "Help me plan a 5-day trip to Italy"),
+]
+# Cities the quick actions ask about, kept warm in the weather cache
+QUICK_ACTION_CITIES = ["Paris", "New York", "Tokyo", "London", "Rome"]
+
+def new_thread_id():
+    """Fresh checkpointer thread id for a browser session"""
+    return f"ui-{uuid.uuid4().hex}"
+
 # Initialize session state for conversation history
 if "messages" not in st.session_state:
     st.session_state.messages = []
 if "agent" not in st.session_state:
     st.session_state.agent = None
 if "thread_id" not in st.session_state:
-    st.session_state.thread_id = "travel_conversation"
+    # One checkpointer thread per browser session keeps users isolated
+    st.session_state.thread_id = new_thread_id()
 
 # Initialize the agent
 @st.cache_resource
 def initialize_agent():
     """Initialize the travel agent with caching"""
+    from langchain.chat_models import init_chat_model
+    from langgraph.prebuilt import create_react_agent
+    from travel_core.checkpoint import make_checkpointer
+    from travel_core.history import history_manager
+    from travel_core.llm_tracing import llm_tracing_callback
+    from travel_core.prompts import TRAVEL_AGENT_PROMPT
+    from travel_core.rate_limit import langchain_rate_limiter
+    from travel_core.tools import registry
+
     # Set environment variable if not already set
     openai_key = os.getenv("OPENAI_API_KEY")
     if openai_key and not os.environ.get("OPENAI_API_KEY"):
         os.environ["OPENAI_API_KEY"] = openai_key
     
-    model = init_chat_model("gpt-4o-mini", temperature=0)
-    memory = InMemorySaver()
-    
-    system_prompt = """You're a helpful travel assistant that can answer questions about travel destinations and provide information about the best places to visit.
-    The goal is to help the user plan their trip by providing a list of destinations, activities, hotels, restaurants, and things to do.
-
-    Information you should seek to get; total budget, number of people, duration of trip, and any other relevant information.
-    Then you should ask about the weather, where they want to go, what they like to do, and how much intense they want their trip to be.
-    Intensity like, chill trip or trip with full itenary.
-
-    If you're not given any information, ask the user for the information you need.
-
-    Make sure to be consistent in your responses.
-
-    If the user doesn't know asks for recommendations for locations start by asking about 
-    specific continent, country, or city.
-    And if they are open for international travel 
-
-    You're helpful, intelligent, and systematic travel planner agent. 
-
-    Rules to follow:
-    - Do **not** fabricate information.
-    - If you don't know the answer, say you don't know.
-    - If you are unsure about the information, ask the user to provide more information.
-
-    Be cheerful and bubbly.
-    """
-    
-    def get_weather(city: str) -> str:
-        """Get the weather of a city"""
-        weather_api_key = os.getenv("WEATHER_API_KEY")
-        
-        if weather_api_key is None:
-            return "Error: Weather API key is not set"
-        
-        base_url = "https://api.openweathermap.org/data/2.5/weather"
-        params = {
-            "q": city,
-            "appid": weather_api_key,
-            "units": "metric"
-        }
-        
-        response = requests.get(base_url, params=params)
-        
-        if response.status_code == 200:
-            return response.json()
-        else:
-            return f"Error: {response.status_code}"
-
-    def get_flight_and_hotel_information(query: str) -> str:
-        """Get serp api"""
-        serp_api_key = os.getenv("SERP_API_KEY")
-        
-        if serp_api_key is None:
-            return "Error: SERP API key is not set"
-        
-        base_url = "https://serpapi.com/search"
-        search_params = {
-            "engine": "google",
-            "google_domain": "google.com",
-            "hl": "en",
-            "gl": "us",
-            "q": query,
-            "api_key": serp_api_key
-        }
-        
-        response = requests.get(base_url, params=search_params)
-        
-        if response.status_code == 200:
-            return response.content
-        else:
-            return f"Error, response: {response}"
+    model = init_chat_model(
+        "gpt-4o-mini",
+        temperature=0,
+        stream_usage=True,
+        callbacks=[llm_tracing_callback],
+        rate_limiter=langchain_rate_limiter(),
+    )
+    # Persistent, bounded thread storage shared by every UI worker
+    memory = make_checkpointer()
     
     agent = create_react_agent(
         model=model,
-        tools=[get_weather, get_flight_and_hotel_information],
-        prompt=system_prompt,
+        tools=registry.langchain_tools(),
+        prompt=TRAVEL_AGENT_PROMPT,
+        # Bound what each LLM call sees however long the thread gets
+        pre_model_hook=history_manager.pre_model_hook,
         checkpointer=memory
     )
     
     return agent
 
-def get_final_ai_message(result):
-    """Extract the final AI message from the result"""
-    final_ai = next(
-        m for m in reversed(result["messages"])
-        if isinstance(m, AIMessage) and m.content.strip()
-    )
-    return final_ai.content
+@st.cache_resource
+def start_quick_action_warmer(_agent):
+    """Background warmer for the quick action answers, one per process"""
+    from travel_core.warmer import QuickActionWarmer
+
+    return QuickActionWarmer(
+        _agent,
+        [prompt for _, _, prompt in QUICK_ACTIONS],
+        cities=QUICK_ACTION_CITIES,
+        max_age=float(os.getenv("QUICK_ACTION_MAX_AGE", "1800")),
+    ).start()
+
+def clear_conversation():
+    """Drop the session's checkpointer thread and start a new one"""
+    if st.session_state.agent is not None:
+        st.session_state.agent.checkpointer.delete_thread(st.session_state.thread_id)
+    st.session_state.messages = []
+    st.session_state.thread_id = new_thread_id()
+
+def stream_agent_response(user_input, thread_id, status, first_turn=False):
+    """Yield response tokens as they arrive, showing tool progress in `status`"""
+    from travel_core.agent_runner import stream_agent
 
-def get_agent_response(user_input, thread_id):
-    """Get response from the travel agent"""
     try:
-        response = st.session_state.agent.invoke(
-            {"messages": [{"role": "user", "content": user_input}]}, 
-            config={"configurable": {"thread_id": thread_id}}
-        )
-        return get_final_ai_message(response)
+        for kind, value in stream_agent(st.session_state.agent, user_input, thread_id, first_turn):
+            if kind == "token":
+                status.empty()
+                yield value
+            elif kind == "tool_start":
+                status.info(f"🔧 Calling {value}...")
+            elif kind == "tool_end":
+                status.success(f"✅ {value} finished")
     except Exception as e:
-        return f"Sorry, I encountered an error: {str(e)}"
+        yield f"Sorry, I encountered an error: {str(e)}"
+    finally:
+        status.empty()
 
 # Main UI
 def main():
@@ -242,41 +223,43 @@ def main():
         st.markdown("---")
         
         if st.button("🗑️ Clear Chat History", key="clear_chat"):
-            st.session_state.messages = []
+            clear_conversation()
             st.rerun()
         
         # Show conversation stats
         if st.session_state.messages:
             st.markdown(f"**Messages in conversation:** {len(st.session_state.messages)}")
-    
+        
+        # Show shared weather cache counters
+        cache_stats = weather_cache.stats()
+        st.caption(
+            f"Weather cache: {cache_stats['size']} cities, "
+            f"{cache_stats['hits']} hits / {cache_stats['misses']} misses, "
+            f"{cache_stats['evictions']} evictions"
+        )
+
+        # Live latency percentiles for LLM, tool and checkpoint calls
+        with st.expander("📊 Performance"):
+            summary = tracer.summary()
+            if summary:
+                st.dataframe(summary, hide_index=True)
+                st.download_button("Export JSONL", tracer.jsonl(), file_name="traces.jsonl", key="export_jsonl")
+                st.download_button("Export Prometheus", tracer.prometheus(), file_name="traces.prom", key="export_prom")
+            else:
+                st.caption("No calls traced yet.")
+
     # Initialize agent
     if st.session_state.agent is None:
         with st.spinner("Initializing travel agent..."):
             st.session_state.agent = initialize_agent()
+    warmer = start_quick_action_warmer(st.session_state.agent)
     
     # Quick action buttons
     st.markdown("### 🚀 Quick Actions")
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        if st.button("🌤️ Check Weather", key="weather_btn"):
-            st.session_state.messages.append({"role": "user", "content": "What's the weather like in Paris?"})
-            st.rerun()
-    
-    with col2:
-        if st.button("✈️ Find Flights", key="flights_btn"):
-            st.session_state.messages.append({"role": "user", "content": "Help me find flights from New York to Tokyo"})
-            st.rerun()
-    
-    with col3:
-        if st.button("🏨 Search Hotels", key="hotels_btn"):
-            st.session_state.messages.append({"role": "user", "content": "Find hotels in London for next month"})
-            st.rerun()
-    
-    with col4:
-        if st.button("🗺️ Plan Trip", key="plan_btn"):
-            st.session_state.messages.append({"role": "user", "content": "Help me plan a 5-day trip to Italy"})
-            st.rerun()
+    for col, (label, key, quick_prompt) in zip(st.columns(len(QUICK_ACTIONS)), QUICK_ACTIONS):
+        with col:
+            if st.button(label, key=key):
+                st.session_state.quick_action = quick_prompt
     
     st.markdown("---")
     
@@ -289,8 +272,13 @@ def main():
             with st.chat_message(message["role"]):
                 st.markdown(message["content"])
         
-        # Chat input
-        if prompt := st.chat_input("Ask me about your travel plans..."):
+        # Chat input (or a quick action pressed on this run)
+        prompt = st.chat_input("Ask me about your travel plans...")
+        quick_action = st.session_state.pop("quick_action", None)
+        if quick_action and not prompt:
+            prompt = quick_action
+        
+        if prompt:
             # Add user message to chat history
             st.session_state.messages.append({"role": "user", "content": prompt})
             
@@ -298,11 +286,28 @@ def main():
             with st.chat_message("user"):
                 st.markdown(prompt)
             
-            # Get and display assistant response
+            first_turn = len(st.session_state.messages) == 1
+            # Warmed answers don't know the conversation, so only use them to open one
+            warmed = warmer.get(prompt) if quick_action == prompt and first_turn else None
             with st.chat_message("assistant"):
-                with st.spinner("Thinking about your travel needs..."):
-                    response = get_agent_response(prompt, st.session_state.thread_id)
+                if warmed:
+                    response = warmed[0]
                     st.markdown(response)
+                    from travel_core.agent_runner import remember_turn
+                    remember_turn(st.session_state.agent, st.session_state.thread_id, prompt, response)
+                else:
+                    # Stream the assistant response token by token
+                    status = st.empty()
+                    status.caption("Thinking about your travel needs...")
+                    response = st.write_stream(
+                        stream_agent_response(
+                            prompt,
+                            st.session_state.thread_id,
+                            status,
+                            # Only the opening message may be answered from the semantic cache
+                            first_turn=first_turn,
+                        )
+                    )
             
             # Add assistant response to chat history
             st.session_state.messages.append({"role": "assistant", "content": response})
@@ -1,119 +1,70 @@
-from langgraph.prebuilt import create_react_agent
-from langchain.chat_models import init_chat_model
 from dotenv import load_dotenv
-from langgraph.checkpoint.memory import InMemorySaver
-from langchain_core.messages import AIMessage
+import argparse
+import asyncio
+import functools
 import os
-import requests
+import sys
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 
 load_dotenv()
 
 os.environ["OPENAI_API_KEY"] = os.getenv("OPENAI_API_KEY")
 
-model = init_chat_model(
-    "gpt-4o-mini",
-    temperature=0
-)
-
-memory = InMemorySaver()
-
-system_prompt = """You're a helpful travel assistant that can answer questions about travel destinations and provide information about the best places to visit.
-                The goal is to help the user plan their trip by providing a list of destinations, activities, hotels, restaurants, and things to do.
-
-
-                Information you should seek to get; total budget, number of people, duration of trip, and any other relevant information.
-                Then you should ask about the weather, where they want to go, what they like to do, and how much intense they want their trip to be.
-                Intensity like, chill trip or trip with full itenary.
-
-                If you're not given any information, ask the user for the information you need.
-
-                Make sure to be consistent in your responses.
-
-                If the user doesn't know asks for recommendations for locations start by asking about 
-                specific continent, country, or city.
-                And if they are open for international travel 
 
-                You're helpful, intelligent, and systematic travel planner agent. 
-
-                Rules to follow:
-                - Do **not** fabricate information.
-                - If you don't know the answer, say you don't know.
-                - If you are unsure about the information, ask the user to provide more information.
-
-                Be cheerful and bubbly.
-                """
-
-
-def get_weather(city: str) -> str:
-
-
-    """Get the weather of a city"""
-    weather_api_key = os.getenv("WEATHER_API_KEY")
-
-    if(weather_api_key is None):
-        return "Error: Weather API key is not set"
-    else:
-        print("Weather API key: ", "***")
-
-    base_url = "https://api.openweathermap.org/data/2.5/weather"
-    params = {
-        "q": city,
-        "appid": weather_api_key,
-        "units": "metric"
-    }
-    
-    response = requests.get(base_url, params=params)
-    
-    if(response.status_code == 200):
-        return response.json()
-    else:
-        return f"Error: {response.status_code}"
-
-def get_flight_and_hotel_information(query: str) -> str:
-
-    """Get serp api"""
-    serp_api_key = os.getenv("SERP_API_KEY")
-
-    if(serp_api_key is None):
-        return "Error: SERP API key is not set"
-    else:
-        print("SERP API key: ", serp_api_key)
-    
-    base_url = "https://serpapi.com/search"
+@functools.cache
+def get_agent():
+    """
+    Build the model, checkpointer and react agent once, on first use.
+    langchain/langgraph take about a second to import, so nothing heavy
+    happens at import time and the CLI can build this while the user types.
+    """
+    from langchain.chat_models import init_chat_model
+    from langgraph.prebuilt import create_react_agent
+
+    from travel_core.checkpoint import make_checkpointer
+    from travel_core.history import history_manager
+    from travel_core.llm_tracing import llm_tracing_callback
+    from travel_core.prompts import TRAVEL_AGENT_PROMPT
+    from travel_core.rate_limit import langchain_rate_limiter
+    from travel_core.tools import registry
+
+    model = init_chat_model(
+        "gpt-4o-mini",
+        temperature=0,
+        # Report token usage on streamed responses too, and trace every call
+        stream_usage=True,
+        callbacks=[llm_tracing_callback],
+        # Shares the OPENAI_MAX_RPS budget with every other model call in the process
+        rate_limiter=langchain_rate_limiter()
+    )
 
-    search_params = {
-        "engine":"google",
-        "google_domain":"google.com",
-        "hl":"en",
-        "gl":"us",
-        "q": query,
-        "api_key": serp_api_key
-    }
+    # Persistent, bounded thread storage (see CHECKPOINT_* settings)
+    memory = make_checkpointer()
 
-    response = requests.get(base_url, params=search_params)
+    return create_react_agent(
+        model=model,  
+        tools=registry.langchain_tools(),  
+        prompt=TRAVEL_AGENT_PROMPT,
+        # Bound what each LLM call sees however long the thread gets
+        pre_model_hook=history_manager.pre_model_hook,
+        checkpointer=memory
+    )
 
-    if(response.status_code == 200):
-        return response.content
-    else:
-        return f"Error, response: {response}"
 
-agent = create_react_agent(
-    model=model,  
-    tools=[get_weather, get_flight_and_hotel_information],  
-    prompt=system_prompt,
-    checkpointer=memory
-)
+async def aget_travel_agent(user_input, thread_id, first_turn=False):
+    from travel_core.agent_runner import arun_agent
 
-def get_travel_agent(user_input, thread_id):
-   
-    response = agent.invoke({"messages": [{"role": "user", "content": user_input}]}, config={"configurable": {"thread_id": thread_id}})
+    response = await arun_agent(get_agent(), user_input, thread_id, first_turn=first_turn)
 
     print(f"Bot: {get_final_ai_message(response)} ")
 
-
     
 def get_final_ai_message(result):
+    from langchain_core.messages import AIMessage
+
     final_ai = next(
         m for m in reversed(result["messages"])
         if isinstance(m, AIMessage) and m.content.strip()
@@ -122,12 +73,55 @@ def get_final_ai_message(result):
     return final_ai.content
 
 
-def main():
+async def amain():
+    # Each CLI run gets its own conversation thread
+    thread_id = f"cli-{uuid.uuid4().hex}"
+    first_turn = True
+    # Build the agent and the city index in the background while the user types the first message
+    from travel_core.gazetteer import gazetteer
+
+    agent_ready = asyncio.ensure_future(asyncio.to_thread(get_agent))
+    index_ready = asyncio.ensure_future(asyncio.to_thread(gazetteer.warm))
     while True: 
-        user_input = input("User: ")
+        # Read stdin off the event loop so other tasks keep running
+        user_input = await asyncio.to_thread(input, "User: ")
         if(user_input == 'q' or user_input == 'quit'): 
             break
-        get_travel_agent(user_input, "default")
+        await agent_ready
+        await aget_travel_agent(user_input, thread_id, first_turn=first_turn)
+        first_turn = False
+
+
+async def abatch(args):
+    from travel_core.batch import arun_batch
+    from travel_core.rate_limit import rate_limits
+
+    for name in rate_limits:
+        rps = getattr(args, f"{name}_rps")
+        if rps is not None:
+            rate_limits[name].configure(rps)
+    output = args.output or os.path.splitext(args.batch)[0] + ".responses.jsonl"
+    await arun_batch(get_agent(), args.batch, output, concurrency=args.concurrency, timeout=args.timeout)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Travel agent CLI: interactive chat, or --batch for a JSONL file")
+    parser.add_argument("--batch", metavar="REQUESTS_JSONL", help="answer every request in this file instead of chatting")
+    parser.add_argument("--output", help="JSONL file answers are appended to (default: <batch>.responses.jsonl)")
+    parser.add_argument("--concurrency", type=int, default=int(os.getenv("BATCH_CONCURRENCY", "8")),
+                        help="requests in flight at once")
+    parser.add_argument("--timeout", type=float, help="seconds allowed per request")
+    for name in ("openai", "weather", "serp"):
+        parser.add_argument(f"--{name}-rps", type=float, help=f"max {name} API requests per second")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.batch:
+        asyncio.run(abatch(args))
+    else:
+        asyncio.run(amain())
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
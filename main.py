@@ -1,220 +1,139 @@
 import os
 from dotenv import load_dotenv
-from openai import OpenAI
-import requests
-from langchain_core.tools import tool
+import functools
 import json
+from concurrent.futures import ThreadPoolExecutor
+from travel_core.fast_path import fast_path_answer
+from travel_core.gazetteer import gazetteer
+from travel_core.history import history_manager
+from travel_core.intent_router import intent_router
+from travel_core.prompts import PROMPT_VERSION, system_message
+from travel_core.rate_limit import rate_limits
+from travel_core.tools import registry
+from travel_core.tracing import span
 
 load_dotenv()
 
 os.environ["OPENAI_API_KEY"] = os.getenv("OPENAI_API_KEY")
 
-client = OpenAI()
+@functools.cache
+def get_client():
+    # The openai package is slow to import; only pay for it once a model call is made
+    from openai import OpenAI
+    return OpenAI()
 
-travel_agent_prompt = """You're a helpful travel assistant that can answer questions about travel destinations and provide information about the best places to visit.
-                The goal is to help the user plan their trip by providing a list of destinations, activities, hotels, restaurants, and things to do.
+# Bounded pool shared by all turns for running tool calls in parallel
+tool_executor = ThreadPoolExecutor(max_workers=int(os.getenv("TOOL_MAX_WORKERS", "8")))
 
+# Rounds of tool calls the model may make in one turn before it must answer
+MAX_TOOL_ITERATIONS = int(os.getenv("MAX_TOOL_ITERATIONS", "5"))
 
-                Information you should seek to get; total budget, number of people, duration of trip, and any other relevant information.
-                Then you should ask about the weather, where they want to go, what they like to do, and how much intense they want their trip to be.
-                Intensity like, chill trip or trip with full itenary.
 
-                If you're not given any information, ask the user for the information you need.
+def get_travel_agent_response(user_input, conversation_history):
 
-                Make sure to be consistent in your responses.
+    conversation_history.append({
+        "role": "user",
+        "content": user_input
+    })
 
-                If the user doesn't know asks for recommendations for locations start by asking about 
-                specific continent, country, or city.
-                And if they are open for international travel 
+    # Clear weather lookups and simple flight/hotel searches skip the model entirely
+    answer = intent_router.answer(user_input)
+    if answer is not None:
+        conversation_history.append({
+            "role": "assistant",
+            "content": answer
+        })
+        print("Assistant: ", answer)
+        return conversation_history
 
-                You're helpful, intelligent, and systematic travel planner agent. 
+    for iteration in range(MAX_TOOL_ITERATIONS + 1):
+        # Only a token-budgeted window of the history is sent, not all of it.
+        # Once the cap is reached the model has to answer with what it has.
+        tool_choice = "none" if iteration == MAX_TOOL_ITERATIONS else "auto"
+        response = create_completion(history_manager.window(conversation_history), tool_choice)
 
-                Rules to follow:
-                - Do **not** fabricate information.
-                - If you don't know the answer, say you don't know.
-                - If you are unsure about the information, ask the user to provide more information.
+        message = response.choices[0].message
 
-                Be cheerful and bubbly.
-                """
+        # Add the assistant's message to conversation history
+        conversation_history.append({
+            "role": "assistant",
+            "content": message.content,
+            "tool_calls": message.tool_calls
+        })
 
+        # No tool calls, just regular response
+        if not message.tool_calls:
+            print("Assistant: ", message.content)
+            break
 
-def get_travel_agent_response(user_input, conversation_history):
+        print("Assistant is calling tools...")
 
-    conversation_history.append({
-        "role": "user",
-        "content": user_input
-    })
-    
-    # First API call to get LLM response (potentially with tool calls)
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=conversation_history,
-        tools=get_tools()
-    )
-
-    message = response.choices[0].message
-    
-    # Add the assistant's message to conversation history
-    conversation_history.append({
-        "role": "assistant",
-        "content": message.content,
-        "tool_calls": message.tool_calls
-    })
+        # Run the tool calls of this turn concurrently; map() keeps the
+        # results in the same order as message.tool_calls
+        tool_results = list(tool_executor.map(run_tool_call, message.tool_calls))
 
-    # Check if the LLM wants to call tools
-    if message.tool_calls:
-        print("Assistant is calling tools...")
-        
         # Add tool results to conversation
-        for tool_call in message.tool_calls:
-            function_name = tool_call.function.name
-            function_args = json.loads(tool_call.function.arguments)
-            
-            print(f"Calling {function_name} with args: {function_args}")
-            
-            # Execute the appropriate tool
-            if function_name == "get_weather":
-                tool_result = get_weather.invoke(function_args)
-            elif function_name == "get_flight_and_hotel_information":
-                tool_result = get_flight_and_hotel_information.invoke(function_args)
-            else:
-                tool_result = f"Unknown function: {function_name}"
-            
-            print(f"Tool result: {tool_result}")
-            
-            # Add tool result to conversation
+        for tool_call, tool_result in zip(message.tool_calls, tool_results):
             conversation_history.append({
                 "role": "tool",
                 "content": str(tool_result),
                 "tool_call_id": tool_call.id
             })
-        
-        # Make a second API call with the tool results
-        second_response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=conversation_history,
-            tools=get_tools()
-        )
-        
-        final_message = second_response.choices[0].message.content
-        conversation_history.append({
-            "role": "assistant",
-            "content": final_message
-        })
-        
-        print("Assistant: ", final_message)
-    else:
-        # No tool calls, just regular response
-        print("Assistant: ", message.content)
+
+        # Simple lookups ("weather in Paris") are answered from a template
+        # instead of another LLM round trip
+        answer = None
+        if iteration == 0:
+            answer = fast_path_answer(
+                user_input,
+                [(tool_call.function.name, result) for tool_call, result in zip(message.tool_calls, tool_results)]
+            )
+        if answer is not None:
+            conversation_history.append({
+                "role": "assistant",
+                "content": answer
+            })
+            print("Assistant: ", answer)
+            break
 
     return conversation_history
 
-def get_tools():
-    tools = [
-            {
-            "type": "function",
-            "function":{
-                "name": "get_weather",
-                "description": "Get the weather of a city",
-                    "parameters":{
-                        "type": "object",
-                        "properties": {
-                            "city":{
-                                "type": "string",
-                                "description": "The city to get the weather of"
-                            }
-                        },
-                        "required": ["city"]
-
-                    }
-                }
-            },
-            {
-            "type": "function",
-            "function":{
-                "name": "get_flight_and_hotel_information",
-                "description": "Google search api to get flight and hotel information",
-                    "parameters":{
-                        "type": "object",
-                        "properties": {
-                            "query":{
-                                "type": "string",
-                                "description": "Search query for google"
-                            }
-                        },
-                        "required": ["query"]
-
-                    }
-                }
-            }
-        ]
-    
-    return tools
-
-@tool
-def get_weather(city: str) -> str:
-
-
-    """Get the weather of a city"""
-    weather_api_key = os.getenv("WEATHER_API_KEY")
-
-    if(weather_api_key is None):
-        return "Error: Weather API key is not set"
-    else:
-        print("Weather API key: ", "***")
-
-    base_url = "https://api.openweathermap.org/data/2.5/weather"
-    params = {
-        "q": city,
-        "appid": weather_api_key,
-        "units": "metric"
-    }
-    
-    response = requests.get(base_url, params=params)
-    
-    if(response.status_code == 200):
-        return response.json()
-    else:
-        return f"Error: {response.status_code}"
-
-@tool
-def get_flight_and_hotel_information(query: str) -> str:
-
-    """Get serp api"""
-    serp_api_key = os.getenv("SERP_API_KEY")
-
-    if(serp_api_key is None):
-        return "Error: SERP API key is not set"
-    else:
-        print("SERP API key: ", serp_api_key)
-    
-    base_url = "https://serpapi.com/search"
-
-    search_params = {
-        "engine":"google",
-        "google_domain":"google.com",
-        "hl":"en",
-        "gl":"us",
-        "q": query,
-        "api_key": serp_api_key
-    }
-
-    response = requests.get(base_url, params=search_params)
-
-    if(response.status_code == 200):
-        return response.content
-    else:
-        return f"Error, response: {response}"
-    
+def create_completion(messages, tool_choice="auto"):
+    # Stay under OPENAI_MAX_RPS (unlimited by default)
+    rate_limits["openai"].acquire()
+    # Every LLM call is traced with its latency, token usage and payload size
+    with span(
+        "llm", "gpt-4o-mini", payload_bytes=len(json.dumps(messages, default=str)), prompt_version=PROMPT_VERSION
+    ) as record:
+        response = get_client().chat.completions.create(
+            model="gpt-4o-mini",
+            messages=messages,
+            tools=registry.openai_schemas(),
+            tool_choice=tool_choice
+        )
+        if response.usage is not None:
+            record["prompt_tokens"] = response.usage.prompt_tokens
+            record["completion_tokens"] = response.usage.completion_tokens
+            # Prompt tokens served from OpenAI's prefix cache
+            details = getattr(response.usage, "prompt_tokens_details", None)
+            record["cached_tokens"] = getattr(details, "cached_tokens", None) or 0
+    return response
+
+def run_tool_call(tool_call):
+    function_name = tool_call.function.name
+    function_args = json.loads(tool_call.function.arguments)
+
+    # Tool latency, payload size and cache hits are recorded by the registry's tracing middleware
+    # O(1) dispatch through the shared tool registry
+    return registry.call(function_name, function_args)
 
 def main():
-    conversation_history = [
-        {
-            "role":"system",
-            "content": travel_agent_prompt
-        }
-    ]
+    # Static prefix first (system prompt, then tools in every request) so prompt caching hits
+    conversation_history = [system_message()]
     print("You've entered the travel bot experience! :) Ask away!")
+    # Import openai, build the client and index the city names while the user types the first message
+    tool_executor.submit(get_client)
+    tool_executor.submit(gazetteer.warm)
     while True:
         user_input = input("User: ")
         if(user_input == "q" or user_input=="quit" ):
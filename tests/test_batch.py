@@ -0,0 +1,89 @@
+import asyncio
+import json
+
+import pytest
+
+from travel_core import batch
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    """Stands in for arun_agent: records (input, thread_id) and fails on "boom" """
+    calls = []
+
+    async def arun_agent(agent, user_input, thread_id, first_turn=False):
+        calls.append((user_input, thread_id))
+        if user_input == "boom":
+            raise RuntimeError("model down")
+        return user_input.upper()
+
+    monkeypatch.setattr(batch, "arun_agent", arun_agent)
+    monkeypatch.setattr(batch, "final_text", str)
+    return calls
+
+
+def write_lines(path, *lines):
+    path.write_text("".join(line + "\n" for line in lines), encoding="utf-8")
+
+
+def run(tmp_path, *lines):
+    source, output = tmp_path / "in.jsonl", tmp_path / "out.jsonl"
+    write_lines(source, *lines)
+    stats = asyncio.run(batch.arun_batch(None, str(source), str(output), concurrency=2))
+    rows = {row["id"]: row for row in map(json.loads, output.read_text(encoding="utf-8").splitlines())}
+    return stats, rows
+
+
+def test_bad_lines_get_error_rows(tmp_path, agent):
+    stats, rows = run(tmp_path, "42", "null", "[1, 2]", "{not json", '"hello"', '{"id": "x", "prompt": "hi"}')
+    assert stats == {"ok": 2, "failed": 4, "skipped": 0}
+    assert [rows[f"line-{n}"]["error"] is not None for n in range(1, 5)] == [True] * 4
+    assert rows["line-5"]["output"] == "HELLO" and rows["x"]["output"] == "HI"
+
+
+def test_resume_skips_answered_requests(tmp_path, agent):
+    lines = ['{"id": "a", "input": "one"}', '{"id": "b", "input": "boom"}']
+    run(tmp_path, *lines)
+    agent.clear()
+    stats, rows = run(tmp_path, *lines)
+    assert stats == {"ok": 0, "failed": 1, "skipped": 1}
+    assert agent == [("boom", "batch-b")]
+
+
+def test_thread_turns_after_a_failure_wait_for_the_rerun(tmp_path, agent):
+    lines = [
+        '{"id": "t1", "input": "boom", "thread_id": "trip"}',
+        '{"id": "t2", "input": "and then?", "thread_id": "trip"}',
+        '{"id": "solo", "input": "hi"}',
+    ]
+    _, rows = run(tmp_path, *lines)
+    assert "earlier turn t1" in rows["t2"]["error"]
+    assert ("and then?", "trip") not in agent
+
+    # Once the first turn works, a resumed run answers the thread in order
+    agent.clear()
+    stats, rows = run(tmp_path, *(line.replace("boom", "first") for line in lines))
+    assert rows["t2"]["output"] == "AND THEN?"
+    assert stats == {"ok": 2, "failed": 0, "skipped": 1}
+    assert agent == [("first", "trip"), ("and then?", "trip")]
+
+
+def test_locks_only_for_threads_and_dropped_once_done(tmp_path, agent, monkeypatch):
+    """Locks are kept for explicit thread ids only, and only while a turn of them is queued"""
+    left = {}
+    run_one = batch.BatchRunner._run_one
+
+    async def spy(self, request_id, user_input, thread_id, out, semaphore, thread_locks):
+        await run_one(self, request_id, user_input, thread_id, out, semaphore, thread_locks)
+        left[request_id] = sorted(thread_locks)
+
+    monkeypatch.setattr(batch.BatchRunner, "_run_one", spy)
+    stats, _ = run(
+        tmp_path,
+        '{"id": "t1", "input": "one", "thread_id": "trip"}',
+        '{"id": "t2", "input": "two", "thread_id": "trip"}',
+        '{"id": "solo", "input": "hi"}',
+    )
+    assert stats == {"ok": 3, "failed": 0, "skipped": 0}
+    assert left["t1"] == ["trip"] and left["t2"] == []
+    assert "batch-solo" not in left["solo"]
@@ -0,0 +1,114 @@
+import time
+
+import pytest
+from langgraph.checkpoint.base import empty_checkpoint
+
+from travel_core.checkpoint import BoundedCheckpointSaver, MemoryCheckpointStore, SQLiteCheckpointStore
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemoryCheckpointStore()
+    return SQLiteCheckpointStore(str(tmp_path / "checkpoints.sqlite3"))
+
+
+def config(thread_id, checkpoint_id=None):
+    configurable = {"thread_id": thread_id, "checkpoint_ns": ""}
+    if checkpoint_id:
+        configurable["checkpoint_id"] = checkpoint_id
+    return {"configurable": configurable}
+
+
+def save(saver, thread_id, count):
+    """Put `count` checkpoints on a thread, each with a pending write; returns their ids"""
+    ids, parent = [], None
+    for step in range(count):
+        checkpoint = empty_checkpoint()
+        saved = saver.put(config(thread_id, parent), checkpoint, {"step": step}, {})
+        saver.put_writes(saved, [("messages", f"write {step}")], task_id="task")
+        parent = checkpoint["id"]
+        ids.append(parent)
+    return ids
+
+
+def test_round_trip(store):
+    saver = BoundedCheckpointSaver(store, max_checkpoints=None)
+    ids = save(saver, "t1", 2)
+    latest = saver.get_tuple(config("t1"))
+    assert latest.checkpoint["id"] == ids[-1]
+    assert latest.metadata == {"step": 1}
+    assert latest.parent_config["configurable"]["checkpoint_id"] == ids[0]
+    assert latest.pending_writes == [("task", "messages", "write 1")]
+    assert saver.get_tuple(config("t1", ids[0])).metadata == {"step": 0}
+    assert saver.get_tuple(config("nope")) is None
+
+
+def test_trim_keeps_newest(store):
+    saver = BoundedCheckpointSaver(store, max_checkpoints=3)
+    ids = save(saver, "t1", 5)
+    kept = [item.checkpoint["id"] for item in saver.list(config("t1"))]
+    assert kept == ids[:1:-1]
+    # Writes of trimmed checkpoints go with them
+    assert store.get_writes("t1", "", ids[0]) == []
+    assert store.get_writes("t1", "", ids[-1])
+
+
+def test_trim_boundary(store):
+    saver = BoundedCheckpointSaver(store, max_checkpoints=3)
+    save(saver, "t1", 3)
+    assert len(list(saver.list(config("t1")))) == 3
+    assert store.trim_thread("t1", "", 3) == 0
+    assert store.trim_thread("t1", "", 1) == 2
+    assert len(list(saver.list(config("t1")))) == 1
+
+
+def test_delete_thread_leaves_others(store):
+    saver = BoundedCheckpointSaver(store, max_checkpoints=None)
+    doomed = save(saver, "t1", 2)
+    save(saver, "t2", 2)
+    saver.delete_thread("t1")
+    assert saver.get_tuple(config("t1")) is None
+    assert list(saver.list(config("t1"))) == []
+    assert store.get_writes("t1", "", doomed[-1]) == []
+    assert len(list(saver.list(config("t2")))) == 2
+
+
+def test_evict_idle(store):
+    saver = BoundedCheckpointSaver(store, max_checkpoints=None, max_idle_seconds=60)
+    save(saver, "old", 1)
+    save(saver, "new", 1)
+    assert saver.evict_idle() == []
+    assert saver.evict_idle(max_idle_seconds=0) == []  # 0 disables eviction
+    time.sleep(0.02)
+    store.touch("new")
+    assert saver.evict_idle(max_idle_seconds=0.01) == ["old"]
+    assert saver.get_tuple(config("old")) is None
+    assert saver.get_tuple(config("new")) is not None
+
+
+def test_compact_trims_every_thread(store):
+    saver = BoundedCheckpointSaver(store, max_checkpoints=None)
+    save(saver, "t1", 4)
+    save(saver, "t2", 2)
+    saver.max_checkpoints = 2
+    saver.compact()
+    assert len(list(saver.list(config("t1")))) == 2
+    assert len(list(saver.list(config("t2")))) == 2
+
+
+
+def test_list_threads(store):
+    saver = BoundedCheckpointSaver(store, max_checkpoints=None)
+    save(saver, "t1", 3)
+    save(saver, "t2", 1)
+    assert sorted(store.list_threads()) == [("t1", ""), ("t2", "")]
+    saver.delete_thread("t1")
+    assert list(store.list_threads()) == [("t2", "")]
+
+
+def test_put_never_compacts(store, monkeypatch):
+    saver = BoundedCheckpointSaver(store, max_checkpoints=2, maintenance_every=1, max_idle_seconds=3600)
+    monkeypatch.setattr(store, "compact", lambda: pytest.fail("put() ran compact()"))
+    save(saver, "t1", 4)
+    assert len(list(saver.list(config("t1")))) == 2
@@ -0,0 +1,26 @@
+import csv
+
+from travel_core.climate import DEFAULT_DIR, FIELDS, ClimateStore, build
+
+
+def test_bundled_sample_answers_country_questions():
+    store = ClimateStore(DEFAULT_DIR)
+    assert store.find_place("What's Italy like in October?") == "Italy"
+    assert store.resolve("Rome") is not None
+
+
+def test_build_round_trip(tmp_path):
+    source = tmp_path / "normals.csv"
+    with open(source, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["city", "country_code", "country", "month", *FIELDS])
+        writer.writerow(["Rome", "IT", "Italy", "10", "13.1", "22.8", "113", "8", "6.1"])
+        writer.writerow(["Rome", "IT", "Italy", "Jul", "18", "31", "", "2", ""])
+    assert build(str(source), str(tmp_path / "store")) == 1
+    store = ClimateStore(str(tmp_path / "store"))
+    assert store.normals("Rome", 10)["months"] == {
+        "Oct": {"tmin_c": 13.1, "tmax_c": 22.8, "precip_mm": 113.0, "rain_days": 8.0, "sun_hours": 6.1}
+    }
+    # Empty cells are left out rather than reported as zero
+    assert store.normals("Rome,IT", 7)["months"] == {"Jul": {"tmin_c": 18.0, "tmax_c": 31.0, "rain_days": 2.0}}
+    assert store.normals("Paris") is None
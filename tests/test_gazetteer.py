@@ -0,0 +1,56 @@
+import pytest
+
+from travel_core.gazetteer import DEFAULT_DIR, Gazetteer
+
+
+@pytest.fixture(scope="module")
+def gazetteer():
+    return Gazetteer(DEFAULT_DIR)
+
+
+@pytest.mark.parametrize("text, label", [
+    ("Paris", "Paris, FR"),
+    ("paris", "Paris, FR"),
+    ("Paris TX", "Paris, TX, US"),
+    ("Paris, Texas", "Paris, TX, US"),
+    ("Springfield, Missouri", "Springfield, MO, US"),
+    ("Portland, Maine", "Portland, ME, US"),
+    ("London, ON", "London, ON, CA"),
+    ("Sydney, NSW", "Sydney, NSW, AU"),
+    ("München", "Munich, DE"),
+    ("San Fran", "San Francisco, CA, US"),
+])
+def test_resolves(gazetteer, text, label):
+    assert gazetteer.label(gazetteer.resolve(text)) == label
+
+
+@pytest.mark.parametrize("text, label", [
+    ("Barcelonna", "Barcelona, ES"),
+    ("Springfeld, MO", "Springfield, MO, US"),
+    ("Londn", "London, GB"),
+])
+def test_typos_resolve_fuzzily(gazetteer, text, label):
+    place, _, stage = gazetteer.lookup(text)[0]
+    assert (gazetteer.label(place), stage) == (label, "fuzzy")
+
+
+@pytest.mark.parametrize("text", [
+    "Bern",             # not in the sample, and not Berlin
+    "Genoa",            # not Geneva
+    "Paris, Kentucky",  # unknown qualifier
+    "Vienna, VA",       # no Vienna in Virginia in the sample
+    "Berlin, NH",
+    "",
+])
+def test_no_match(gazetteer, text):
+    assert gazetteer.resolve(text) is None
+
+
+def test_alternate_names_share_an_id(gazetteer):
+    assert gazetteer.resolve("Rome").id == gazetteer.resolve("Roma").id
+
+
+def test_missing_files(tmp_path):
+    empty = Gazetteer(str(tmp_path))
+    assert not empty.available()
+    assert empty.resolve("Paris") is None
@@ -0,0 +1,98 @@
+from travel_core.history import (
+    OLD_TOOL_OUTPUT_CHARS,
+    SUMMARY_HEADER,
+    SUMMARY_TOKEN_BUDGET,
+    HistoryManager,
+    is_summary,
+    message_tokens,
+)
+
+SYSTEM = {"role": "system", "content": "You are a travel agent."}
+
+
+def turn(n, tool_output=None):
+    """One user/assistant turn of 40-character messages, optionally with a tool call"""
+    messages = [{"role": "user", "content": f"question {n}".ljust(40, ".")}]
+    if tool_output is not None:
+        messages += [
+            {"role": "assistant", "content": "", "tool_calls": [{"id": f"call{n}", "name": "get_weather"}]},
+            {"role": "tool", "tool_call_id": f"call{n}", "content": tool_output},
+        ]
+    return messages + [{"role": "assistant", "content": f"answer {n}".ljust(40, ".")}]
+
+
+def manager(room):
+    """A HistoryManager with room for `room` tokens of turns after the system prompt and summary"""
+    return HistoryManager(token_budget=room + message_tokens(SYSTEM) + SUMMARY_TOKEN_BUDGET, max_stored_messages=0)
+
+
+def test_fits_unchanged():
+    messages = [SYSTEM, *turn(1), *turn(2)]
+    assert manager(1000).window(messages) == messages
+
+
+def test_drops_oldest_turns_into_a_summary():
+    messages = [SYSTEM, *turn(1), *turn(2), *turn(3)]
+    # Room for exactly two 14-token messages: the last turn
+    window = manager(28).window(messages)
+    assert window[0] == SYSTEM
+    assert is_summary(window[1])
+    assert "User: question 1" in window[1]["content"] and "Assistant: answer 2" in window[1]["content"]
+    assert window[2:] == turn(3)
+
+
+def test_budget_boundary_exactly_fits():
+    messages = [SYSTEM, *turn(1), *turn(2)]
+    assert manager(56).window(messages) == messages
+    assert manager(55).window(messages)[2:] == turn(2)
+
+
+def test_current_turn_kept_even_over_budget():
+    messages = [SYSTEM, *turn(1), *turn(2, tool_output="x" * 1000)]
+    window = manager(10).window(messages)
+    assert window[2:] == turn(2, tool_output="x" * 1000)
+
+
+def test_never_starts_mid_turn():
+    messages = [SYSTEM, *turn(1, tool_output="sunny"), *turn(2)]
+    # Room for the tool result and final answer of turn 1, but not its call or question
+    window = manager(28 + 20).window(messages)
+    assert window[1]["role"] == "system" and window[2:] == turn(2)
+
+
+def test_old_tool_output_truncated():
+    old, current = "a" * 500, "b" * 500
+    window = manager(1000).window([SYSTEM, *turn(1, tool_output=old), *turn(2, tool_output=current)])
+    tool_outputs = [m["content"] for m in window if m["role"] == "tool"]
+    assert tool_outputs[0].startswith("a" * OLD_TOOL_OUTPUT_CHARS) and len(tool_outputs[0]) < 500
+    assert tool_outputs[1] == current
+
+
+def test_previous_summary_rolled_in():
+    previous = {"role": "system", "content": SUMMARY_HEADER + "User: an older question"}
+    window = manager(28).window([SYSTEM, previous, *turn(1), *turn(2)])
+    summaries = [m for m in window if is_summary(m)]
+    assert len(summaries) == 1
+    assert summaries[0]["content"].splitlines()[1:] == [
+        "User: an older question",
+        "User: " + turn(1)[0]["content"],
+        "Assistant: " + turn(1)[1]["content"],
+    ]
+
+
+def test_no_summary_when_nothing_dropped():
+    window = manager(1000).window([SYSTEM, *turn(1)])
+    assert not any(is_summary(m) for m in window)
+
+
+def test_pre_model_hook_compacts_long_threads():
+    from langchain_core.messages import AIMessage, HumanMessage, RemoveMessage
+
+    messages = [m for n in range(6) for m in (HumanMessage(f"question {n}"), AIMessage(f"answer {n}"))]
+    short = HistoryManager(token_budget=SUMMARY_TOKEN_BUDGET + 20, max_stored_messages=10)
+    update = short.pre_model_hook({"messages": messages})
+    assert isinstance(update["messages"][0], RemoveMessage)
+    assert update["messages"][1:] == update["llm_input_messages"]
+    assert update["llm_input_messages"][-2:] == messages[-2:]
+
+    assert "messages" not in HistoryManager(max_stored_messages=100).pre_model_hook({"messages": messages})
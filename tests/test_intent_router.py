@@ -0,0 +1,114 @@
+from datetime import date
+
+import pytest
+
+from travel_core.intent_router import SEED_EXAMPLES, IntentRouter, TfidfClassifier, parse_day
+
+
+@pytest.fixture(scope="module")
+def router():
+    return IntentRouter(TfidfClassifier(SEED_EXAMPLES), enabled=True)
+
+
+@pytest.mark.parametrize("text, city", [
+    ("weather in Paris", "Paris"),
+    ("What's the weather like in Rome today?", "Rome"),
+    ("how is the weather in London right now", "London"),
+    ("is it raining in Berlin", "Berlin"),
+])
+def test_current_weather(router, text, city):
+    assert router.route(text)[:3] == ("weather", "get_weather", {"city": city})
+
+
+@pytest.mark.parametrize("text", [
+    "What's the weather in Paris tomorrow?",
+    "weather in Paris this week",
+    "weather forecast for Lisbon",
+    "will it rain in London on Saturday",
+    "weather in Oslo tonight",
+    "what's the weather like there",
+    "weather in Rome and flights to Rome",
+])
+def test_future_or_unclear_weather_goes_to_agent(router, text):
+    assert router.route(text).tool is None
+
+
+@pytest.mark.parametrize("text", [
+    "hotels in Paris",
+    "find flights to Tokyo",
+    "cheap flights to Rome",
+    "book a hotel in Lisbon",
+])
+def test_undated_lookups_use_web_search(router, text):
+    assert router.route(text)[:3] == ("search", "get_flight_and_hotel_information", {"query": text})
+
+
+def test_dated_flights(router):
+    route = router.route("cheapest flights from jfk to cdg on 2099-12-01 returning 2099-12-08")
+    assert route.tool == "search_flights"
+    assert route.args == {
+        "origin": "JFK", "destination": "CDG", "outbound_date": "2099-12-01",
+        "return_date": "2099-12-08", "sort": "price",
+    }
+
+
+def test_dated_hotels(router):
+    route = router.route("hotels in Paris from 2099-06-05 to 2099-06-08")
+    assert route.tool == "search_hotels"
+    assert route.args == {"location": "Paris", "check_in_date": "2099-06-05", "check_out_date": "2099-06-08"}
+
+
+@pytest.mark.parametrize("text", [
+    "how much are flights to Bali",
+    "Are there hotels in Paris?",
+    "why are flights to Rome expensive",
+    "can I fly to Rome",
+    "hotels in Paris near the Louvre",
+    "hotels in Rome for 4 people",
+    "flights from New York to London on June 5",      # needs airport codes
+    "hotels in Paris from 2099-06-08 to 2099-06-05",  # not a year-long stay
+    "hotels in Paris from someday to June 8",
+    "flights from JFK to CDG on 2099-06-08 returning 2099-06-05",
+])
+def test_search_needing_the_model_goes_to_agent(router, text):
+    assert router.route(text).tool is None
+
+
+def test_disabled_router_always_answers_agent():
+    assert IntentRouter(TfidfClassifier(SEED_EXAMPLES), enabled=False).route("weather in Paris").tool is None
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("2025-06-05", "2025-06-05"),
+    ("June 5", "2026-06-05"),
+    ("5 June", "2026-06-05"),
+    ("jun 5th", "2026-06-05"),
+    ("5th of June", "2026-06-05"),
+    ("Jan 3", "2027-01-03"),       # already past this year
+    ("March 1", "2026-03-01"),     # today counts
+    ("June 31", None),
+    ("someday", None),
+    ("5 6", None),
+])
+def test_parse_day(text, expected):
+    assert parse_day(text, today=date(2026, 3, 1)) == expected
+
+
+@pytest.mark.parametrize("text, place", [
+    ("What's Italy like in October?", "Italy"),
+    ("What's Paris like in October?", "Paris,FR"),
+    ("What's Paris, France like in October?", "Paris,FR"),
+    ("Is Rome warm in October?", "Rome,IT"),
+])
+def test_climate(router, text, place):
+    assert router.route(text)[:3] == ("climate", "get_climate_normals", {"place": place, "month": "October"})
+
+
+@pytest.mark.parametrize("text", [
+    "What is the weather like in Paris TX in October?",
+    "What is the weather like in Paris, Texas in October?",
+    "What's Paris, Kentucky like in October?",
+    "Find hotels in Rome in October",
+])
+def test_climate_for_another_city_or_a_booking_goes_to_agent(router, text):
+    assert router.route(text).tool is None
@@ -0,0 +1,64 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from travel_core.single_flight import SingleFlight, tool_call_key
+
+
+def test_concurrent_threads_share_one_call():
+    flight, release, calls = SingleFlight(), threading.Event(), []
+
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        return "sunny"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("paris", fetch))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    while flight.leaders + flight.shared < 5:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert results == ["sunny"] * 5 and len(calls) == 1
+    assert flight.stats() == {"leaders": 1, "shared": 4, "in_flight": 0}
+
+
+def test_errors_are_shared_and_not_cached():
+    flight = SingleFlight()
+
+    def fail():
+        raise RuntimeError("upstream down")
+
+    with pytest.raises(RuntimeError):
+        flight.do("paris", fail)
+    assert flight.do("paris", lambda: "sunny") == "sunny"
+
+
+def test_coroutines_share_one_call():
+    flight, calls = SingleFlight(), []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "sunny"
+
+    async def main():
+        return await asyncio.gather(*(flight.ado("paris", fetch) for _ in range(5)))
+
+    assert asyncio.run(main()) == ["sunny"] * 5 and len(calls) == 1
+    # Finished calls aren't remembered
+    assert asyncio.run(flight.ado("paris", fetch)) == "sunny" and len(calls) == 2
+
+
+def test_tool_call_key_normalizes():
+    weather, search = SimpleNamespace(name="get_weather"), SimpleNamespace(name="search_hotels")
+    assert tool_call_key(weather, {"city": "Rome"}) == tool_call_key(weather, {"city": " roma "})
+    assert tool_call_key(weather, {"city": "Paris"}) != tool_call_key(weather, {"city": "Paris TX"})
+    assert tool_call_key(search, {"location": "Paris ", "adults": 2}) == \
+        tool_call_key(search, {"adults": 2, "location": "paris"})
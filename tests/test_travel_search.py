@@ -0,0 +1,89 @@
+import asyncio
+from dataclasses import replace
+
+import pytest
+
+from travel_core.travel_search import FlightQuery, HotelQuery
+from travel_core.travel_search.engine import TravelSearch, merge, rank_flights, rank_hotels
+from travel_core.travel_search.providers import FixtureProvider, Provider, SearchError
+
+FLIGHTS = FlightQuery("JFK", "CDG", "2025-06-05")
+HOTELS = HotelQuery("Paris", "2025-06-05", "2025-06-08")
+
+
+@pytest.fixture(scope="module")
+def fixture():
+    return FixtureProvider()
+
+
+class Failing(Provider):
+    name = "failing"
+
+    def search_flights(self, query):
+        raise SearchError("HTTP 503")
+
+    def search_hotels(self, query):
+        raise KeyError("price")
+
+
+def test_fixture_flights_match_route_and_date(fixture):
+    offers = fixture.search_flights(FLIGHTS)
+    assert {(o.origin, o.destination) for o in offers} == {("JFK", "CDG")}
+    assert all(o.departure.startswith("2025-06-05 ") for o in offers)
+    assert fixture.search_flights(FlightQuery("CDG", "JFK", "2025-06-05")) == []
+
+
+def test_overnight_flight_arrives_next_day(fixture):
+    af7 = next(o for o in fixture.search_flights(FLIGHTS) if o.flight_numbers == ("AF 7",))
+    assert (af7.departure, af7.arrival) == ("2025-06-05 18:30", "2025-06-06 01:45")
+
+
+def test_fixture_hotels_total_for_the_stay(fixture):
+    offers = fixture.search_hotels(HOTELS)
+    assert offers and all(o.total_price == o.price_per_night * 3 for o in offers)
+    assert fixture.search_hotels(replace(HOTELS, location="Paris, FR")) == offers
+
+
+def test_merge_keeps_cheapest_copy_in_first_seen_order(fixture):
+    offers = fixture.search_flights(FLIGHTS)
+    cheaper = replace(offers[0], provider="other", price=offers[0].price - 10)
+    merged = merge(offers + [cheaper])
+    assert len(merged) == len(offers)
+    assert merged[0] is cheaper
+    assert merged[1:] == offers[1:]
+
+
+def test_rank_flights(fixture):
+    offers = fixture.search_flights(FLIGHTS)
+    assert [o.price for o in rank_flights(offers, "price")] == sorted(o.price for o in offers)
+    assert [o.duration_min for o in rank_flights(offers, "duration")] == sorted(o.duration_min for o in offers)
+    # Nonstop flights a little dearer beat one-stop ones that take hours longer
+    assert [o.stops for o in rank_flights(offers)][:2] == [0, 0]
+    assert rank_flights([]) == []
+
+
+def test_rank_hotels(fixture):
+    offers = fixture.search_hotels(HOTELS)
+    assert rank_hotels(offers, "price")[0].name == "Generator Paris"
+    assert rank_hotels(offers, "rating")[0].rating == max(o.rating for o in offers)
+
+
+def test_duplicate_providers_merge(fixture):
+    offers, errors = TravelSearch([fixture, FixtureProvider()], max_results=10).search_flights(FLIGHTS)
+    assert errors == {}
+    assert len(offers) == len(fixture.search_flights(FLIGHTS))
+
+
+def test_failing_provider_is_reported_not_fatal(fixture):
+    search = TravelSearch([fixture, Failing()], max_results=2)
+    offers, errors = search.search_flights(FLIGHTS, sort="price")
+    assert [o.price for o in offers] == [431, 455]
+    assert errors == {"failing": "HTTP 503"}
+    # Bugs in an adapter are named by type only
+    offers, errors = asyncio.run(search.asearch_hotels(HOTELS))
+    assert len(offers) == 2 and errors == {"failing": "KeyError"}
+
+
+def test_missing_fixture_file(tmp_path):
+    with pytest.raises(SearchError):
+        FixtureProvider(str(tmp_path / "none.json")).search_flights(FLIGHTS)
@@ -0,0 +1,5 @@
+"""Shared building blocks used by main.py, langchain/main.py and chat_ui.py"""
+from dotenv import load_dotenv
+
+# Cache sizes, TTLs and paths are read from the environment at import time
+load_dotenv()
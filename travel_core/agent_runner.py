@@ -0,0 +1,110 @@
+"""ainvoke/astream-based runners shared by chat_ui.py and langchain/main.py"""
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage, ToolMessage
+
+from travel_core import aio
+from travel_core.intent_router import intent_router
+from travel_core.semantic_cache import semantic_cache
+
+
+def _inputs(user_input, thread_id):
+    return (
+        {"messages": [{"role": "user", "content": user_input}]},
+        {"configurable": {"thread_id": thread_id}},
+    )
+
+
+def final_text(result):
+    for message in reversed(result["messages"]):
+        if isinstance(message, AIMessage) and isinstance(message.content, str) and message.content.strip():
+            return message.content
+    return None
+
+
+async def _aremember_turn(agent, config, user_input, answer):
+    """Record a cache-served turn in the thread so follow-ups keep their context"""
+    messages = [HumanMessage(content=user_input), AIMessage(content=answer)]
+    await agent.aupdate_state(config, {"messages": messages}, as_node="agent")
+    return {"messages": messages}
+
+
+async def arun_agent(agent, user_input, thread_id, first_turn=False):
+    """
+    Run one conversation turn on the agent without blocking a thread.
+    Simple lookups are answered by the intent router without the model.
+    First turns carry no conversation state, so they may be served from
+    (and are stored in) the semantic cache.
+    """
+    inputs, config = _inputs(user_input, thread_id)
+    route = intent_router.route(user_input)
+    if route.tool:
+        answer = await intent_router.arun(route)
+        if answer is not None:
+            return await _aremember_turn(agent, config, user_input, answer)
+    if first_turn:
+        answer = semantic_cache.lookup(user_input)
+        if answer is not None:
+            return await _aremember_turn(agent, config, user_input, answer)
+    result = await agent.ainvoke(inputs, config=config)
+    if first_turn:
+        semantic_cache.add(user_input, final_text(result))
+    return result
+
+
+def run_agent(agent, user_input, thread_id, timeout=None, first_turn=False):
+    """Sync entry point: runs arun_agent on the shared background loop"""
+    return aio.run(arun_agent(agent, user_input, thread_id, first_turn), timeout=timeout)
+
+
+async def astream_agent(agent, user_input, thread_id, first_turn=False):
+    """
+    Stream one turn as (kind, value) events:
+    ("token", text) for assistant output, ("tool_start", name) when the model
+    calls a tool and ("tool_end", name) once the tool result is back.
+    """
+    inputs, config = _inputs(user_input, thread_id)
+    route = intent_router.route(user_input)
+    if route.tool:
+        yield ("tool_start", route.tool)
+        answer = await intent_router.arun(route)
+        yield ("tool_end", route.tool)
+        if answer is not None:
+            await _aremember_turn(agent, config, user_input, answer)
+            yield ("token", answer)
+            return
+
+    if first_turn:
+        answer = semantic_cache.lookup(user_input)
+        if answer is not None:
+            await _aremember_turn(agent, config, user_input, answer)
+            yield ("token", answer)
+            return
+
+    # Text of the last model call, i.e. the final answer once the stream ends
+    answer = []
+    async for message, _metadata in agent.astream(inputs, config=config, stream_mode="messages"):
+        if isinstance(message, AIMessage):
+            # Streaming models emit chunks, others one whole message
+            calls = message.tool_call_chunks if isinstance(message, AIMessageChunk) else message.tool_calls
+            for call in calls:
+                if call.get("name"):
+                    answer = []
+                    yield ("tool_start", call["name"])
+            if isinstance(message.content, str) and message.content:
+                answer.append(message.content)
+                yield ("token", message.content)
+        elif isinstance(message, ToolMessage):
+            yield ("tool_end", message.name)
+
+    if first_turn:
+        semantic_cache.add(user_input, "".join(answer))
+
+
+def remember_turn(agent, thread_id, user_input, answer):
+    """Sync wrapper: store a precomputed answer as a turn of the thread"""
+    config = {"configurable": {"thread_id": thread_id}}
+    return aio.run(_aremember_turn(agent, config, user_input, answer))
+
+
+def stream_agent(agent, user_input, thread_id, first_turn=False):
+    """Sync generator over astream_agent, driven on the shared background loop"""
+    return aio.iterate(astream_agent(agent, user_input, thread_id, first_turn))
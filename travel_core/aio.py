@@ -0,0 +1,59 @@
+"""
+A single long-lived event loop for running coroutines from sync code.
+
+Streamlit reruns and the CLI are synchronous, so they hand their agent runs
+to this loop instead of spinning up a fresh loop (and a fresh HTTP pool)
+for every message.
+"""
+import asyncio
+import queue
+import threading
+
+_loop = None
+_lock = threading.Lock()
+
+
+def get_loop():
+    """Background event loop, started on first use"""
+    global _loop
+    if _loop is None:
+        with _lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="travel-aio", daemon=True).start()
+                _loop = loop
+    return _loop
+
+
+def run(coro, timeout=None):
+    """Run `coro` on the background loop and block until it finishes"""
+    return asyncio.run_coroutine_threadsafe(coro, get_loop()).result(timeout)
+
+
+def iterate(agen):
+    """Drive an async generator on the background loop and yield its items here"""
+    items = queue.Queue()
+    done = object()
+
+    async def pump():
+        try:
+            async for item in agen:
+                items.put(item)
+        except BaseException as e:
+            items.put(_Raised(e))
+        finally:
+            items.put(done)
+
+    asyncio.run_coroutine_threadsafe(pump(), get_loop())
+    while True:
+        item = items.get()
+        if item is done:
+            return
+        if isinstance(item, _Raised):
+            raise item.error
+        yield item
+
+
+class _Raised:
+    def __init__(self, error):
+        self.error = error
@@ -0,0 +1,59 @@
+"""
+Async counterpart of http_client built on httpx.
+
+Each event loop gets its own pooled AsyncClient (keep-alive, same timeouts as
+the sync client) and GETs are retried with exponential backoff plus jitter.
+"""
+import asyncio
+import random
+import weakref
+
+from travel_core.http_client import (
+    BACKOFF_FACTOR,
+    BACKOFF_JITTER,
+    CONNECT_TIMEOUT,
+    MAX_RETRIES,
+    POOL_MAXSIZE,
+    READ_TIMEOUT,
+)
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+_clients = weakref.WeakKeyDictionary()
+
+
+def get_client():
+    """AsyncClient bound to the running event loop, created on first use"""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        # httpx (and what it pulls in) is only imported once async I/O is actually used
+        import httpx
+
+        client = httpx.AsyncClient(
+            timeout=httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT),
+            limits=httpx.Limits(max_connections=POOL_MAXSIZE * 4, max_keepalive_connections=POOL_MAXSIZE),
+        )
+        _clients[loop] = client
+    return client
+
+
+def backoff_delay(attempt):
+    return BACKOFF_FACTOR * (2 ** attempt) + random.uniform(0, BACKOFF_JITTER)
+
+
+async def get(url, params=None, timeout=None):
+    """GET through the loop's pool, retrying transport errors and 429/5xx"""
+    import httpx
+
+    client = get_client()
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            response = await client.get(url, params=params, timeout=timeout or httpx.USE_CLIENT_DEFAULT)
+        except httpx.TransportError:
+            if attempt == MAX_RETRIES:
+                raise
+        else:
+            if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                return response
+        await asyncio.sleep(backoff_delay(attempt))
@@ -0,0 +1,143 @@
+"""
+Batch mode: run a JSONL file of requests through the agent.
+
+Each input line is a JSON object with the user message under "input" (or
+"prompt"/"body"), plus an optional "id" and "thread_id". Lines sharing a
+thread_id are turns of one conversation and run in file order; everything
+else runs concurrently, at most `concurrency` at a time.
+
+Lines that aren't JSON objects (or strings, taken as the input itself) get
+an error line in the output; the rest of the batch carries on.
+
+Results are appended to the output JSONL file as soon as each request
+finishes, so a killed run can simply be restarted: requests whose id already
+has a successful line in the output are skipped. Once a turn of a
+conversation fails, its later turns are not run (they get an error line
+naming the failed turn), so a restart re-runs the conversation from the
+failed turn onwards, in order.
+"""
+import asyncio
+import contextlib
+import json
+import sys
+import time
+
+from travel_core.agent_runner import arun_agent, final_text
+
+INPUT_FIELDS = ("input", "prompt", "body")
+
+
+def read_requests(path):
+    """Yield (request_id, user_input, thread_id) lazily; line numbers stand in for missing ids"""
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                item = json.loads(line)
+            except ValueError:
+                item = {"id": f"line-{line_no}"}
+            if isinstance(item, str):
+                item = {"input": item}
+            elif not isinstance(item, dict):
+                item = {}  # 42, null, a list: reported like an unparseable line
+            request_id = str(item.get("id") or item.get("request_id") or f"line-{line_no}")
+            user_input = next((item[k] for k in INPUT_FIELDS if isinstance(item.get(k), str)), None)
+            thread_id = item.get("thread_id")
+            yield request_id, user_input, str(thread_id) if thread_id is not None else None
+
+
+def completed_ids(path):
+    """Ids already answered in an existing output file"""
+    done = set()
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    continue  # a line cut short when the last run was killed
+                if isinstance(row, dict) and row.get("error") is None and "id" in row:
+                    done.add(row["id"])
+    except FileNotFoundError:
+        pass
+    return done
+
+
+class BatchRunner:
+    def __init__(self, agent, concurrency=8, timeout=None):
+        self.agent = agent
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.stats = {"ok": 0, "failed": 0, "skipped": 0}
+        self._failed_threads = {}   # thread_id -> id of the turn that failed
+
+    async def _run_one(self, request_id, user_input, thread_id, out, semaphore, thread_locks):
+        first_turn = thread_id is None
+        # Turns of one conversation wait for each other; only then take a concurrency slot
+        turns = None if first_turn else thread_locks[thread_id]
+        thread_id = thread_id or f"batch-{request_id}"
+        row = {"id": request_id, "thread_id": thread_id, "input": user_input}
+        async with turns[0] if turns else contextlib.nullcontext(), semaphore:
+            start = time.perf_counter()
+            try:
+                if user_input is None:
+                    raise ValueError(f"not a JSON object or no {'/'.join(INPUT_FIELDS)} field")
+                if thread_id in self._failed_threads:
+                    # Without the failed turn in its history this one would get a different answer
+                    raise RuntimeError(f"earlier turn {self._failed_threads[thread_id]} of this thread failed")
+                result = await asyncio.wait_for(
+                    arun_agent(self.agent, user_input, thread_id, first_turn=first_turn), self.timeout
+                )
+                row["output"] = final_text(result)
+                row["error"] = None
+                self.stats["ok"] += 1
+            except Exception as e:
+                row["output"] = None
+                row["error"] = f"{type(e).__name__}: {e}"
+                self.stats["failed"] += 1
+                if not first_turn:
+                    self._failed_threads.setdefault(thread_id, request_id)
+            row["elapsed_s"] = round(time.perf_counter() - start, 3)
+        if turns:
+            turns[1] -= 1
+            if not turns[1]:
+                del thread_locks[thread_id]
+        out.write(json.dumps(row, ensure_ascii=False) + "\n")
+        out.flush()
+
+    async def arun(self, requests, out, skip=()):
+        """Run (request_id, user_input, thread_id) items, writing one JSON line each to out"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        # Explicit thread_id -> [lock, turns queued]; dropped once no turn of it is queued
+        thread_locks = {}
+        pending = set()
+        for request_id, user_input, thread_id in requests:
+            if request_id in skip:
+                self.stats["skipped"] += 1
+                continue
+            if thread_id is not None:
+                thread_locks.setdefault(thread_id, [asyncio.Lock(), 0])[1] += 1
+            pending.add(asyncio.ensure_future(
+                self._run_one(request_id, user_input, thread_id, out, semaphore, thread_locks)
+            ))
+            # Keep the input streaming: only a bounded window of requests is in memory
+            if len(pending) >= self.concurrency * 4:
+                _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        if pending:
+            await asyncio.wait(pending)
+        return self.stats
+
+
+async def arun_batch(agent, input_path, output_path, concurrency=8, timeout=None):
+    """Process input_path into output_path, resuming from whatever output_path already holds"""
+    runner = BatchRunner(agent, concurrency, timeout)
+    skip = completed_ids(output_path)
+    with open(output_path, "a", encoding="utf-8") as out:
+        stats = await runner.arun(read_requests(input_path), out, skip)
+    print(
+        f"Batch done: {stats['ok']} ok, {stats['failed']} failed, {stats['skipped']} already done",
+        file=sys.stderr,
+    )
+    return stats
@@ -0,0 +1,541 @@
+"""
+Persistent, bounded LangGraph checkpointer.
+
+BoundedCheckpointSaver implements LangGraph's BaseCheckpointSaver on top of a
+small CheckpointStore interface that only deals in bytes. SQLiteCheckpointStore
+is the default (one file, shared by every UI worker on the node, survives
+restarts); MemoryCheckpointStore is a dict-backed stand-in with the same shape
+a Redis-like store would have.
+
+On top of plain persistence the saver bounds memory: only the newest
+`max_checkpoints` checkpoints per thread are kept, threads idle for longer
+than `max_idle_seconds` are evicted, and compact() reclaims space. put() only
+trims and evicts; compact() rewrites the SQLite file under an exclusive lock,
+so it runs on its own, e.g. from a nightly job:
+
+    python -m travel_core.checkpoint compact
+"""
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    CheckpointTuple,
+    get_checkpoint_id,
+)
+
+from travel_core.tracing import span
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "checkpoints.sqlite3")
+
+# checkpoint and metadata are (type, bytes) pairs produced by the serializer
+StoredCheckpoint = namedtuple(
+    "StoredCheckpoint", "thread_id checkpoint_ns checkpoint_id parent_checkpoint_id checkpoint metadata"
+)
+
+
+class CheckpointStore:
+    """Byte-level storage used by BoundedCheckpointSaver"""
+
+    def put_checkpoint(self, stored):
+        raise NotImplementedError
+
+    def get_checkpoint(self, thread_id, checkpoint_ns, checkpoint_id=None):
+        """The given checkpoint, or the newest one when checkpoint_id is None"""
+        raise NotImplementedError
+
+    def list_checkpoints(self, thread_id=None, checkpoint_ns=None, before_id=None, limit=None):
+        """Checkpoints newest first"""
+        raise NotImplementedError
+
+    def list_threads(self):
+        """Distinct (thread_id, checkpoint_ns) pairs that have checkpoints"""
+        raise NotImplementedError
+
+    def put_writes(self, thread_id, checkpoint_ns, checkpoint_id, task_id, task_path, rows, replace):
+        """rows are (idx, channel, (type, bytes)); replace overwrites existing idx"""
+        raise NotImplementedError
+
+    def get_writes(self, thread_id, checkpoint_ns, checkpoint_id):
+        """Pending writes as (task_id, channel, (type, bytes))"""
+        raise NotImplementedError
+
+    def delete_thread(self, thread_id):
+        raise NotImplementedError
+
+    def trim_thread(self, thread_id, checkpoint_ns, keep):
+        """Drop all but the newest `keep` checkpoints (and their writes)"""
+        raise NotImplementedError
+
+    def touch(self, thread_id):
+        raise NotImplementedError
+
+    def idle_threads(self, last_access_before):
+        raise NotImplementedError
+
+    def compact(self):
+        pass
+
+
+class SQLiteCheckpointStore(CheckpointStore):
+    """CheckpointStore in a WAL-mode SQLite file, one connection per thread"""
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self._local = threading.local()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS checkpoints (
+                    thread_id TEXT NOT NULL,
+                    checkpoint_ns TEXT NOT NULL DEFAULT '',
+                    checkpoint_id TEXT NOT NULL,
+                    parent_checkpoint_id TEXT,
+                    type TEXT,
+                    checkpoint BLOB,
+                    metadata_type TEXT,
+                    metadata BLOB,
+                    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+                );
+                CREATE TABLE IF NOT EXISTS writes (
+                    thread_id TEXT NOT NULL,
+                    checkpoint_ns TEXT NOT NULL DEFAULT '',
+                    checkpoint_id TEXT NOT NULL,
+                    task_id TEXT NOT NULL,
+                    task_path TEXT NOT NULL DEFAULT '',
+                    idx INTEGER NOT NULL,
+                    channel TEXT NOT NULL,
+                    type TEXT,
+                    value BLOB,
+                    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+                );
+                CREATE TABLE IF NOT EXISTS threads (
+                    thread_id TEXT PRIMARY KEY,
+                    last_access REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS threads_last_access ON threads (last_access);
+                """
+            )
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _row(row):
+        return StoredCheckpoint(row[0], row[1], row[2], row[3], (row[4], row[5]), (row[6], row[7]))
+
+    def put_checkpoint(self, stored):
+        self._conn().execute(
+            "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                stored.thread_id, stored.checkpoint_ns, stored.checkpoint_id, stored.parent_checkpoint_id,
+                stored.checkpoint[0], stored.checkpoint[1], stored.metadata[0], stored.metadata[1],
+            ),
+        )
+
+    def get_checkpoint(self, thread_id, checkpoint_ns, checkpoint_id=None):
+        query = "SELECT * FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?"
+        args = [thread_id, checkpoint_ns]
+        if checkpoint_id:
+            query += " AND checkpoint_id = ?"
+            args.append(checkpoint_id)
+        else:
+            query += " ORDER BY checkpoint_id DESC LIMIT 1"
+        row = self._conn().execute(query, args).fetchone()
+        return self._row(row) if row else None
+
+    def list_checkpoints(self, thread_id=None, checkpoint_ns=None, before_id=None, limit=None):
+        clauses, args = [], []
+        if thread_id is not None:
+            clauses.append("thread_id = ?")
+            args.append(thread_id)
+        if checkpoint_ns is not None:
+            clauses.append("checkpoint_ns = ?")
+            args.append(checkpoint_ns)
+        if before_id is not None:
+            clauses.append("checkpoint_id < ?")
+            args.append(before_id)
+        query = "SELECT * FROM checkpoints"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY checkpoint_id DESC"
+        if limit:
+            query += f" LIMIT {int(limit)}"
+        for row in self._conn().execute(query, args).fetchall():
+            yield self._row(row)
+
+    def list_threads(self):
+        # Just the key columns, so this never loads checkpoint blobs
+        return self._conn().execute("SELECT DISTINCT thread_id, checkpoint_ns FROM checkpoints").fetchall()
+
+    def put_writes(self, thread_id, checkpoint_ns, checkpoint_id, task_id, task_path, rows, replace):
+        verb = "INSERT OR REPLACE" if replace else "INSERT OR IGNORE"
+        self._conn().executemany(
+            f"{verb} INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (thread_id, checkpoint_ns, checkpoint_id, task_id, task_path, idx, channel, value[0], value[1])
+                for idx, channel, value in rows
+            ],
+        )
+
+    def get_writes(self, thread_id, checkpoint_ns, checkpoint_id):
+        rows = self._conn().execute(
+            "SELECT task_id, channel, type, value FROM writes"
+            " WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?"
+            " ORDER BY task_id, idx",
+            (thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchall()
+        return [(task_id, channel, (type_, value)) for task_id, channel, type_, value in rows]
+
+    def delete_thread(self, thread_id):
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN")
+            for table in ("checkpoints", "writes", "threads"):
+                conn.execute(f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,))
+
+    def trim_thread(self, thread_id, checkpoint_ns, keep):
+        conn = self._conn()
+        cutoff = conn.execute(
+            "SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?"
+            " ORDER BY checkpoint_id DESC LIMIT 1 OFFSET ?",
+            (thread_id, checkpoint_ns, keep - 1),
+        ).fetchone()
+        if cutoff is None:
+            return 0
+        with conn:
+            conn.execute("BEGIN")
+            removed = conn.execute(
+                "DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id < ?",
+                (thread_id, checkpoint_ns, cutoff[0]),
+            ).rowcount
+            conn.execute(
+                "DELETE FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id < ?",
+                (thread_id, checkpoint_ns, cutoff[0]),
+            )
+        return removed
+
+    def touch(self, thread_id):
+        self._conn().execute(
+            "INSERT OR REPLACE INTO threads (thread_id, last_access) VALUES (?, ?)", (thread_id, time.time())
+        )
+
+    def idle_threads(self, last_access_before):
+        rows = self._conn().execute(
+            "SELECT thread_id FROM threads WHERE last_access < ?", (last_access_before,)
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def compact(self):
+        conn = self._conn()
+        # In WAL mode VACUUM writes the rebuilt file to the WAL, so checkpoint after it
+        conn.execute("VACUUM")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+
+class MemoryCheckpointStore(CheckpointStore):
+    """Dict-backed CheckpointStore; the key layout mirrors a Redis-style hash per thread"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._checkpoints = {}  # (thread_id, ns) -> {checkpoint_id: StoredCheckpoint}
+        self._writes = {}  # (thread_id, ns, checkpoint_id) -> {(task_id, idx): (task_id, channel, value)}
+        self._last_access = {}
+
+    def put_checkpoint(self, stored):
+        with self._lock:
+            self._checkpoints.setdefault((stored.thread_id, stored.checkpoint_ns), {})[stored.checkpoint_id] = stored
+
+    def get_checkpoint(self, thread_id, checkpoint_ns, checkpoint_id=None):
+        with self._lock:
+            saved = self._checkpoints.get((thread_id, checkpoint_ns))
+            if not saved:
+                return None
+            if checkpoint_id:
+                return saved.get(checkpoint_id)
+            return saved[max(saved)]
+
+    def list_checkpoints(self, thread_id=None, checkpoint_ns=None, before_id=None, limit=None):
+        with self._lock:
+            matches = [
+                stored
+                for (tid, ns), saved in self._checkpoints.items()
+                if (thread_id is None or tid == thread_id) and (checkpoint_ns is None or ns == checkpoint_ns)
+                for stored in saved.values()
+                if before_id is None or stored.checkpoint_id < before_id
+            ]
+        matches.sort(key=lambda stored: stored.checkpoint_id, reverse=True)
+        return iter(matches[:limit] if limit else matches)
+
+    def list_threads(self):
+        with self._lock:
+            return [key for key, saved in self._checkpoints.items() if saved]
+
+    def put_writes(self, thread_id, checkpoint_ns, checkpoint_id, task_id, task_path, rows, replace):
+        with self._lock:
+            writes = self._writes.setdefault((thread_id, checkpoint_ns, checkpoint_id), {})
+            for idx, channel, value in rows:
+                if replace or (task_id, idx) not in writes:
+                    writes[(task_id, idx)] = (task_id, channel, value)
+
+    def get_writes(self, thread_id, checkpoint_ns, checkpoint_id):
+        with self._lock:
+            writes = self._writes.get((thread_id, checkpoint_ns, checkpoint_id), {})
+            return [writes[key] for key in sorted(writes)]
+
+    def delete_thread(self, thread_id):
+        with self._lock:
+            for key in [key for key in self._checkpoints if key[0] == thread_id]:
+                del self._checkpoints[key]
+            for key in [key for key in self._writes if key[0] == thread_id]:
+                del self._writes[key]
+            self._last_access.pop(thread_id, None)
+
+    def trim_thread(self, thread_id, checkpoint_ns, keep):
+        with self._lock:
+            saved = self._checkpoints.get((thread_id, checkpoint_ns), {})
+            stale = sorted(saved, reverse=True)[keep:]
+            for checkpoint_id in stale:
+                del saved[checkpoint_id]
+                self._writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+            return len(stale)
+
+    def touch(self, thread_id):
+        self._last_access[thread_id] = time.time()
+
+    def idle_threads(self, last_access_before):
+        with self._lock:
+            return [tid for tid, seen in self._last_access.items() if seen < last_access_before]
+
+
+class BoundedCheckpointSaver(BaseCheckpointSaver):
+    """BaseCheckpointSaver over a CheckpointStore with per-thread and idle bounds"""
+
+    def __init__(self, store, max_checkpoints=20, max_idle_seconds=None, maintenance_every=100, serde=None):
+        super().__init__(serde=serde)
+        self.store = store
+        self.max_checkpoints = max_checkpoints
+        self.max_idle_seconds = max_idle_seconds
+        self.maintenance_every = maintenance_every
+        self._puts = 0
+
+    # -- sync API ---------------------------------------------------------
+
+    def get_tuple(self, config):
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        with span("checkpoint", "get_tuple") as record:
+            stored = self.store.get_checkpoint(thread_id, checkpoint_ns, get_checkpoint_id(config))
+            record["found"] = stored is not None
+            if stored is None:
+                return None
+            record["payload_bytes"] = len(stored.checkpoint[1])
+            self.store.touch(thread_id)
+            return self._to_tuple(stored)
+
+    def list(self, config, *, filter=None, before=None, limit=None):
+        configurable = (config or {}).get("configurable", {})
+        before_id = get_checkpoint_id(before) if before else None
+        returned = 0
+        # Metadata filters are applied after loading, so don't push the limit down then
+        for stored in self.store.list_checkpoints(
+            configurable.get("thread_id"),
+            configurable.get("checkpoint_ns"),
+            before_id,
+            None if filter else limit,
+        ):
+            if configurable.get("checkpoint_id") and stored.checkpoint_id != configurable["checkpoint_id"]:
+                continue
+            item = self._to_tuple(stored)
+            if filter and not all(item.metadata.get(k) == v for k, v in filter.items()):
+                continue
+            yield item
+            returned += 1
+            if limit and returned >= limit:
+                return
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        with span("checkpoint", "put") as record:
+            serialized = self.serde.dumps_typed(checkpoint)
+            record["payload_bytes"] = len(serialized[1])
+            self.store.put_checkpoint(StoredCheckpoint(
+                thread_id,
+                checkpoint_ns,
+                checkpoint["id"],
+                configurable.get("checkpoint_id"),
+                serialized,
+                self.serde.dumps_typed(dict(metadata)),
+            ))
+            self.store.touch(thread_id)
+            if self.max_checkpoints:
+                self.store.trim_thread(thread_id, checkpoint_ns, self.max_checkpoints)
+        self._puts += 1
+        if self.maintenance_every and self._puts % self.maintenance_every == 0:
+            self.evict_idle()
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(self, config, writes, task_id, task_path=""):
+        configurable = config["configurable"]
+        rows = [
+            (WRITES_IDX_MAP.get(channel, idx), channel, self.serde.dumps_typed(value))
+            for idx, (channel, value) in enumerate(writes)
+        ]
+        with span("checkpoint", "put_writes", payload_bytes=sum(len(row[2][1]) for row in rows)):
+            self.store.put_writes(
+                configurable["thread_id"],
+                configurable.get("checkpoint_ns", ""),
+                configurable["checkpoint_id"],
+                task_id,
+                task_path,
+                rows,
+                # Special channels (errors, interrupts, ...) overwrite; regular writes are idempotent
+                replace=all(channel in WRITES_IDX_MAP for channel, _ in writes),
+            )
+
+    def delete_thread(self, thread_id):
+        self.store.delete_thread(thread_id)
+
+    def get_next_version(self, current, channel):
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+    # -- async API (store calls are short, but keep disk I/O off the loop) --
+
+    async def aget_tuple(self, config):
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(self, config, *, filter=None, before=None, limit=None):
+        items = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for item in items:
+            yield item
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config, writes, task_id, task_path=""):
+        return await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id):
+        return await asyncio.to_thread(self.delete_thread, thread_id)
+
+    # -- housekeeping ------------------------------------------------------
+
+    def evict_idle(self, max_idle_seconds=None):
+        """Delete threads untouched for longer than max_idle_seconds; returns their ids"""
+        max_idle = self.max_idle_seconds if max_idle_seconds is None else max_idle_seconds
+        if not max_idle:
+            return []
+        evicted = self.store.idle_threads(time.time() - max_idle)
+        for thread_id in evicted:
+            self.store.delete_thread(thread_id)
+        return evicted
+
+    def compact(self):
+        """Trim every thread to max_checkpoints, evict idle threads and reclaim space; returns the evicted ids"""
+        if self.max_checkpoints:
+            for thread_id, checkpoint_ns in self.store.list_threads():
+                self.store.trim_thread(thread_id, checkpoint_ns, self.max_checkpoints)
+        evicted = self.evict_idle()
+        self.store.compact()
+        return evicted
+
+    def _to_tuple(self, stored):
+        config = {
+            "configurable": {
+                "thread_id": stored.thread_id,
+                "checkpoint_ns": stored.checkpoint_ns,
+                "checkpoint_id": stored.checkpoint_id,
+            }
+        }
+        parent_config = None
+        if stored.parent_checkpoint_id:
+            parent_config = {
+                "configurable": {
+                    "thread_id": stored.thread_id,
+                    "checkpoint_ns": stored.checkpoint_ns,
+                    "checkpoint_id": stored.parent_checkpoint_id,
+                }
+            }
+        return CheckpointTuple(
+            config=config,
+            checkpoint=self.serde.loads_typed(stored.checkpoint),
+            metadata=self.serde.loads_typed(stored.metadata),
+            parent_config=parent_config,
+            pending_writes=[
+                (task_id, channel, self.serde.loads_typed(value))
+                for task_id, channel, value in self.store.get_writes(
+                    stored.thread_id, stored.checkpoint_ns, stored.checkpoint_id
+                )
+            ],
+        )
+
+
+def make_checkpointer():
+    """Checkpointer configured from CHECKPOINT_* environment variables"""
+    backend = os.getenv("CHECKPOINT_BACKEND", "sqlite")
+    if backend == "memory":
+        store = MemoryCheckpointStore()
+    elif backend == "sqlite":
+        store = SQLiteCheckpointStore(os.getenv("CHECKPOINT_DB_PATH", DEFAULT_PATH))
+    else:
+        raise ValueError(f"Unknown CHECKPOINT_BACKEND: {backend}")
+    return BoundedCheckpointSaver(
+        store,
+        max_checkpoints=int(os.getenv("CHECKPOINT_MAX_PER_THREAD", "20")),
+        max_idle_seconds=float(os.getenv("CHECKPOINT_MAX_IDLE_SECONDS", str(7 * 24 * 3600))),
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Maintain the conversation checkpoint store")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("compact", help="trim and evict per the CHECKPOINT_* settings, then reclaim disk space")
+    parser.parse_args(argv)
+
+    saver = make_checkpointer()
+    path = getattr(saver.store, "path", None)
+
+    def disk_bytes():
+        # The WAL file holds recent writes until it's checkpointed into the database
+        return sum(os.path.getsize(p) for p in (path, path + "-wal") if os.path.exists(p))
+
+    before = disk_bytes() if path else None
+    evicted = saver.compact()
+    print(f"Compacted checkpoints: {len(evicted)} idle thread(s) evicted", end="")
+    print(f", {path} {before:,} -> {disk_bytes():,} bytes" if path else "")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+Local climate normals: monthly averages per city, answered without any API call.
+
+The store is two files in CLIMATE_DATA_DIR (default data/climate/):
+  normals.npy   float32 array [city_id, month, field], memory-mapped on use
+  index.json    city_id -> name/country, and the field names
+
+Both are built offline from a bulk CSV with one row per city and month:
+
+    city,country_code,country,month,tmin_c,tmax_c,precip_mm,rain_days,sun_hours
+    Rome,IT,Italy,10,13.1,22.8,113,8,6.1
+
+    python -m travel_core.climate build normals.csv
+
+Missing values may be left empty. Rebuilding replaces the files atomically and
+running processes pick up the new data on their next lookup. A ten-city
+sample, built from data/climate/normals.csv, is bundled.
+"""
+import argparse
+import calendar
+import csv
+import json
+import os
+import re
+import sys
+import threading
+import warnings
+
+import numpy as np
+
+from travel_core.weather_cache import normalize_city
+
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "climate")
+FIELDS = ("tmin_c", "tmax_c", "precip_mm", "rain_days", "sun_hours")
+
+MONTHS = {name.lower(): i for i, name in enumerate(calendar.month_name) if name}
+MONTHS.update({name.lower(): i for i, name in enumerate(calendar.month_abbr) if name})
+MONTHS["sept"] = 9
+
+# "in October", "during early may", ... (bare "may" is too ambiguous)
+MONTH_PHRASE = re.compile(
+    r"\b(?:in|during|for|around|by|next|this)\s+(?:(?:early|mid|late)[\s-]+)?"
+    r"(" + "|".join(calendar.month_name[1:]) + r")\b",
+    re.IGNORECASE,
+)
+_WORD = re.compile(r"[^\W\d_]+(?:[-'][^\W\d_]+)*")
+
+
+def parse_month(value):
+    """1-12 from a month number or (abbreviated) name, else None"""
+    if isinstance(value, int) or (isinstance(value, str) and value.strip().isdigit()):
+        month = int(value)
+        return month if 1 <= month <= 12 else None
+    if isinstance(value, str):
+        return MONTHS.get(value.strip().lower().rstrip("."))
+    return None
+
+
+def find_month(text):
+    match = MONTH_PHRASE.search(text or "")
+    return parse_month(match.group(1)) if match else None
+
+
+class ClimateStore:
+    """Memory-mapped climate normals with name -> city id indexes"""
+
+    def __init__(self, directory=DEFAULT_DIR):
+        self.directory = directory
+        self.array_path = os.path.join(directory, "normals.npy")
+        self.index_path = os.path.join(directory, "index.json")
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._data = None
+        self._cities = []
+        self._by_name = {}
+        self._by_country = {}
+
+    def available(self):
+        return os.path.exists(self.array_path) and os.path.exists(self.index_path)
+
+    def _load(self):
+        """(Re)map the files if they changed since the last lookup"""
+        mtime = os.stat(self.array_path).st_mtime_ns
+        if mtime == self._mtime:
+            return
+        with self._lock:
+            if mtime == self._mtime:
+                return
+            with open(self.index_path, encoding="utf-8") as f:
+                index = json.load(f)
+            data = np.load(self.array_path, mmap_mode="r")
+            by_name, by_country = {}, {}
+            for city_id, city in enumerate(index["cities"]):
+                by_name.setdefault(normalize_city(city["name"]), city_id)
+                by_name[normalize_city(f"{city['name']},{city['country_code']}")] = city_id
+                for country in (city.get("country"), city["country_code"]):
+                    if country:
+                        by_country.setdefault(normalize_city(country), []).append(city_id)
+            self._data, self._cities = data, index["cities"]
+            self._by_name, self._by_country = by_name, by_country
+            self._mtime = mtime
+
+    def resolve(self, place):
+        """(label, city ids) for a city ("Rome", "Rome,IT") or country ("Italy"), else None"""
+        if not self.available():
+            return None
+        self._load()
+        key = normalize_city(place)
+        if key in self._by_name:
+            city = self._cities[self._by_name[key]]
+            return f"{city['name']},{city['country_code']}", [self._by_name[key]]
+        ids = self._by_country.get(key)
+        if ids:
+            return self._cities[ids[0]].get("country") or place, ids
+        return None
+
+    def find_place(self, text, max_words=3):
+        """The longest known city or country name mentioned in free text"""
+        if not self.available():
+            return None
+        self._load()
+        words = _WORD.findall(text or "")
+        for size in range(max_words, 0, -1):
+            for start in range(len(words) - size + 1):
+                phrase = " ".join(words[start:start + size])
+                key = normalize_city(phrase)
+                # Two-letter country codes ("it", "us") only count when asked for explicitly
+                if len(key) > 2 and (key in self._by_name or key in self._by_country):
+                    return phrase
+        return None
+
+    def normals(self, place, month=None):
+        """
+        Monthly averages for a place (the mean over a country's cities), for one
+        month or all twelve; None if the place is unknown
+        """
+        resolved = self.resolve(place)
+        if resolved is None:
+            return None
+        label, ids = resolved
+        months = [month] if month else list(range(1, 13))
+        rows = np.asarray(self._data[ids][:, [m - 1 for m in months], :], dtype=np.float64)
+        with warnings.catch_warnings():
+            # Fields missing for every city are all-NaN slices; they just stay NaN
+            warnings.simplefilter("ignore", RuntimeWarning)
+            values = np.nanmean(rows, axis=0)
+        result = {"place": label, "months": {}}
+        if len(ids) > 1:
+            result["cities"] = [self._cities[i]["name"] for i in ids[:10]]
+        for month_no, row in zip(months, values):
+            result["months"][calendar.month_abbr[month_no]] = {
+                field: round(float(v), 1) for field, v in zip(FIELDS, row) if not np.isnan(v)
+            }
+        return result
+
+
+def build(csv_path, directory=DEFAULT_DIR):
+    """Build normals.npy + index.json from a bulk CSV; returns the number of cities"""
+    cities, ids, rows = [], {}, []
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        for record in csv.DictReader(f):
+            key = (normalize_city(record["city"]), record["country_code"].strip().upper())
+            city_id = ids.get(key)
+            if city_id is None:
+                city_id = ids[key] = len(cities)
+                cities.append({
+                    "name": record["city"].strip(),
+                    "country_code": key[1],
+                    "country": (record.get("country") or "").strip(),
+                })
+                rows.append(np.full((12, len(FIELDS)), np.nan, dtype=np.float32))
+            month = parse_month(record["month"])
+            if month is None:
+                raise ValueError(f"bad month {record['month']!r} for {record['city']}")
+            for i, field in enumerate(FIELDS):
+                value = (record.get(field) or "").strip()
+                if value:
+                    rows[city_id][month - 1, i] = float(value)
+
+    os.makedirs(directory, exist_ok=True)
+    array = np.stack(rows) if rows else np.zeros((0, 12, len(FIELDS)), dtype=np.float32)
+    # Write next to the targets, then swap in, so readers never see half a file
+    tmp_array = os.path.join(directory, "normals.tmp.npy")
+    tmp_index = os.path.join(directory, "index.tmp.json")
+    np.save(tmp_array, array)
+    with open(tmp_index, "w", encoding="utf-8") as f:
+        json.dump({"fields": FIELDS, "cities": cities}, f, ensure_ascii=False)
+    os.replace(tmp_index, os.path.join(directory, "index.json"))
+    os.replace(tmp_array, os.path.join(directory, "normals.npy"))
+    return len(cities)
+
+
+climate_store = ClimateStore(os.getenv("CLIMATE_DATA_DIR", DEFAULT_DIR))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or query the local climate normals store")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build_cmd = sub.add_parser("build", help="rebuild the store from a bulk CSV")
+    build_cmd.add_argument("csv_path")
+    build_cmd.add_argument("--dir", default=climate_store.directory)
+    show_cmd = sub.add_parser("show", help="print the normals of a city or country")
+    show_cmd.add_argument("place")
+    show_cmd.add_argument("month", nargs="?")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        print(f"Built climate normals for {build(args.csv_path, args.dir)} cities in {args.dir}")
+        return
+    result = climate_store.normals(args.place, parse_month(args.month) if args.month else None)
+    if result is None:
+        sys.exit(f"No climate normals for {args.place!r}")
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Template answers for simple lookups, so they don't need a second LLM round trip"""
+import os
+import re
+
+FAST_PATH_ENABLED = os.getenv("FAST_PATH_ENABLED", "1") == "1"
+
+# "weather in Paris", "what's the weather like in Rome today?", "how is the weather for Tokyo"
+WEATHER_QUERY = re.compile(
+    r"^\s*(?:(?:what|how)(?:'s|\s+is)\s+)?(?:the\s+)?(?:current\s+)?weather(?:\s+like)?"
+    r"\s+(?:in|for|at)\s+[\w .,'-]{1,60}?(?:\s+(?:today|now|right now))?\s*\??\s*$",
+    re.IGNORECASE,
+)
+
+# Anything asking for more than the weather goes through the model
+COMPOUND = re.compile(r"\b(?:and|also|then|plus|flights?|hotels?|pack|wear|should)\b", re.IGNORECASE)
+
+
+def is_simple_weather_query(text):
+    return bool(WEATHER_QUERY.match(text or "")) and not COMPOUND.search(text)
+
+
+def render_weather(weather):
+    """One-line summary of an OpenWeatherMap response, or None if it isn't one"""
+    if not isinstance(weather, dict) or not isinstance(weather.get("main"), dict):
+        return None
+    main = weather["main"]
+    if main.get("temp") is None:
+        return None
+    place = weather.get("name") or "there"
+    country = (weather.get("sys") or {}).get("country")
+    if country:
+        place = f"{place}, {country}"
+    description = ((weather.get("weather") or [{}])[0]).get("description")
+
+    text = f"It's currently {main.get('temp'):.0f}°C in {place}"
+    if description:
+        text += f" with {description}"
+    details = []
+    if main.get("feels_like") is not None:
+        details.append(f"feels like {main['feels_like']:.0f}°C")
+    if main.get("humidity") is not None:
+        details.append(f"humidity {main['humidity']}%")
+    wind = (weather.get("wind") or {}).get("speed")
+    if wind is not None:
+        details.append(f"wind {wind} m/s")
+    if details:
+        text += f" ({', '.join(details)})"
+    return text + "."
+
+
+def fast_path_answer(user_input, tool_results):
+    """Templated answer for a simple question, or None when the model should write it
+
+    tool_results are (tool name, result) pairs from the model's first round of tool calls.
+    """
+    if not FAST_PATH_ENABLED or not tool_results or not is_simple_weather_query(user_input):
+        return None
+    if any(name != "get_weather" for name, _ in tool_results):
+        return None
+    lines = [render_weather(result) for _, result in tool_results]
+    # Errors (bad city, API down, ...) go back to the model so it can explain them
+    if any(line is None for line in lines):
+        return None
+    return "\n".join(lines)
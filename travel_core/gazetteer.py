@@ -0,0 +1,284 @@
+"""
+In-process gazetteer: free-form city names -> canonical GeoNames ids and coordinates.
+
+Built on first use from GeoNames dump files in GAZETTEER_DIR (default data/gazetteer/):
+  cities.txt             cities, in the cities15000.txt / cities500.txt format
+  admin1CodesASCII.txt   state/region names, for "Springfield, Illinois"
+  countryInfo.txt        country names, for "Paris, France"
+
+A small sample is bundled; replace the files with the full GeoNames dumps
+(https://download.geonames.org/export/dump/) for worldwide coverage.
+
+A name resolves by exact match (alternate names included), then prefix
+("San Fran"), then trigram fuzzy match ("Barcelonna"). A fuzzy match only
+counts for a near-identical name of similar length that clearly beats every
+other name, so a city missing from the files ("Bern") gets no match rather
+than a different one. A trailing state or country ("Paris TX", "Portland,
+Maine", "London, ON") narrows the candidates, and the most populous one
+wins; a comma qualifier that isn't known ("Paris, Kentucky" without
+Kentucky in the files) means no match.
+
+    python -m travel_core.gazetteer "Springfeld, MO"
+"""
+import bisect
+import difflib
+import os
+import sys
+import threading
+from collections import Counter, defaultdict, namedtuple
+
+from travel_core.weather_cache import TTLCache, normalize_city
+
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "gazetteer")
+FUZZY_THRESHOLD = float(os.getenv("GAZETTEER_FUZZY_THRESHOLD", "0.88"))
+# A fuzzy match must beat the next different name by this much, or it's a guess
+FUZZY_MARGIN = 0.05
+# Shorter names are too often a real place the index doesn't know ("Bern" is not "Berlin")
+FUZZY_MIN_LENGTH = 5
+
+Place = namedtuple("Place", "id name country_code admin1 lat lon population")
+
+# Everyday country names the GeoNames list spells differently
+COUNTRY_ALIASES = {"usa": "US", "america": "US", "uk": "GB", "britain": "GB", "holland": "NL"}
+
+EXACT, PREFIX, FUZZY = "exact", "prefix", "fuzzy"
+PREFIX_SCORE = 0.9
+MAX_PREFIX_KEYS = 50
+MAX_FUZZY_CANDIDATES = 30
+
+# GeoNames admin1 codes are numeric outside the US; these are the letter codes people write
+ADMIN1_ABBREVIATIONS = {
+    "CA": {"AB": "01", "BC": "02", "MB": "03", "NB": "04", "NL": "05", "NS": "07", "ON": "08",
+           "PE": "09", "QC": "10", "SK": "11", "YT": "12", "NT": "13", "NU": "14"},
+    "AU": {"ACT": "01", "NSW": "02", "NT": "03", "QLD": "04", "SA": "05", "TAS": "06", "VIC": "07", "WA": "08"},
+}
+_ADMIN1_LETTERS = {(cc, code): abbr for cc, codes in ADMIN1_ABBREVIATIONS.items() for abbr, code in codes.items()}
+
+
+def _trigrams(key):
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _alternate_keys(alternates):
+    """Keys for a comma-separated alternatenames field, Latin-script names only"""
+    for name in alternates.split(","):
+        # Most alternates are plain ASCII, which skips the slower unicode normalization
+        key = " ".join(name.split()).lower() if name.isascii() else normalize_city(name)
+        # Short ones are IATA codes and the like, which would shadow real cities
+        if len(key) > 3 and key.isascii():
+            yield key
+
+
+class Gazetteer:
+    """Name, prefix and trigram indexes over a GeoNames cities file"""
+
+    def __init__(self, directory=DEFAULT_DIR):
+        self.directory = directory
+        self.cities_path = os.path.join(directory, "cities.txt")
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._places = []
+        self._by_key = {}       # any name -> place indexes
+        self._keys = []         # sorted primary names, for prefix search
+        self._grams = {}        # trigram -> positions in _keys
+        self._qualifiers = {}   # state/country name or code -> {(country_code, admin1 or None)}
+        # Resolutions are pure functions of the files, so they are kept until restart
+        self._memo = TTLCache(maxsize=4096, ttl=float("inf"))
+
+    def available(self):
+        return os.path.exists(self.cities_path)
+
+    def warm(self):
+        """Build the indexes now (on a worker thread at startup) rather than on the first lookup"""
+        if self.available():
+            self._load()
+
+    def _rows(self, name):
+        """Tab-separated fields of a GeoNames file, skipping comments; nothing if it's missing"""
+        path = os.path.join(self.directory, name)
+        if not os.path.exists(path):
+            return
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip() and not line.startswith("#"):
+                    yield line.rstrip("\n").split("\t")
+
+    def _load(self):
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            places, by_key, primary = [], defaultdict(list), set()
+            for row in self._rows("cities.txt"):
+                if len(row) < 15:
+                    continue
+                index = len(places)
+                places.append(Place(
+                    int(row[0]), row[1], row[8], row[10], float(row[4]), float(row[5]), int(row[14] or 0)
+                ))
+                names = {normalize_city(row[1]), normalize_city(row[2])}
+                primary |= names
+                names |= set(_alternate_keys(row[3]))
+                for key in names:
+                    if key and "," not in key:
+                        by_key[key].append(index)
+
+            qualifiers = defaultdict(set)
+            for row in self._rows("countryInfo.txt"):
+                if len(row) > 4:
+                    qualifiers[row[0].lower()].add((row[0], None))
+                    qualifiers[normalize_city(row[4])].add((row[0], None))
+            for alias, country_code in COUNTRY_ALIASES.items():
+                qualifiers[alias].add((country_code, None))
+            for row in self._rows("admin1CodesASCII.txt"):
+                country_code, _, admin1 = row[0].partition(".")
+                if len(row) > 2 and admin1:
+                    qualifiers[normalize_city(row[2])].add((country_code, admin1))
+                    # US states and the like have letter codes people actually write ("TX")
+                    if admin1.isalpha():
+                        qualifiers[admin1.lower()].add((country_code, admin1))
+            for country_code, codes in ADMIN1_ABBREVIATIONS.items():
+                for abbreviation, admin1 in codes.items():
+                    qualifiers[abbreviation.lower()].add((country_code, admin1))
+
+            keys = sorted(key for key in primary if key in by_key)
+            grams = defaultdict(list)
+            for position, key in enumerate(keys):
+                for gram in _trigrams(key):
+                    grams[gram].append(position)
+
+            self._places, self._by_key, self._keys = places, dict(by_key), keys
+            self._grams, self._qualifiers = dict(grams), dict(qualifiers)
+            self._loaded = True
+
+    def _splits(self, key):
+        """(name, qualifiers) readings of a normalized query, the literal one first"""
+        if "," in key:
+            name, *rest = key.split(",")
+            # "Paris, Kentucky" must not quietly become Paris, FR: an unknown
+            # qualifier means no match, and the name goes to the API as typed
+            if all(q in self._qualifiers for q in rest):
+                yield name, rest
+            return
+        yield key, []
+        words = key.split()
+        for size in (1, 2):
+            if len(words) > size:
+                qualifier = " ".join(words[-size:])
+                if qualifier in self._qualifiers:
+                    yield " ".join(words[:-size]), [qualifier]
+
+    def _candidates(self, name, stage):
+        """(place index, score) for one name at one matching stage"""
+        if stage == EXACT:
+            return [(i, 1.0) for i in self._by_key.get(name, ())]
+        if stage == PREFIX:
+            if len(name) < 4:
+                return []
+            start = bisect.bisect_left(self._keys, name)
+            matches = []
+            for key in self._keys[start:start + MAX_PREFIX_KEYS]:
+                if not key.startswith(name):
+                    break
+                matches += [(i, PREFIX_SCORE) for i in self._by_key[key]]
+            return matches
+        return self._fuzzy(name)
+
+    def _fuzzy(self, name):
+        """Places for the one name a typo plausibly came from; nothing if that's unclear"""
+        if len(name) < FUZZY_MIN_LENGTH:
+            return []
+        counts = Counter()
+        for gram in _trigrams(name):
+            counts.update(self._grams.get(gram, ()))
+        scored = []
+        for position, _ in counts.most_common(MAX_FUZZY_CANDIDATES):
+            key = self._keys[position]
+            # A typo changes a character or two, it doesn't drop half the name
+            if abs(len(key) - len(name)) > max(1, len(name) // 8):
+                continue
+            scored.append((difflib.SequenceMatcher(None, name, key).ratio(), key))
+        scored.sort(reverse=True)
+        if not scored or scored[0][0] < FUZZY_THRESHOLD:
+            return []
+        score, key = scored[0]
+        if len(scored) > 1 and score - scored[1][0] < FUZZY_MARGIN:
+            return []
+        return [(i, score) for i in self._by_key[key]]
+
+    def is_qualifier(self, text):
+        """Whether text is a state or country name or code ("TX", "Texas", "France")"""
+        if not text or not self.available():
+            return False
+        self._load()
+        return normalize_city(text) in self._qualifiers
+
+    def _qualifies(self, place, qualifiers):
+        return all(
+            any(place.country_code == cc and admin1 in (None, place.admin1) for cc, admin1 in self._qualifiers[q])
+            for q in qualifiers
+        )
+
+    def lookup(self, text, limit=5):
+        """Best (Place, score, stage) matches for a free-form name, most likely first"""
+        if not self.available():
+            return []
+        self._load()
+        key = normalize_city(text)
+        if not key:
+            return []
+        splits = list(self._splits(key))
+        # A looser stage only runs when no reading of the name matched at a stricter one
+        for stage in (EXACT, PREFIX, FUZZY):
+            matches = {}
+            for name, qualifiers in splits:
+                for index, score in self._candidates(name, stage):
+                    place = self._places[index]
+                    if self._qualifies(place, qualifiers) and score > matches.get(index, (None, 0))[1]:
+                        matches[index] = (place, score, stage)
+            if matches:
+                ranked = sorted(matches.values(), key=lambda m: (-m[1], -m[0].population))
+                return ranked[:limit]
+        return []
+
+    def resolve(self, text):
+        """The Place a city name most likely means, or None if nothing matches well enough"""
+        if not text or not self.available():
+            return None
+        key = normalize_city(text)
+        place = self._memo.get(key)
+        if place is None:
+            matches = self.lookup(text, limit=1)
+            place = matches[0][0] if matches else False
+            self._memo.put(key, place)
+        return place or None
+
+    def label(self, place):
+        """Display name: "Paris, TX, US" / "London, ON, CA" where states have letter codes, else "Paris, FR" """
+        admin1 = _ADMIN1_LETTERS.get((place.country_code, place.admin1), place.admin1)
+        if admin1.isalpha() and (len(admin1) == 2 or admin1 != place.admin1):
+            return f"{place.name}, {admin1}, {place.country_code}"
+        return f"{place.name}, {place.country_code}"
+
+
+gazetteer = Gazetteer(os.getenv("GAZETTEER_DIR", DEFAULT_DIR))
+
+
+def main(argv=None):
+    names = sys.argv[1:] if argv is None else argv
+    if not names:
+        sys.exit("usage: python -m travel_core.gazetteer CITY [CITY ...]")
+    if not gazetteer.available():
+        sys.exit(f"No gazetteer at {gazetteer.cities_path}")
+    for name in names:
+        matches = gazetteer.lookup(name)
+        print(f"{name!r}:" + ("" if matches else " no match"))
+        for place, score, stage in matches:
+            print(f"  {place.id:>9}  {gazetteer.label(place):<32} {place.lat:>9.4f} {place.lon:>10.4f}"
+                  f"  pop {place.population:<9} {stage} {score:.2f}")
+
+
+if __name__ == "__main__":
+    main()
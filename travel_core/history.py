@@ -0,0 +1,160 @@
+"""
+Token-budgeted conversation windows.
+
+Works on both OpenAI-style dict messages (main.py) and LangChain message
+objects (the react agents). The window keeps the leading system prompt, a
+rolling summary of the turns that no longer fit, and as many recent turns as
+fit the budget. Tool outputs from earlier turns are truncated, since the
+model has already answered from them.
+"""
+import os
+
+from travel_core.tokens import estimate_tokens
+
+HISTORY_TOKEN_BUDGET = int(os.getenv("HISTORY_TOKEN_BUDGET", "3000"))
+SUMMARY_TOKEN_BUDGET = int(os.getenv("HISTORY_SUMMARY_TOKEN_BUDGET", "300"))
+OLD_TOOL_OUTPUT_CHARS = 200
+SUMMARY_LINE_CHARS = 160
+SUMMARY_HEADER = "Summary of the earlier conversation:\n"
+# Threads longer than this are rewritten to their window (0 disables)
+MAX_STORED_MESSAGES = int(os.getenv("HISTORY_MAX_STORED_MESSAGES", "100"))
+
+_LC_ROLES = {"human": "user", "ai": "assistant", "tool": "tool", "system": "system"}
+
+
+def role_of(message):
+    if isinstance(message, dict):
+        return message.get("role")
+    return _LC_ROLES.get(getattr(message, "type", None))
+
+
+def content_of(message):
+    content = message.get("content") if isinstance(message, dict) else getattr(message, "content", "")
+    if content is None:
+        return ""
+    return content if isinstance(content, str) else str(content)
+
+
+def message_tokens(message):
+    tokens = estimate_tokens(content_of(message)) + 4
+    tool_calls = message.get("tool_calls") if isinstance(message, dict) else getattr(message, "tool_calls", None)
+    if tool_calls:
+        tokens += estimate_tokens(str(tool_calls))
+    return tokens
+
+
+def with_content(message, content):
+    if isinstance(message, dict):
+        return {**message, "content": content}
+    return message.model_copy(update={"content": content})
+
+
+def make_system_message(like, content):
+    """System message in the same flavour (dict or LangChain) as `like`"""
+    if isinstance(like, dict):
+        return {"role": "system", "content": content}
+    from langchain_core.messages import SystemMessage
+    return SystemMessage(content=content)
+
+
+def is_summary(message):
+    return role_of(message) == "system" and content_of(message).startswith(SUMMARY_HEADER)
+
+
+def extractive_summary(messages, previous="", token_budget=SUMMARY_TOKEN_BUDGET):
+    """
+    One line per dropped user/assistant message appended to the previous
+    summary; the newest lines are kept when over budget
+    """
+    lines = previous.splitlines()
+    for message in messages:
+        role = role_of(message)
+        text = " ".join(content_of(message).split())
+        if role not in ("user", "assistant") or not text:
+            continue
+        if len(text) > SUMMARY_LINE_CHARS:
+            text = text[:SUMMARY_LINE_CHARS - 1] + "…"
+        lines.append(f"{'User' if role == 'user' else 'Assistant'}: {text}")
+
+    kept, used = [], 0
+    for line in reversed(lines):
+        cost = estimate_tokens(line) + 1
+        if used + cost > token_budget:
+            break
+        kept.append(line)
+        used += cost
+    return "\n".join(reversed(kept))
+
+
+class HistoryManager:
+    """Builds the message list sent to the model from the full history"""
+
+    def __init__(self, token_budget=HISTORY_TOKEN_BUDGET, summarize=extractive_summary,
+                 max_stored_messages=MAX_STORED_MESSAGES):
+        self.token_budget = token_budget
+        self.summarize = summarize
+        self.max_stored_messages = max_stored_messages
+
+    def window(self, messages):
+        messages = list(messages)
+        # Leading system prompt(s) are always sent as-is
+        split = 0
+        while split < len(messages) and role_of(messages[split]) == "system":
+            split += 1
+        prefix, rest = messages[:split], messages[split:]
+        if not rest:
+            return prefix
+        # A summary left by an earlier compaction is rolled into the new one
+        previous = [m for m in prefix if is_summary(m)]
+        prefix = [m for m in prefix if not is_summary(m)]
+
+        last_user = max((i for i, m in enumerate(rest) if role_of(m) == "user"), default=0)
+        rest = [
+            self._prune_tool_output(m) if i < last_user and role_of(m) == "tool" else m
+            for i, m in enumerate(rest)
+        ]
+
+        budget = self.token_budget - sum(message_tokens(m) for m in prefix) - SUMMARY_TOKEN_BUDGET
+        start, used = len(rest), 0
+        while start > 0 and used + message_tokens(rest[start - 1]) <= budget:
+            start -= 1
+            used += message_tokens(rest[start])
+        # The current turn is always sent, even if it alone is over budget
+        start = min(start, last_user)
+        # Never start mid-turn: tool results must follow their tool call
+        while start < last_user and role_of(rest[start]) != "user":
+            start += 1
+
+        dropped, kept = rest[:start], rest[start:]
+        previous_text = content_of(previous[-1])[len(SUMMARY_HEADER):] if previous else ""
+        summary = self.summarize(dropped, previous_text) if dropped else previous_text
+        if summary:
+            prefix = prefix + [make_system_message(rest[0], SUMMARY_HEADER + summary)]
+        return prefix + kept
+
+    def pre_model_hook(self, state):
+        """
+        create_react_agent pre_model_hook: trims what the LLM sees and, once a
+        thread passes max_stored_messages, rewrites the stored thread to that
+        window so per-conversation state stays bounded too
+        """
+        messages = state["messages"]
+        window = self.window(messages)
+        if self.max_stored_messages and len(messages) > self.max_stored_messages:
+            from langchain_core.messages import RemoveMessage
+            from langgraph.graph.message import REMOVE_ALL_MESSAGES
+            return {
+                "messages": [RemoveMessage(id=REMOVE_ALL_MESSAGES), *window],
+                "llm_input_messages": window,
+            }
+        return {"llm_input_messages": window}
+
+    @staticmethod
+    def _prune_tool_output(message):
+        content = content_of(message)
+        if len(content) <= OLD_TOOL_OUTPUT_CHARS:
+            return message
+        return with_content(message, content[:OLD_TOOL_OUTPUT_CHARS] + "… [older tool output truncated]")
+
+
+history_manager = HistoryManager()
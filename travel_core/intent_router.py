@@ -0,0 +1,460 @@
+"""
+Local intent router in front of the agent.
+
+Plain current-weather lookups and simple flight/hotel searches don't need the model:
+a small TF-IDF classifier (fit on the seed phrases below at import time)
+decides the intent, regex rules pull out the tool arguments, and the tool
+result is rendered from a template. "What's Italy like in October?" is
+answered from the local climate normals store before any classification. Anything open-ended, compound or
+ambiguous is routed to the agent as before, and so are forecasts ("weather in
+Paris tomorrow"), since get_weather only reports the current conditions.
+
+A search is only routed when the whole message is a bare lookup: "flights
+from JFK to CDG on June 5" and "hotels in Paris from June 5 to June 8" go to
+search_flights/search_hotels, undated ones like "hotels in Rome" to the web
+search. Questions ("how much are flights to Bali?") and anything beyond a
+place and dates ("hotels in Paris near the Louvre") need the model, as do
+dated flights between city names rather than airport codes.
+"""
+import calendar
+import json
+import os
+import re
+from collections import namedtuple
+from datetime import date
+
+import numpy as np
+
+from travel_core.climate import MONTH_PHRASE, climate_store, find_month, parse_month
+from travel_core.fast_path import render_weather
+from travel_core.gazetteer import gazetteer
+from travel_core.tools import registry
+from travel_core.tracing import span
+
+ENABLED = os.getenv("INTENT_ROUTER_ENABLED", "1") == "1"
+THRESHOLD = float(os.getenv("INTENT_ROUTER_THRESHOLD", "0.35"))
+
+# intent -> tool is None for "agent"
+Route = namedtuple("Route", "intent tool args confidence")
+AGENT = Route("agent", None, None, 0.0)
+
+SEED_EXAMPLES = {
+    "weather": [
+        "weather in paris",
+        "what's the weather like in rome",
+        "what is the weather in tokyo today",
+        "how is the weather in london right now",
+        "current weather for new york",
+        "is it raining in berlin",
+        "temperature in madrid",
+        "how hot is it in dubai",
+        "what's the weather in lisbon now",
+        "is it cold in oslo",
+    ],
+    "search": [
+        "flights from new york to london",
+        "find flights to tokyo",
+        "cheap flights to rome",
+        "hotels in paris",
+        "find me a hotel in barcelona",
+        "search hotels near the eiffel tower",
+        "flight from berlin to madrid on june 5",
+        "hotels in rome from june 5 to june 8",
+        "book a hotel in lisbon",
+        "best hotels in amsterdam",
+        "how much are flights to bali",
+    ],
+    "agent": [
+        "help me plan a trip",
+        "plan a 5 day itinerary for italy",
+        "where should i go for my honeymoon",
+        "i want a chill beach vacation in europe",
+        "recommend destinations for a family of four",
+        "what should i pack for a trip to iceland",
+        "we have a budget of 3000 dollars for two weeks",
+        "what are the best things to do in japan",
+        "suggest a romantic getaway",
+        "i don't know where to go, any ideas",
+        "hello",
+        "thanks",
+    ],
+}
+
+_WORD = re.compile(r"[a-z']+")
+
+WEATHER_CITY = re.compile(
+    r"\b(?:weather|temperature|raining|hot|cold)\b.*?\b(?:in|for|at)\s+"
+    r"(?P<city>[^?!.,;]+?)(?:\s+(?:today|now|right now))?\s*[?!.]*$",
+    re.IGNORECASE,
+)
+# get_weather only knows the current conditions; anything ahead of now goes to the model
+FUTURE = re.compile(
+    r"\b(?:forecast|outlook|tomorrow|tonight|later|weekend|week|next|upcoming|coming|will|going to|"
+    r"monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b",
+    re.IGNORECASE,
+)
+
+# Bare flight/hotel lookups, matched against the whole message
+_VERB = r"(?:(?:please\s+)?(?:find|search(?:\s+for)?|show|get|look\s+for|book)\s+(?:me\s+)?)?"
+_DATE = (r"(?:\d{4}-\d{2}-\d{2}|[a-z]{3,9}\.?\s+\d{1,2}(?:st|nd|rd|th)?"
+         r"|\d{1,2}(?:st|nd|rd|th)?\s+(?:of\s+)?[a-z]{3,9})")
+_PLACE = r"[a-z][a-z .'-]*?"
+FLIGHT_LOOKUP = re.compile(
+    rf"^{_VERB}(?:a\s+)?(?P<cheap>cheap(?:est)?\s+)?(?:flights?|fly)\s+(?:from\s+(?P<origin>{_PLACE})\s+)?"
+    rf"to\s+(?P<destination>{_PLACE})(?:\s+on\s+(?P<outbound>{_DATE})"
+    rf"(?:\s+returning(?:\s+on)?\s+(?P<back>{_DATE}))?)?\s*[.!]*$",
+    re.IGNORECASE,
+)
+HOTEL_LOOKUP = re.compile(
+    rf"^{_VERB}(?:an?\s+)?(?P<cheap>cheap(?:est)?\s+)?hotels?\s+in\s+(?P<location>{_PLACE})"
+    rf"(?:\s+from\s+(?P<check_in>{_DATE})\s+(?:to|until|till)\s+(?P<check_out>{_DATE}))?\s*[.!]*$",
+    re.IGNORECASE,
+)
+# Questions about prices, availability or reasons need an answer, not a list of offers
+QUESTION = re.compile(
+    r"^\s*(?:why|how|what|which|when|where|who|are|is|do|does|did|can|could|will|would)\b|\?", re.IGNORECASE
+)
+# Words that make a "place" more than a place: "paris near the louvre", "rome for 4 people"
+PLACE_QUALIFIERS = {
+    "near", "for", "with", "without", "under", "over", "below", "above", "around", "by", "on", "from",
+    "to", "in", "at", "than", "cheap", "cheapest", "best", "luxury", "budget", "star", "stars", "next",
+    "this", "tomorrow", "tonight", "weekend", "week", "month", "nonstop", "direct", "pet", "friendly",
+}
+MAX_ROUTED_NIGHTS = 30
+IATA = re.compile(r"^[a-z]{3}$", re.IGNORECASE)
+
+# With a month phrase ("in October"), these ask about the typical weather, not a booking
+CLIMATE_CUE = re.compile(
+    r"\b(?:like|weather|climate|temperatures?|warm|hot|cold|rain|rainy|sunny|humid)\b", re.IGNORECASE
+)
+BOOKING = re.compile(r"\b(?:flights?|fly|hotels?|stay|book)\b", re.IGNORECASE)
+
+# Multi-part or open-ended requests always go through the model
+COMPOUND = re.compile(
+    r"\b(?:and|also|then|plus|itinerary|plan|recommend|suggest|should|pack|wear|budget|compare)\b",
+    re.IGNORECASE,
+)
+# Slots that only make sense with the conversation's context
+DEICTIC = {"there", "here", "it", "that", "this", "that city", "this city", "the city", "my destination"}
+
+
+def _place(value):
+    """A bare place name of a few words, or None"""
+    words = (value or "").split()
+    if not words or len(words) > 3 or PLACE_QUALIFIERS.intersection(w.lower() for w in words):
+        return None
+    place = " ".join(words)
+    return None if place.lower() in DEICTIC else place
+
+
+def _day(iso):
+    return date.fromisoformat(iso) if iso else None
+
+
+def parse_day(text, today=None):
+    """ISO date for "2025-06-05", "June 5th" or "5 June" (the next one on or after today), or None"""
+    text = text.lower().rstrip(".")
+    try:
+        return date.fromisoformat(text).isoformat()
+    except ValueError:
+        pass
+    words = re.findall(r"[a-z]+|\d+", text.replace(" of ", " "))
+    words = [w for w in words if w not in ("st", "nd", "rd", "th")]
+    if len(words) != 2:
+        return None
+    day, name = (words[0], words[1]) if words[0].isdigit() else (words[1], words[0])
+    month = None if name.isdigit() else parse_month(name)
+    if not day.isdigit() or not month:
+        return None
+    today = today or date.today()
+    for year in (today.year, today.year + 1):
+        try:
+            candidate = date(year, month, int(day))
+        except ValueError:
+            return None
+        if candidate >= today:
+            return candidate.isoformat()
+    return None
+
+
+def climate_place(text):
+    """
+    The climate store place a month question is about, or None. A city goes
+    through the gazetteer with any state or country written after it, so
+    "Paris TX in October" can't be answered with the normals of Paris, FR.
+    """
+    phrase = climate_store.find_place(text)
+    if not phrase:
+        return None
+    label, _ = climate_store.resolve(phrase)
+    if "," not in label:
+        return phrase  # a country
+
+    start = re.search(rf"\b{re.escape(phrase)}\b", text, re.IGNORECASE).end()
+    month = MONTH_PHRASE.search(text, start)
+    tail = text[start:month.start() if month else len(text)].strip(" ?!.;")
+    words = tail.lstrip(", ").split()
+    qualifier = next((" ".join(words[:n]) for n in (3, 2, 1) if gazetteer.is_qualifier(" ".join(words[:n]))), "")
+    if not qualifier and tail.startswith(",") and words:
+        qualifier = words[0]  # "Paris, Kentucky" with no Kentucky in the gazetteer
+
+    place = gazetteer.resolve(f"{phrase}, {qualifier}" if qualifier else phrase)
+    if place is None:
+        # A qualifier nothing can check means a different city may be meant
+        return None if qualifier else phrase
+    resolved = climate_store.resolve(f"{phrase},{place.country_code}") or climate_store.resolve(phrase)
+    return resolved[0] if resolved[0].endswith(f",{place.country_code}") else None
+
+
+def _tokens(text):
+    words = _WORD.findall(text.lower())
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+class TfidfClassifier:
+    """Nearest-example cosine similarity over TF-IDF vectors of words and bigrams"""
+
+    def __init__(self, examples):
+        docs = [(label, _tokens(text)) for label, texts in examples.items() for text in texts]
+        self.vocab = {tok: i for i, tok in enumerate(sorted({t for _, toks in docs for t in toks}))}
+
+        df = np.zeros(len(self.vocab))
+        for _, toks in docs:
+            df[[self.vocab[t] for t in set(toks)]] += 1
+        self.idf = np.log((1 + len(docs)) / (1 + df)) + 1
+
+        self.labels = np.array([label for label, _ in docs])
+        self.matrix = np.vstack([self._vector(toks) for _, toks in docs])
+
+    def _vector(self, toks):
+        vec = np.zeros(len(self.vocab))
+        for tok in toks:
+            index = self.vocab.get(tok)
+            if index is not None:
+                vec[index] += 1
+        vec *= self.idf
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+    def predict(self, text):
+        """(label, cosine similarity of the closest seed example)"""
+        vec = self._vector(_tokens(text))
+        if not vec.any():
+            return "agent", 0.0
+        scores = self.matrix @ vec
+        best = int(np.argmax(scores))
+        return str(self.labels[best]), float(scores[best])
+
+
+def render_climate(result):
+    """One-line summary of get_climate_normals output for a single month"""
+    try:
+        data = json.loads(result)
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(data, dict) or len(data.get("months") or {}) != 1:
+        return None
+    month, normals = next(iter(data["months"].items()))
+    if normals.get("tmin_c") is None or normals.get("tmax_c") is None:
+        return None
+
+    month = calendar.month_name[list(calendar.month_abbr).index(month)]
+    place = data.get("place", "").replace(",", ", ")
+    text = f"In {month}, {place} typically sees {normals['tmin_c']:.0f}–{normals['tmax_c']:.0f}°C"
+    details = []
+    if normals.get("precip_mm") is not None:
+        rain = f"about {normals['precip_mm']:.0f} mm of rain"
+        if normals.get("rain_days") is not None:
+            rain += f" over {normals['rain_days']:.0f} days"
+        details.append(rain)
+    if normals.get("sun_hours") is not None:
+        details.append(f"{normals['sun_hours']:.0f} hours of sunshine a day")
+    if details:
+        text += ", with " + " and ".join(details)
+    if data.get("cities"):
+        text += f" (averaged over {', '.join(data['cities'])})"
+    return text + "."
+
+
+def render_search(result, query):
+    """A short list of the top flights/hotels/results from a compacted SERP response"""
+    try:
+        data = json.loads(result)
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("error"):
+        return None
+
+    lines = []
+    for flight in (data.get("flights") or [])[:3]:
+        stops = "nonstop" if flight.get("stops") == 0 else f"{flight.get('stops')} stop(s)"
+        lines.append(
+            f"- {flight.get('airline', 'Flight')} {flight.get('from', '?')} → {flight.get('to', '?')}, "
+            f"{stops}: ${flight.get('price', '?')}"
+        )
+    for hotel in (data.get("hotels") or [])[:3]:
+        rating = f" ({hotel['overall_rating']}★)" if hotel.get("overall_rating") else ""
+        price = f": {hotel['price_per_night']}/night" if hotel.get("price_per_night") else ""
+        lines.append(f"- {hotel.get('name', 'Hotel')}{rating}{price}")
+    if not lines:
+        for item in (data.get("answer_box") or []) + (data.get("organic_results") or [])[:3]:
+            text = item.get("answer") or item.get("snippet") or item.get("title")
+            if text:
+                lines.append(f"- {text}")
+    if not lines:
+        return None
+    return f"Here's what I found for \"{query}\":\n" + "\n".join(lines)
+
+
+def _money(amount, currency):
+    return f"${amount:,.0f}" if currency == "USD" else f"{amount:,.0f} {currency}"
+
+
+def render_offers(result, args):
+    """The top offers from search_flights/search_hotels output, or None if there are none"""
+    try:
+        data = json.loads(result)
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(data, dict):
+        return None
+    currency = data.get("currency", "USD")
+
+    lines = []
+    for flight in (data.get("flights") or [])[:3]:
+        stops = "nonstop" if not flight.get("stops") else f"{flight['stops']} stop(s)"
+        hours, minutes = divmod(flight.get("duration_min", 0), 60)
+        numbers = f" {', '.join(flight['flight_numbers'])}" if flight.get("flight_numbers") else ""
+        price = _money(flight["price"], flight.get("currency", currency))
+        lines.append(
+            f"- {flight.get('airline', 'Flight')}{numbers}: {flight.get('departure', '?')} → "
+            f"{flight.get('arrival', '?')}, {hours}h {minutes:02d}m, {stops}: {price}"
+        )
+    for hotel in (data.get("hotels") or [])[:3]:
+        rating = f" ({hotel['rating']}★)" if hotel.get("rating") else ""
+        price = f"{_money(hotel['price_per_night'], hotel.get('currency', currency))}/night"
+        if hotel.get("total_price"):
+            price += f", {_money(hotel['total_price'], hotel.get('currency', currency))} total"
+        lines.append(f"- {hotel.get('name', 'Hotel')}{rating}: {price}")
+    if not lines:
+        return None
+
+    if "origin" in args:
+        title = f"Top flights {args['origin'].upper()} → {args['destination'].upper()} on {args['outbound_date']}"
+        if args.get("return_date"):
+            title += f", returning {args['return_date']}"
+    else:
+        nights = data.get("nights", 1)
+        title = f"Top hotels in {data.get('location', args['location'])} for {nights} night{'s' * (nights != 1)}"
+    return title + ":\n" + "\n".join(lines)
+
+
+class IntentRouter:
+    def __init__(self, classifier, threshold=THRESHOLD, enabled=ENABLED):
+        self.classifier = classifier
+        self.threshold = threshold
+        self.enabled = enabled
+
+    def route(self, text):
+        """Route for one user message; AGENT unless it is clearly a single tool lookup"""
+        text = (text or "").strip()
+        if not self.enabled or not text or len(text) > 120 or COMPOUND.search(text):
+            return AGENT
+
+        month = find_month(text)
+        if month and CLIMATE_CUE.search(text) and not BOOKING.search(text):
+            if climate_store.find_place(text):
+                place = climate_place(text)
+                if place is None:
+                    return AGENT
+                args = {"place": place, "month": calendar.month_name[month]}
+                return Route("climate", "get_climate_normals", args, 1.0)
+
+        with span("router", "classify") as record:
+            intent, confidence = self.classifier.predict(text)
+            record["intent"] = intent
+        if confidence < self.threshold:
+            return AGENT
+
+        if intent == "weather":
+            if month or FUTURE.search(text):
+                return AGENT  # current conditions don't answer it
+            match = WEATHER_CITY.search(text)
+            city = match.group("city").strip() if match else ""
+            if not city or city.lower() in DEICTIC:
+                return AGENT
+            return Route("weather", "get_weather", {"city": city}, confidence)
+        if intent == "search" and not QUESTION.search(text):
+            return self._search_route(text, confidence)
+        return AGENT
+
+    @staticmethod
+    def _search_route(text, confidence):
+        """Structured search for a dated bare lookup, web search for an undated one, else AGENT"""
+        web = Route("search", "get_flight_and_hotel_information", {"query": text}, confidence)
+        sort = {}
+
+        match = FLIGHT_LOOKUP.match(text)
+        if match:
+            origin = match.group("origin")
+            destination = _place(match.group("destination"))
+            if not destination or (origin is not None and not _place(origin)):
+                return AGENT
+            if not match.group("outbound"):
+                return web
+            outbound = parse_day(match.group("outbound"))
+            back = parse_day(match.group("back"), _day(outbound)) if match.group("back") and outbound else None
+            # search_flights takes airport codes; mapping "New York" to JFK is the model's job
+            if not outbound or (match.group("back") and not (back and back >= outbound)) or not origin \
+                    or not IATA.match(origin) or not IATA.match(destination):
+                return AGENT
+            if match.group("cheap"):
+                sort = {"sort": "price"}
+            args = {"origin": origin.upper(), "destination": destination.upper(), "outbound_date": outbound}
+            if back:
+                args["return_date"] = back
+            return Route("flights", "search_flights", {**args, **sort}, confidence)
+
+        match = HOTEL_LOOKUP.match(text)
+        if match:
+            location = _place(match.group("location"))
+            if not location:
+                return AGENT
+            if not match.group("check_in"):
+                return web
+            check_in = parse_day(match.group("check_in"))
+            check_out = parse_day(match.group("check_out"), _day(check_in)) if check_in else None
+            # "June 8 to June 5" is a slip, not a year-long stay
+            if not check_out or not 0 < (_day(check_out) - _day(check_in)).days <= MAX_ROUTED_NIGHTS:
+                return AGENT
+            if match.group("cheap"):
+                sort = {"sort": "price"}
+            args = {"location": location, "check_in_date": check_in, "check_out_date": check_out}
+            return Route("hotels", "search_hotels", {**args, **sort}, confidence)
+        return AGENT
+
+    def render(self, route, result):
+        """Templated answer, or None so the agent handles it (errors, empty results, ...)"""
+        if route.intent == "weather":
+            return render_weather(result)
+        if route.intent == "climate":
+            return render_climate(result)
+        if route.intent == "search":
+            return render_search(result, route.args["query"])
+        if route.intent in ("flights", "hotels"):
+            return render_offers(result, route.args)
+        return None
+
+    def run(self, route):
+        return self.render(route, registry.call(route.tool, route.args))
+
+    async def arun(self, route):
+        return self.render(route, await registry.acall(route.tool, route.args))
+
+    def answer(self, text):
+        """Answer text without the model, or None if it needs the agent"""
+        route = self.route(text)
+        return self.run(route) if route.tool else None
+
+
+intent_router = IntentRouter(TfidfClassifier(SEED_EXAMPLES))
@@ -0,0 +1,68 @@
+"""LangChain callback recording LangGraph chat model calls as tracing spans"""
+import threading
+import time
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from travel_core.prompts import PROMPT_VERSION
+from travel_core.tracing import tracer
+
+
+def usage_from_llm_result(response):
+    """Prompt, completion and cached prompt token fields from an LLMResult, if the provider reported them"""
+    usage = (response.llm_output or {}).get("token_usage") or {}
+    if usage:
+        return {
+            "prompt_tokens": usage.get("prompt_tokens"),
+            "completion_tokens": usage.get("completion_tokens"),
+            "cached_tokens": (usage.get("prompt_tokens_details") or {}).get("cached_tokens") or 0,
+        }
+    for generations in response.generations:
+        for generation in generations:
+            metadata = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if metadata:
+                return {
+                    "prompt_tokens": metadata.get("input_tokens"),
+                    "completion_tokens": metadata.get("output_tokens"),
+                    "cached_tokens": (metadata.get("input_token_details") or {}).get("cache_read") or 0,
+                }
+    return {}
+
+
+class LLMTracingCallback(BaseCallbackHandler):
+    """Records one "llm" span per chat model call (works for invoke and streaming)"""
+
+    def __init__(self):
+        self._open = {}
+        self._lock = threading.Lock()
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        payload = sum(len(str(m.content)) for batch in messages for m in batch)
+        model = (kwargs.get("invocation_params") or {}).get("model") or "chat_model"
+        with self._lock:
+            self._open[run_id] = (time.perf_counter(), payload, model)
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        self._finish(run_id, usage_from_llm_result(response))
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._finish(run_id, {"error": True})
+
+    def _finish(self, run_id, fields):
+        with self._lock:
+            opened = self._open.pop(run_id, None)
+        if opened is None:
+            return
+        start, payload, model = opened
+        tracer.add({
+            "kind": "llm",
+            "name": model,
+            "payload_bytes": payload,
+            "prompt_version": PROMPT_VERSION,
+            **fields,
+            "wall_ms": (time.perf_counter() - start) * 1000,
+            "ts": time.time(),
+        })
+
+
+llm_tracing_callback = LLMTracingCallback()
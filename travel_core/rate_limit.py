@@ -0,0 +1,86 @@
+"""
+Per-upstream request rate limits (token buckets).
+
+Each upstream API (OpenAI, OpenWeatherMap, SerpAPI) gets one bucket shared by
+every thread and coroutine in the process. A rate of 0 means unlimited, which
+is the default; batch jobs set a rate so they stay under provider quotas.
+"""
+import asyncio
+import functools
+import os
+import threading
+import time
+
+
+class TokenBucket:
+    """`rate` requests per second on average, bursts of up to `burst`"""
+
+    def __init__(self, rate=0.0, burst=1):
+        self._lock = threading.Lock()
+        self.configure(rate, burst)
+
+    def configure(self, rate, burst=None):
+        with self._lock:
+            self.rate = float(rate)
+            self.burst = max(1, int(burst if burst is not None else self.burst))
+            self._tokens = float(self.burst)
+            self._updated = time.monotonic()
+
+    def _reserve(self, blocking):
+        """Seconds to wait before the reserved request may go, or None if not blocking and empty"""
+        with self._lock:
+            if self.rate <= 0:
+                return 0.0
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if not blocking and self._tokens < 1:
+                return None
+            # Tokens may go negative: later callers queue up behind this one
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self, blocking=True):
+        wait = self._reserve(blocking)
+        if wait is None:
+            return False
+        if wait:
+            time.sleep(wait)
+        return True
+
+    async def aacquire(self, blocking=True):
+        wait = self._reserve(blocking)
+        if wait is None:
+            return False
+        if wait:
+            await asyncio.sleep(wait)
+        return True
+
+
+def _bucket(name):
+    return TokenBucket(
+        float(os.getenv(f"{name.upper()}_MAX_RPS", "0")),
+        int(os.getenv(f"{name.upper()}_BURST", "1")),
+    )
+
+
+# OPENAI_MAX_RPS, WEATHER_MAX_RPS, SERP_MAX_RPS (and *_BURST) configure the buckets
+rate_limits = {name: _bucket(name) for name in ("openai", "weather", "serp")}
+
+
+@functools.cache
+def langchain_rate_limiter(name="openai"):
+    """The named bucket as a LangChain rate limiter, for init_chat_model(rate_limiter=...)"""
+    # Imported here so the raw OpenAI CLI doesn't pay for langchain_core
+    from langchain_core.rate_limiters import BaseRateLimiter
+
+    bucket = rate_limits[name]
+
+    class BucketRateLimiter(BaseRateLimiter):
+        def acquire(self, *, blocking=True):
+            return bucket.acquire(blocking)
+
+        async def aacquire(self, *, blocking=True):
+            return await bucket.aacquire(blocking)
+
+    return BucketRateLimiter()
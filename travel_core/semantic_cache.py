@@ -0,0 +1,175 @@
+"""
+Opt-in semantic cache for whole first-turn agent answers.
+
+User messages are embedded locally and kept in a NumPy matrix; a new
+first-turn message whose cosine similarity to a stored one is above the
+threshold gets the stored answer back without an LLM round trip. Entries
+expire after a TTL. Only stateless first turns are looked up, since later
+answers depend on the conversation so far.
+
+Messages are embedded with a local sentence-transformers model
+(SEMANTIC_CACHE_MODEL, loaded on first use) when that package is installed,
+and otherwise with a hashing embedder: word unigrams and character trigrams
+in a fixed-size vector, enough for rephrasings of the canned openers. Any
+`embed(text) -> np.ndarray` can be passed instead.
+
+Neither kind of embedding reliably tells "New York to Tokyo" from "Tokyo to
+New York", or "$2000" from "$5000", so a hit also needs the same numbers
+and the same from/to places, in the same order, as the stored message.
+"""
+import importlib.util
+import os
+import re
+import threading
+import time
+import zlib
+
+import numpy as np
+
+_WORD = re.compile(r"[a-z0-9$]+")
+_NUMBER = re.compile(r"\d+(?:[.,]\d+)*")
+_FILLER = {"a", "an", "the", "my", "our", "me", "us"}
+
+
+def hashing_embed(text, dims=1024):
+    """L2-normalized bag of hashed words and character trigrams"""
+    vec = np.zeros(dims, dtype=np.float32)
+    words = _WORD.findall(text.lower())
+    for word in words:
+        vec[zlib.crc32(word.encode()) % dims] += 2.0
+        padded = f" {word} "
+        for i in range(len(padded) - 2):
+            vec[zlib.crc32(padded[i:i + 3].encode()) % dims] += 1.0
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm else vec
+
+
+def sentence_embedder(model_name):
+    """embed() backed by a sentence-transformers model, loaded on the first call"""
+    model = None
+    lock = threading.Lock()
+
+    def embed(text):
+        nonlocal model
+        if model is None:
+            with lock:
+                if model is None:
+                    from sentence_transformers import SentenceTransformer
+                    model = SentenceTransformer(model_name)
+        return model.encode(text, normalize_embeddings=True).astype(np.float32)
+
+    return embed
+
+
+def default_embed(model_name):
+    """The sentence model if sentence-transformers is installed, else the hashing embedder"""
+    if model_name and importlib.util.find_spec("sentence_transformers") is not None:
+        return sentence_embedder(model_name)
+    return hashing_embed
+
+
+def slots(text):
+    """
+    What must match exactly between two messages for one's answer to serve
+    the other: every number, and the word after each "from"/"to" together
+    with the word before "to", in order. "New York to Tokyo" gives
+    ("york>tokyo",) and "Tokyo to New York" ("tokyo>new",).
+    """
+    lowered = text.lower()
+    words = [w for w in _WORD.findall(lowered) if w not in _FILLER]
+    route = []
+    for i, word in enumerate(words[:-1]):
+        if word == "from":
+            route.append(f"from>{words[i + 1]}")
+        elif word == "to" and i:
+            route.append(f"{words[i - 1]}>{words[i + 1]}")
+    return tuple(n.replace(",", "") for n in _NUMBER.findall(lowered)), tuple(route)
+
+
+def _slot_hash(text):
+    return zlib.crc32(repr(slots(text)).encode())
+
+
+class SemanticCache:
+    """Cosine-similarity lookup over a fixed-capacity embedding matrix"""
+
+    def __init__(self, threshold=0.9, ttl=3600.0, capacity=2048, embed=hashing_embed, enabled=True):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.capacity = capacity
+        self.embed = embed
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._vectors = None
+        self._expires = np.zeros(capacity, dtype=np.float64)
+        self._slots = np.zeros(capacity, dtype=np.int64)
+        self._prompts = [None] * capacity
+        self._answers = [None] * capacity
+        self._next = 0
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def search(self, text, k=3):
+        """Top-k live entries with the same slots() as (similarity, prompt, answer), best first"""
+        if not self._size:
+            return []
+        query = self.embed(text)
+        slot_hash = _slot_hash(text)
+        with self._lock:
+            scores = self._vectors[:self._size] @ query
+            scores[self._expires[:self._size] <= time.time()] = -1.0
+            scores[self._slots[:self._size] != slot_hash] = -1.0
+            k = min(k, self._size)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [
+                (float(scores[i]), self._prompts[i], self._answers[i])
+                for i in top if scores[i] > -1.0
+            ]
+
+    def lookup(self, text):
+        """Stored answer for a near-duplicate of `text`, or None"""
+        if not self.enabled:
+            return None
+        best = self.search(text, k=1)
+        if best and best[0][0] >= self.threshold:
+            self.hits += 1
+            return best[0][2]
+        self.misses += 1
+        return None
+
+    def add(self, text, answer, ttl=None):
+        if not self.enabled or not answer:
+            return
+        vector = self.embed(text)
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.zeros((self.capacity, vector.shape[0]), dtype=np.float32)
+            # Ring buffer: once full, the oldest entry is overwritten
+            i = self._next
+            self._vectors[i] = vector
+            self._expires[i] = time.time() + (self.ttl if ttl is None else ttl)
+            self._slots[i] = _slot_hash(text)
+            self._prompts[i] = text
+            self._answers[i] = answer
+            self._next = (i + 1) % self.capacity
+            self._size = min(self._size + 1, self.capacity)
+
+    def clear(self):
+        with self._lock:
+            self._expires[:] = 0
+            self._size = 0
+            self._next = 0
+
+    def stats(self):
+        return {"size": self._size, "hits": self.hits, "misses": self.misses, "threshold": self.threshold}
+
+
+semantic_cache = SemanticCache(
+    threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.9")),
+    ttl=float(os.getenv("SEMANTIC_CACHE_TTL", "3600")),
+    capacity=int(os.getenv("SEMANTIC_CACHE_SIZE", "2048")),
+    embed=default_embed(os.getenv("SEMANTIC_CACHE_MODEL", "all-MiniLM-L6-v2")),
+    enabled=os.getenv("SEMANTIC_CACHE_ENABLED", "0") == "1",
+)
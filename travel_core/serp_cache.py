@@ -0,0 +1,102 @@
+"""
+Persistent SQLite cache for SerpAPI responses.
+
+Entries are keyed on the canonicalized search parameters (without the
+api_key), carry their own expiry time and live in a WAL-mode SQLite file,
+so they survive Streamlit restarts and are shared between worker processes.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "serp_cache.sqlite3")
+
+# Parameters that do not change the search results
+IGNORED_PARAMS = {"api_key"}
+
+
+def make_key(search_params):
+    """Stable hash of the search parameters minus the API key"""
+    canonical = {k: v for k, v in search_params.items() if k not in IGNORED_PARAMS and v is not None}
+    if isinstance(canonical.get("q"), str):
+        canonical["q"] = " ".join(canonical["q"].split()).lower()
+    payload = json.dumps(canonical, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SerpCache:
+    """Key/value store with per-entry TTLs backed by a SQLite file"""
+
+    def __init__(self, path=DEFAULT_PATH, ttl=6 * 3600.0, purge_every=256):
+        self.path = path
+        self.ttl = ttl
+        self.purge_every = purge_every
+        self._local = threading.local()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._connect()
+
+    def _connect(self):
+        # One connection per thread; sqlite3 connections are not shareable by default
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS serp_cache ("
+                " key TEXT PRIMARY KEY,"
+                " value BLOB NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " expires_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS serp_cache_expires ON serp_cache (expires_at)")
+            self._local.conn = conn
+        return conn
+
+    def get(self, search_params):
+        row = self._connect().execute(
+            "SELECT value FROM serp_cache WHERE key = ? AND expires_at > ?",
+            (make_key(search_params), time.time()),
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return bytes(row[0])
+
+    def put(self, search_params, value, ttl=None):
+        now = time.time()
+        if isinstance(value, str):
+            value = value.encode("utf-8")
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO serp_cache (key, value, created_at, expires_at) VALUES (?, ?, ?, ?)",
+            (make_key(search_params), sqlite3.Binary(value), now, now + (self.ttl if ttl is None else ttl)),
+        )
+        self._writes += 1
+        if self._writes % self.purge_every == 0:
+            self.purge_expired()
+
+    def purge_expired(self):
+        """Drop expired rows; returns how many were removed"""
+        return self._connect().execute("DELETE FROM serp_cache WHERE expires_at <= ?", (time.time(),)).rowcount
+
+    def clear(self):
+        self._connect().execute("DELETE FROM serp_cache")
+
+    def stats(self):
+        size = self._connect().execute("SELECT COUNT(*) FROM serp_cache").fetchone()[0]
+        return {"size": size, "hits": self.hits, "misses": self.misses, "ttl": self.ttl, "path": self.path}
+
+
+serp_cache = SerpCache(
+    path=os.getenv("SERP_CACHE_PATH", DEFAULT_PATH),
+    ttl=float(os.getenv("SERP_CACHE_TTL", str(6 * 3600))),
+)
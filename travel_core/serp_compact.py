@@ -0,0 +1,117 @@
+"""
+Shrink raw SerpAPI JSON down to the fields the model actually uses.
+
+The raw response is often tens of kilobytes; every later LLM call in the
+thread would resend it. compact_serp keeps answer boxes, organic results,
+flight and hotel prices and local results, in that priority order, until a
+token budget is reached.
+"""
+import json
+import os
+
+from travel_core.tokens import estimate_tokens
+
+TOKEN_BUDGET = int(os.getenv("SERP_TOKEN_BUDGET", "800"))
+SNIPPET_CHARS = 300
+
+
+def _clip(text, limit=SNIPPET_CHARS):
+    if not isinstance(text, str):
+        return text
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+def _pick(item, *fields):
+    return {f: _clip(item[f]) for f in fields if item.get(f) not in (None, "", [], {})}
+
+
+def _answer_box(data):
+    box = data.get("answer_box")
+    if not isinstance(box, dict):
+        return []
+    return [_pick(box, "title", "answer", "snippet", "result", "price", "link")]
+
+
+def _knowledge_graph(data):
+    kg = data.get("knowledge_graph")
+    if not isinstance(kg, dict):
+        return []
+    return [_pick(kg, "title", "type", "description", "website")]
+
+
+def _organic(data):
+    return [_pick(r, "title", "snippet", "link", "price") for r in data.get("organic_results") or []]
+
+
+def _flights(data):
+    rows = []
+    for group in ("best_flights", "other_flights"):
+        for offer in data.get(group) or []:
+            legs = offer.get("flights") or [{}]
+            row = {
+                "price": offer.get("price"),
+                "total_duration": offer.get("total_duration"),
+                "airline": legs[0].get("airline"),
+                "from": (legs[0].get("departure_airport") or {}).get("id"),
+                "to": (legs[-1].get("arrival_airport") or {}).get("id"),
+                "stops": len(legs) - 1,
+            }
+            rows.append({k: v for k, v in row.items() if v is not None})
+    return rows
+
+
+def _hotels(data):
+    rows = []
+    for prop in data.get("properties") or []:
+        row = _pick(prop, "name", "overall_rating", "hotel_class", "link")
+        rate = prop.get("rate_per_night") or {}
+        if rate.get("lowest"):
+            row["price_per_night"] = rate["lowest"]
+        rows.append(row)
+    return rows
+
+
+def _local(data):
+    places = data.get("local_results")
+    if isinstance(places, dict):
+        places = places.get("places")
+    return [_pick(p, "title", "rating", "price", "type", "address") for p in places or []]
+
+
+# Sections in priority order: earlier ones get the budget first
+SECTIONS = (
+    ("answer_box", _answer_box),
+    ("knowledge_graph", _knowledge_graph),
+    ("flights", _flights),
+    ("hotels", _hotels),
+    ("organic_results", _organic),
+    ("local_results", _local),
+)
+
+
+def compact_serp(raw, token_budget=None):
+    """Return a compact JSON string of the useful parts of a SERP response"""
+    budget = TOKEN_BUDGET if token_budget is None else token_budget
+    try:
+        data = json.loads(raw)
+    except (TypeError, ValueError):
+        text = raw.decode("utf-8", "replace") if isinstance(raw, bytes) else str(raw)
+        return text[:budget * 4]
+    if not isinstance(data, dict):
+        return json.dumps(data)[:budget * 4]
+    if data.get("error"):
+        return json.dumps({"error": data["error"]})
+
+    compact = {}
+    used = 2
+    for name, extract in SECTIONS:
+        for item in extract(data):
+            if not item:
+                continue
+            cost = estimate_tokens(json.dumps(item, ensure_ascii=False)) + 1
+            if used + cost > budget:
+                break
+            compact.setdefault(name, []).append(item)
+            used += cost
+    return json.dumps(compact, ensure_ascii=False, separators=(",", ":"))
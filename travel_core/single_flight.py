@@ -0,0 +1,116 @@
+"""
+Request coalescing for concurrent identical calls.
+
+When several sessions ask for the same thing at the same moment, only the
+first caller (the leader) runs the upstream request; everyone else with the
+same key waits for it and shares the result (or the exception). Works for
+threads (do) and coroutines (ado).
+"""
+import asyncio
+import json
+import threading
+
+from travel_core.gazetteer import gazetteer
+from travel_core.tracing import annotate
+from travel_core.weather_cache import normalize_city
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Deduplicates in-flight calls by key"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._async_calls = {}
+        self.leaders = 0
+        self.shared = 0
+
+    def do(self, key, fn):
+        """Run fn() once per key among concurrent threads and return its result"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            annotate(coalesced=True)
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    async def ado(self, key, coro_fn):
+        """Await coro_fn() once per key among concurrent tasks on the running loop"""
+        # Futures belong to one loop, so in-flight calls are tracked per loop
+        loop_key = (id(asyncio.get_running_loop()), key)
+        future = self._async_calls.get(loop_key)
+        if future is not None:
+            annotate(coalesced=True)
+            self.shared += 1
+            return await asyncio.shield(future)
+
+        future = asyncio.ensure_future(coro_fn())
+        self._async_calls[loop_key] = future
+        self.leaders += 1
+        try:
+            return await asyncio.shield(future)
+        finally:
+            if self._async_calls.get(loop_key) is future:
+                del self._async_calls[loop_key]
+
+    def stats(self):
+        return {"leaders": self.leaders, "shared": self.shared, "in_flight": len(self._calls) + len(self._async_calls)}
+
+
+def _normalize(value):
+    if isinstance(value, str):
+        return " ".join(value.split()).lower()
+    return value
+
+
+def tool_call_key(tool, args):
+    """Normalized (tool name, arguments) key; weather calls use the city cache key"""
+    if tool.name == "get_weather" and "city" in args:
+        place = gazetteer.resolve(args["city"])
+        return (tool.name, place.id if place else normalize_city(args["city"]))
+    normalized = {k: _normalize(v) for k, v in args.items()}
+    return (tool.name, json.dumps(normalized, sort_keys=True, default=str))
+
+
+class SingleFlightMiddleware:
+    """ToolRegistry middleware coalescing identical concurrent tool calls"""
+
+    def __init__(self, flight=None, key=tool_call_key):
+        self.flight = flight or SingleFlight()
+        self.key = key
+
+    def call(self, tool, args, call_next):
+        return self.flight.do(self.key(tool, args), lambda: call_next(args))
+
+    async def acall(self, tool, args, call_next):
+        return await self.flight.ado(self.key(tool, args), lambda: call_next(args))
+
+
+single_flight = SingleFlightMiddleware()
@@ -0,0 +1,11 @@
+"""Cheap token estimates for budgeting prompt content"""
+
+# gpt-4o-mini averages roughly four characters of English text per token
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text):
+    """Approximate token count of a string (rounds up)"""
+    if not text:
+        return 0
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
@@ -0,0 +1,41 @@
+"""
+The agent's tools, registered once in `registry`.
+
+Importing this package registers every tool; front ends use
+registry.openai_schemas() / registry.call() (raw OpenAI client) or
+registry.langchain_tools() (LangGraph agents).
+"""
+from travel_core.tools.registry import Tool, ToolRegistry, registry
+from travel_core.tools.weather import aget_weather, get_weather
+from travel_core.tools.weather_batch import aget_weather_batch, get_weather_batch
+from travel_core.tools.forecast import aget_weather_forecast, get_weather_forecast
+from travel_core.tools.climate import aget_climate_normals, get_climate_normals
+from travel_core.tools.search import aget_flight_and_hotel_information, get_flight_and_hotel_information
+from travel_core.tools.travel_offers import asearch_flights, asearch_hotels, search_flights, search_hotels
+from travel_core.single_flight import single_flight
+from travel_core.tracing import TracingMiddleware
+
+# Every tool call is traced (outermost, so coalesced waits are timed too)
+registry.add_middleware(TracingMiddleware())
+# Concurrent identical calls from different sessions share one upstream request
+registry.add_middleware(single_flight)
+
+__all__ = [
+    "Tool",
+    "ToolRegistry",
+    "registry",
+    "get_weather",
+    "aget_weather",
+    "get_weather_batch",
+    "aget_weather_batch",
+    "get_weather_forecast",
+    "aget_weather_forecast",
+    "get_climate_normals",
+    "aget_climate_normals",
+    "get_flight_and_hotel_information",
+    "aget_flight_and_hotel_information",
+    "search_flights",
+    "asearch_flights",
+    "search_hotels",
+    "asearch_hotels",
+]
@@ -0,0 +1,52 @@
+"""get_climate_normals tool: typical monthly weather from the local climate store, no API call"""
+import json
+
+from travel_core.climate import climate_store, parse_month
+from travel_core.tools.registry import registry
+
+PARAMETERS = {
+    "type": "object",
+    "properties": {
+        "place": {
+            "type": "string",
+            "description": "A city (optionally \"City,CC\") or a country"
+        },
+        "month": {
+            "type": "string",
+            "description": "Month name or number; leave out for the whole year"
+        }
+    },
+    "required": ["place"]
+}
+
+
+def _climate_normals(place, month):
+    if not climate_store.available():
+        return "Error: No climate data installed"
+
+    month_no = parse_month(month) if month not in (None, "") else None
+    if month not in (None, "") and month_no is None:
+        return f"Error: Unknown month {month!r}"
+
+    result = climate_store.normals(place, month_no)
+    if result is None:
+        return f"Error: No climate data for {place}"
+    return json.dumps(result, ensure_ascii=False, separators=(",", ":"))
+
+
+async def aget_climate_normals(place: str, month: str | None = None) -> str:
+    """Get the monthly climate averages of a city or country"""
+    # A lookup in a memory-mapped array; not worth a worker thread
+    return _climate_normals(place, month)
+
+
+@registry.register(
+    "get_climate_normals",
+    "Get the typical weather (average min/max temperature, rain, sunshine) of a city or country "
+    "by month. Use this for trips more than a few days away instead of the current weather.",
+    PARAMETERS,
+    coroutine=aget_climate_normals,
+)
+def get_climate_normals(place: str, month: str | None = None) -> str:
+    """Get the monthly climate averages of a city or country"""
+    return _climate_normals(place, month)
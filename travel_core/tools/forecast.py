@@ -0,0 +1,156 @@
+"""get_weather_forecast tool: daily outlook for the next days from OpenWeatherMap"""
+import json
+import os
+from collections import Counter
+
+import requests
+
+from travel_core import async_http_client, http_client
+from travel_core.gazetteer import gazetteer
+from travel_core.rate_limit import rate_limits
+from travel_core.tools.registry import registry
+from travel_core.tracing import annotate
+from travel_core.weather_cache import TTLCache, normalize_city
+
+# Overridable so benchmarks can point the tool at a local stand-in
+BASE_URL = os.getenv("WEATHER_FORECAST_API_URL", "https://api.openweathermap.org/data/2.5/forecast")
+
+# The free forecast endpoint covers 5 days in 3-hour steps
+MAX_DAYS = 5
+
+# Forecasts change slowly; summaries are cached per city
+forecast_cache = TTLCache(
+    maxsize=int(os.getenv("WEATHER_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("WEATHER_FORECAST_TTL", "1800")),
+)
+
+PARAMETERS = {
+    "type": "object",
+    "properties": {
+        "city": {
+            "type": "string",
+            "description": "The city to get the forecast of, with the state or country if ambiguous (\"Paris, TX\")"
+        },
+        "days": {
+            "type": "integer",
+            "description": f"Number of days to forecast, 1 to {MAX_DAYS}"
+        }
+    },
+    "required": ["city"]
+}
+
+
+def _params(city, place, weather_api_key):
+    location = {"lat": place.lat, "lon": place.lon} if place else {"q": city}
+    return {
+        **location,
+        "appid": weather_api_key,
+        "units": "metric"
+    }
+
+
+def summarize_forecast(forecast, place=None):
+    """Collapse the 3-hourly forecast list into one row per day"""
+    days = {}
+    for step in forecast.get("list") or []:
+        day = days.setdefault(step.get("dt_txt", "")[:10], {"temps": [], "conditions": Counter(), "pop": 0.0, "rain": 0.0})
+        main = step.get("main") or {}
+        day["temps"] += [t for t in (main.get("temp_min"), main.get("temp_max")) if t is not None]
+        for condition in step.get("weather") or []:
+            day["conditions"][condition.get("description")] += 1
+        day["pop"] = max(day["pop"], step.get("pop") or 0.0)
+        day["rain"] += (step.get("rain") or {}).get("3h", 0.0)
+
+    city = forecast.get("city") or {}
+    rows = []
+    for date, day in sorted(days.items()):
+        if not day["temps"]:
+            continue
+        rows.append({
+            "date": date,
+            "min_c": round(min(day["temps"])),
+            "max_c": round(max(day["temps"])),
+            "conditions": day["conditions"].most_common(1)[0][0] if day["conditions"] else None,
+            "rain_chance_pct": round(day["pop"] * 100),
+            "rain_mm": round(day["rain"], 1),
+        })
+    name = place.name if place else city.get("name")
+    country = place.country_code if place else city.get("country")
+    if name and country:
+        name = f"{name},{country}"
+    return {"city": name, "days": rows}
+
+
+def _render(summary, days):
+    try:
+        days = max(1, min(MAX_DAYS, int(days or MAX_DAYS)))
+    except (TypeError, ValueError):
+        days = MAX_DAYS
+    return json.dumps({**summary, "days": summary["days"][:days]}, ensure_ascii=False, separators=(",", ":"))
+
+
+async def aget_weather_forecast(city: str, days: int = MAX_DAYS) -> str:
+    """Get the daily weather forecast of a city"""
+    # Only the async path needs httpx, so it isn't imported with the module
+    import httpx
+
+    weather_api_key = os.getenv("WEATHER_API_KEY")
+
+    if weather_api_key is None:
+        return "Error: Weather API key is not set"
+
+    place = gazetteer.resolve(city)
+    key = place.id if place else normalize_city(city)
+    cached = forecast_cache.get(key)
+    annotate(cache_hit=cached is not None)
+    if cached is not None:
+        return _render(cached, days)
+
+    await rate_limits["weather"].aacquire()
+    try:
+        response = await async_http_client.get(BASE_URL, params=_params(city, place, weather_api_key))
+    except httpx.HTTPError as e:
+        # Don't echo the exception text, it contains the URL with the API key
+        return f"Error: {type(e).__name__}"
+
+    if response.status_code == 200:
+        summary = summarize_forecast(response.json(), place)
+        forecast_cache.put(key, summary)
+        return _render(summary, days)
+    else:
+        return f"Error: {response.status_code}"
+
+
+@registry.register(
+    "get_weather_forecast",
+    f"Get the daily weather forecast of a city for the next 1-{MAX_DAYS} days",
+    PARAMETERS,
+    coroutine=aget_weather_forecast,
+)
+def get_weather_forecast(city: str, days: int = MAX_DAYS) -> str:
+    """Get the daily weather forecast of a city"""
+    weather_api_key = os.getenv("WEATHER_API_KEY")
+
+    if weather_api_key is None:
+        return "Error: Weather API key is not set"
+
+    place = gazetteer.resolve(city)
+    key = place.id if place else normalize_city(city)
+    cached = forecast_cache.get(key)
+    annotate(cache_hit=cached is not None)
+    if cached is not None:
+        return _render(cached, days)
+
+    rate_limits["weather"].acquire()
+    try:
+        response = http_client.get(BASE_URL, params=_params(city, place, weather_api_key))
+    except requests.RequestException as e:
+        # Don't echo the exception text, it contains the URL with the API key
+        return f"Error: {type(e).__name__}"
+
+    if response.status_code == 200:
+        summary = summarize_forecast(response.json(), place)
+        forecast_cache.put(key, summary)
+        return _render(summary, days)
+    else:
+        return f"Error: {response.status_code}"
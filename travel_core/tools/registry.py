@@ -0,0 +1,135 @@
+"""
+Tool registry shared by every entry point.
+
+Each tool is registered once with its JSON schema and sync/async
+implementations. The OpenAI schema list is built at registration time,
+LangChain tools are built once on first use, dispatch is a dict lookup, and
+middleware attached here (caching, timeouts, metrics, ...) applies to all
+three front ends at once.
+"""
+
+
+class Tool:
+    """A registered tool: schema plus sync and optional async implementation"""
+
+    def __init__(self, name, description, parameters, func, coroutine=None):
+        self.name = name
+        self.description = description
+        self.parameters = parameters
+        self.func = func
+        self.coroutine = coroutine
+
+    def openai_schema(self):
+        return {
+            "type": "function",
+            "function": {
+                "name": self.name,
+                "description": self.description,
+                "parameters": self.parameters,
+            },
+        }
+
+
+class ToolRegistry:
+    """Name -> Tool mapping with prebuilt schemas and a middleware chain"""
+
+    def __init__(self):
+        self._tools = {}
+        self._openai_schemas = []
+        self._langchain_tools = None
+        self._middleware = []
+
+    def register(self, name, description, parameters, coroutine=None):
+        """Decorator registering the sync implementation of a tool"""
+        def decorator(func):
+            tool = Tool(name, description, parameters, func, coroutine)
+            self._tools[name] = tool
+            self._openai_schemas.append(tool.openai_schema())
+            self._langchain_tools = None
+            return func
+        return decorator
+
+    def add_middleware(self, middleware):
+        """
+        Attach middleware around every tool call. `middleware` may define
+        call(tool, args, call_next) and/or acall(tool, args, call_next);
+        middleware added first runs outermost.
+        """
+        self._middleware.append(middleware)
+
+    def get(self, name):
+        return self._tools.get(name)
+
+    def names(self):
+        return list(self._tools)
+
+    def openai_schemas(self):
+        """Tool definitions for chat.completions, built once at registration"""
+        return self._openai_schemas
+
+    def langchain_tools(self):
+        """StructuredTools for create_react_agent that dispatch through this registry"""
+        if self._langchain_tools is None:
+            from langchain_core.tools import StructuredTool
+
+            self._langchain_tools = [
+                StructuredTool.from_function(
+                    func=self._sync_entry(tool.name),
+                    coroutine=self._async_entry(tool.name),
+                    name=tool.name,
+                    description=tool.description,
+                    args_schema=tool.parameters,
+                )
+                for tool in self._tools.values()
+            ]
+        return self._langchain_tools
+
+    def call(self, name, args):
+        tool = self._tools.get(name)
+        if tool is None:
+            return f"Unknown function: {name}"
+        call_next = lambda a: tool.func(**a)
+        for middleware in reversed(self._middleware):
+            if hasattr(middleware, "call"):
+                call_next = self._bind(middleware.call, tool, call_next)
+        return call_next(args)
+
+    async def acall(self, name, args):
+        tool = self._tools.get(name)
+        if tool is None:
+            return f"Unknown function: {name}"
+        if tool.coroutine is not None:
+            async def call_next(a):
+                return await tool.coroutine(**a)
+        else:
+            import asyncio
+
+            async def call_next(a):
+                return await asyncio.to_thread(tool.func, **a)
+        for middleware in reversed(self._middleware):
+            if hasattr(middleware, "acall"):
+                call_next = self._abind(middleware.acall, tool, call_next)
+        return await call_next(args)
+
+    @staticmethod
+    def _bind(wrap, tool, call_next):
+        return lambda args: wrap(tool, args, call_next)
+
+    @staticmethod
+    def _abind(wrap, tool, call_next):
+        async def bound(args):
+            return await wrap(tool, args, call_next)
+        return bound
+
+    def _sync_entry(self, name):
+        def run(**kwargs):
+            return self.call(name, kwargs)
+        return run
+
+    def _async_entry(self, name):
+        async def arun(**kwargs):
+            return await self.acall(name, kwargs)
+        return arun
+
+
+registry = ToolRegistry()
@@ -0,0 +1,102 @@
+"""get_flight_and_hotel_information tool: Google results via SerpAPI"""
+import os
+
+import requests
+
+from travel_core import async_http_client, http_client
+from travel_core.rate_limit import rate_limits
+from travel_core.serp_cache import serp_cache
+from travel_core.serp_compact import compact_serp
+from travel_core.tools.registry import registry
+from travel_core.tracing import annotate
+
+# Overridable so benchmarks can point the tool at a local stand-in
+BASE_URL = os.getenv("SERP_API_URL", "https://serpapi.com/search")
+
+PARAMETERS = {
+    "type": "object",
+    "properties": {
+        "query": {
+            "type": "string",
+            "description": "Search query for google"
+        }
+    },
+    "required": ["query"]
+}
+
+
+def _search_params(query, serp_api_key):
+    return {
+        "engine": "google",
+        "google_domain": "google.com",
+        "hl": "en",
+        "gl": "us",
+        "q": query,
+        "api_key": serp_api_key
+    }
+
+
+async def aget_flight_and_hotel_information(query: str) -> str:
+    """Google search api to get flight and hotel information"""
+    # Only the async path needs httpx, so it isn't imported with the module
+    import httpx
+
+    serp_api_key = os.getenv("SERP_API_KEY")
+
+    if serp_api_key is None:
+        return "Error: SERP API key is not set"
+
+    search_params = _search_params(query, serp_api_key)
+    cached = serp_cache.get(search_params)
+    annotate(cache_hit=cached is not None)
+    if cached is not None:
+        return compact_serp(cached)
+
+    await rate_limits["serp"].aacquire()
+    try:
+        response = await async_http_client.get(BASE_URL, params=search_params)
+    except httpx.HTTPError as e:
+        # Don't echo the exception text, it contains the URL with the API key
+        return f"Error: {type(e).__name__}"
+
+    if response.status_code == 200:
+        serp_cache.put(search_params, response.content)
+        # Only hand the model the useful fields, not the whole SERP payload
+        return compact_serp(response.content)
+    else:
+        return f"Error, response: {response}"
+
+
+@registry.register(
+    "get_flight_and_hotel_information",
+    "Google search api to get flight and hotel information. For prices on known dates "
+    "prefer search_flights and search_hotels, which return compact structured offers.",
+    PARAMETERS,
+    coroutine=aget_flight_and_hotel_information,
+)
+def get_flight_and_hotel_information(query: str) -> str:
+    """Google search api to get flight and hotel information"""
+    serp_api_key = os.getenv("SERP_API_KEY")
+
+    if serp_api_key is None:
+        return "Error: SERP API key is not set"
+
+    search_params = _search_params(query, serp_api_key)
+    cached = serp_cache.get(search_params)
+    annotate(cache_hit=cached is not None)
+    if cached is not None:
+        return compact_serp(cached)
+
+    rate_limits["serp"].acquire()
+    try:
+        response = http_client.get(BASE_URL, params=search_params)
+    except requests.RequestException as e:
+        # Don't echo the exception text, it contains the URL with the API key
+        return f"Error: {type(e).__name__}"
+
+    if response.status_code == 200:
+        serp_cache.put(search_params, response.content)
+        # Only hand the model the useful fields, not the whole SERP payload
+        return compact_serp(response.content)
+    else:
+        return f"Error, response: {response}"
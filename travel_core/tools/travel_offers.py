@@ -0,0 +1,165 @@
+"""search_flights / search_hotels tools: ranked, typed offers from every travel search provider"""
+import json
+
+from travel_core.gazetteer import gazetteer
+from travel_core.tools.registry import registry
+from travel_core.travel_search import FlightQuery, HotelQuery, parse_date, travel_search
+
+FLIGHT_PARAMETERS = {
+    "type": "object",
+    "properties": {
+        "origin": {
+            "type": "string",
+            "description": "IATA airport or city code to fly from, e.g. \"JFK\" or \"NYC\""
+        },
+        "destination": {
+            "type": "string",
+            "description": "IATA airport or city code to fly to, e.g. \"CDG\" or \"PAR\""
+        },
+        "outbound_date": {
+            "type": "string",
+            "description": "Departure date, YYYY-MM-DD"
+        },
+        "return_date": {
+            "type": "string",
+            "description": "Return date, YYYY-MM-DD; leave out for a one-way trip"
+        },
+        "adults": {
+            "type": "integer",
+            "description": "Number of adult passengers"
+        },
+        "sort": {
+            "type": "string",
+            "enum": ["best", "price", "duration"],
+            "description": "Ranking; best weighs price, duration and stops"
+        }
+    },
+    "required": ["origin", "destination", "outbound_date"]
+}
+
+HOTEL_PARAMETERS = {
+    "type": "object",
+    "properties": {
+        "location": {
+            "type": "string",
+            "description": "City or area to stay in, e.g. \"Paris\" or \"Shibuya, Tokyo\""
+        },
+        "check_in_date": {
+            "type": "string",
+            "description": "Check-in date, YYYY-MM-DD"
+        },
+        "check_out_date": {
+            "type": "string",
+            "description": "Check-out date, YYYY-MM-DD"
+        },
+        "adults": {
+            "type": "integer",
+            "description": "Number of adult guests"
+        },
+        "sort": {
+            "type": "string",
+            "enum": ["best", "price", "rating"],
+            "description": "Ranking; best weighs nightly price against guest rating"
+        }
+    },
+    "required": ["location", "check_in_date", "check_out_date"]
+}
+
+
+def _adults(value, default):
+    try:
+        return max(1, int(value if value is not None else default))
+    except (TypeError, ValueError):
+        raise ValueError(f"adults must be a number, got {value!r}") from None
+
+
+def _flight_query(origin, destination, outbound_date, return_date, adults):
+    outbound = parse_date(outbound_date, "outbound_date")
+    back = parse_date(return_date, "return_date") if return_date else None
+    if back is not None and back < outbound:
+        raise ValueError("return_date is before outbound_date")
+    return FlightQuery(origin.strip(), destination.strip(), outbound, back, _adults(adults, 1))
+
+
+def _hotel_query(location, check_in_date, check_out_date, adults):
+    check_in = parse_date(check_in_date, "check_in_date")
+    check_out = parse_date(check_out_date, "check_out_date")
+    if check_out <= check_in:
+        raise ValueError("check_out_date must be after check_in_date")
+    # "Paris" alone could be Paris, TX; the gazetteer's pick is passed on explicitly
+    place = gazetteer.resolve(location)
+    location = gazetteer.label(place) if place else location.strip()
+    return HotelQuery(location, check_in, check_out, _adults(adults, 2))
+
+
+def render_offers(kind, offers, errors, **fields):
+    """Compact JSON: shared fields once at the top, then one small object per offer"""
+    rows = [offer.to_dict() for offer in offers]
+    result = dict(fields)
+    currencies = {offer.currency for offer in offers}
+    if len(currencies) == 1:
+        result["currency"] = currencies.pop()
+        for row in rows:
+            row.pop("currency", None)
+    result[kind] = rows
+    if errors:
+        result["errors"] = errors
+    return json.dumps(result, ensure_ascii=False, separators=(",", ":"))
+
+
+async def asearch_flights(origin: str, destination: str, outbound_date: str, return_date: str | None = None,
+                          adults: int = 1, sort: str = "best") -> str:
+    """Search flights across every provider"""
+    try:
+        query = _flight_query(origin, destination, outbound_date, return_date, adults)
+    except ValueError as e:
+        return f"Error: {e}"
+    offers, errors = await travel_search.asearch_flights(query, sort)
+    return render_offers("flights", offers, errors)
+
+
+@registry.register(
+    "search_flights",
+    "Search flight offers between two airports on given dates. Returns a few ranked offers "
+    "with price, airline, times, duration and stops.",
+    FLIGHT_PARAMETERS,
+    coroutine=asearch_flights,
+)
+def search_flights(origin: str, destination: str, outbound_date: str, return_date: str | None = None,
+                   adults: int = 1, sort: str = "best") -> str:
+    """Search flights across every provider"""
+    try:
+        query = _flight_query(origin, destination, outbound_date, return_date, adults)
+    except ValueError as e:
+        return f"Error: {e}"
+    offers, errors = travel_search.search_flights(query, sort)
+    return render_offers("flights", offers, errors)
+
+
+async def asearch_hotels(location: str, check_in_date: str, check_out_date: str, adults: int = 2,
+                         sort: str = "best") -> str:
+    """Search hotels across every provider"""
+    try:
+        query = _hotel_query(location, check_in_date, check_out_date, adults)
+    except ValueError as e:
+        return f"Error: {e}"
+    offers, errors = await travel_search.asearch_hotels(query, sort)
+    return render_offers("hotels", offers, errors, location=query.location, nights=query.nights)
+
+
+@registry.register(
+    "search_hotels",
+    "Search hotel offers in a city for given dates. Returns a few ranked offers with nightly "
+    "and total price, guest rating and star class.",
+    HOTEL_PARAMETERS,
+    coroutine=asearch_hotels,
+)
+def search_hotels(location: str, check_in_date: str, check_out_date: str, adults: int = 2,
+                  sort: str = "best") -> str:
+    """Search hotels across every provider"""
+    try:
+        query = _hotel_query(location, check_in_date, check_out_date, adults)
+    except ValueError as e:
+        return f"Error: {e}"
+    offers, errors = travel_search.search_hotels(query, sort)
+    return render_offers("hotels", offers, errors, location=query.location, nights=query.nights)
@@ -0,0 +1,105 @@
+"""get_weather tool: current conditions from OpenWeatherMap"""
+import os
+
+import requests
+
+from travel_core import async_http_client, http_client
+from travel_core.gazetteer import gazetteer
+from travel_core.rate_limit import rate_limits
+from travel_core.tools.registry import registry
+from travel_core.tracing import annotate
+from travel_core.weather_cache import weather_cache
+
+# Overridable so benchmarks can point the tool at a local stand-in
+BASE_URL = os.getenv("WEATHER_API_URL", "https://api.openweathermap.org/data/2.5/weather")
+
+PARAMETERS = {
+    "type": "object",
+    "properties": {
+        "city": {
+            "type": "string",
+            "description": "The city to get the weather of, with the state or country if ambiguous (\"Paris, TX\")"
+        }
+    },
+    "required": ["city"]
+}
+
+
+def _params(city, place, weather_api_key):
+    # Resolved cities are looked up by coordinates, so the API can't pick a namesake
+    location = {"lat": place.lat, "lon": place.lon} if place else {"q": city}
+    return {
+        **location,
+        "appid": weather_api_key,
+        "units": "metric"
+    }
+
+
+def _named(weather, place):
+    """Report the city asked about, not the weather station nearest to its coordinates"""
+    if place:
+        weather["name"] = place.name
+        weather.setdefault("sys", {})["country"] = place.country_code
+    return weather
+
+
+async def aget_weather(city: str) -> str:
+    """Get the weather of a city"""
+    # Only the async path needs httpx, so it isn't imported with the module
+    import httpx
+
+    weather_api_key = os.getenv("WEATHER_API_KEY")
+
+    if weather_api_key is None:
+        return "Error: Weather API key is not set"
+
+    place = gazetteer.resolve(city)
+    key = place.id if place else city
+    cached = weather_cache.get(key)
+    annotate(cache_hit=cached is not None)
+    if cached is not None:
+        return cached
+
+    await rate_limits["weather"].aacquire()
+    try:
+        response = await async_http_client.get(BASE_URL, params=_params(city, place, weather_api_key))
+    except httpx.HTTPError as e:
+        # Don't echo the exception text, it contains the URL with the API key
+        return f"Error: {type(e).__name__}"
+
+    if response.status_code == 200:
+        weather = _named(response.json(), place)
+        weather_cache.put(key, weather)
+        return weather
+    else:
+        return f"Error: {response.status_code}"
+
+
+@registry.register("get_weather", "Get the weather of a city", PARAMETERS, coroutine=aget_weather)
+def get_weather(city: str) -> str:
+    """Get the weather of a city"""
+    weather_api_key = os.getenv("WEATHER_API_KEY")
+
+    if weather_api_key is None:
+        return "Error: Weather API key is not set"
+
+    place = gazetteer.resolve(city)
+    key = place.id if place else city
+    cached = weather_cache.get(key)
+    annotate(cache_hit=cached is not None)
+    if cached is not None:
+        return cached
+
+    rate_limits["weather"].acquire()
+    try:
+        response = http_client.get(BASE_URL, params=_params(city, place, weather_api_key))
+    except requests.RequestException as e:
+        # Don't echo the exception text, it contains the URL with the API key
+        return f"Error: {type(e).__name__}"
+
+    if response.status_code == 200:
+        weather = _named(response.json(), place)
+        weather_cache.put(key, weather)
+        return weather
+    else:
+        return f"Error: {response.status_code}"
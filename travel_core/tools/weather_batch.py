@@ -0,0 +1,125 @@
+"""get_weather_batch tool: current conditions for many cities as one compact table"""
+import asyncio
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from travel_core.gazetteer import gazetteer
+from travel_core.tools.registry import registry
+from travel_core.weather_cache import normalize_city
+
+MAX_CITIES = int(os.getenv("WEATHER_BATCH_MAX_CITIES", "20"))
+
+# Sync lookups fan out here; async ones share the event loop's HTTP pool
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("WEATHER_BATCH_WORKERS", "8")), thread_name_prefix="weather-batch"
+)
+
+PARAMETERS = {
+    "type": "object",
+    "properties": {
+        "cities": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": f"The cities to compare (up to {MAX_CITIES})"
+        }
+    },
+    "required": ["cities"]
+}
+
+
+def _unique(cities):
+    """Drop duplicates ("Rome" / "roma ") keeping the first spelling, capped at MAX_CITIES"""
+    seen, unique = set(), []
+    for city in cities or []:
+        if not isinstance(city, str) or not city.strip():
+            continue
+        place = gazetteer.resolve(city)
+        key = place.id if place else normalize_city(city)
+        if key not in seen:
+            seen.add(key)
+            unique.append(city.strip())
+    return unique[:MAX_CITIES]
+
+
+def _is_weather(result):
+    return isinstance(result, dict) and isinstance(result.get("main"), dict)
+
+
+def _place(city, weather):
+    country = (weather.get("sys") or {}).get("country")
+    name = weather.get("name") or city
+    return f"{name},{country}" if country else name
+
+
+def weather_table(cities, results):
+    """
+    Columnar summary of OpenWeatherMap responses: one list per field, in city
+    order, plus the warmest/coldest city and mean temperature. Cities whose
+    lookup failed are listed under "errors" instead.
+    """
+    ok = [(city, r) for city, r in zip(cities, results) if _is_weather(r)]
+    errors = {city: str(r) for city, r in zip(cities, results) if not _is_weather(r)}
+    if not ok:
+        return json.dumps({"errors": errors}, ensure_ascii=False, separators=(",", ":"))
+
+    def column(path):
+        values = []
+        for _, r in ok:
+            value = r
+            for key in path:
+                value = value.get(key) if isinstance(value, dict) else None
+            values.append(np.nan if value is None else value)
+        return np.array(values, dtype=float)
+
+    temp = column(("main", "temp"))
+    feels = column(("main", "feels_like"))
+    humidity = column(("main", "humidity"))
+    wind = column(("wind", "speed"))
+    names = [_place(city, r) for city, r in ok]
+
+    def as_list(values, decimals=0):
+        rounded = np.round(values, decimals)
+        return [None if np.isnan(v) else (int(v) if decimals == 0 else float(v)) for v in rounded]
+
+    table = {
+        "city": names,
+        "temp_c": as_list(temp),
+        "feels_like_c": as_list(feels),
+        "humidity_pct": as_list(humidity),
+        "wind_ms": as_list(wind, 1),
+        "conditions": [((r.get("weather") or [{}])[0]).get("description") for _, r in ok],
+    }
+    if not np.isnan(temp).all():
+        table["stats"] = {
+            "warmest": names[int(np.nanargmax(temp))],
+            "coldest": names[int(np.nanargmin(temp))],
+            "mean_temp_c": round(float(np.nanmean(temp)), 1),
+        }
+    if errors:
+        table["errors"] = errors
+    return json.dumps(table, ensure_ascii=False, separators=(",", ":"))
+
+
+async def aget_weather_batch(cities: list[str]) -> str:
+    """Get the weather of several cities at once"""
+    cities = _unique(cities)
+    # Each lookup goes through the registry, so caching, coalescing and tracing apply per city
+    results = await asyncio.gather(*(registry.acall("get_weather", {"city": city}) for city in cities))
+    return weather_table(cities, results)
+
+
+@registry.register(
+    "get_weather_batch",
+    "Get the current weather of several cities at once, as one compact comparison table. "
+    "Prefer this over repeated get_weather calls when comparing destinations.",
+    PARAMETERS,
+    coroutine=aget_weather_batch,
+)
+def get_weather_batch(cities: list[str]) -> str:
+    """Get the weather of several cities at once"""
+    cities = _unique(cities)
+    results = list(_executor.map(lambda city: registry.call("get_weather", {"city": city}), cities))
+    return weather_table(cities, results)
@@ -0,0 +1,170 @@
+"""
+Low-overhead tracing for LLM calls, tool calls and checkpointer access.
+
+Each span is a small dict (kind, name, wall_ms, tokens, payload bytes,
+cache hit, ...) appended to a bounded in-process ring buffer. The buffer can
+be summarized into percentiles, exported as JSONL, or rendered in the
+Prometheus text format. Code running inside a span can attach fields to it
+with annotate(), e.g. a tool reporting that it was served from cache.
+"""
+import contextlib
+import contextvars
+import json
+import os
+import statistics
+import time
+from collections import deque
+
+_current_span = contextvars.ContextVar("travel_current_span", default=None)
+
+
+class Tracer:
+    """Ring buffer of finished spans"""
+
+    def __init__(self, maxlen=5000):
+        self._spans = deque(maxlen=maxlen)
+
+    def add(self, record):
+        # deque.append is atomic, no lock needed on the hot path
+        self._spans.append(record)
+
+    def spans(self, kind=None, name=None):
+        return [
+            s for s in list(self._spans)
+            if (kind is None or s["kind"] == kind) and (name is None or s["name"] == name)
+        ]
+
+    def clear(self):
+        self._spans.clear()
+
+    def summary(self):
+        """One row per (kind, name) with count, latency percentiles, tokens and cache hit ratios"""
+        groups = {}
+        for s in list(self._spans):
+            groups.setdefault((s["kind"], s["name"]), []).append(s)
+        rows = []
+        for (kind, name), spans in sorted(groups.items()):
+            walls = sorted(s["wall_ms"] for s in spans)
+            cached = [s["cache_hit"] for s in spans if "cache_hit" in s]
+            prompt_tokens = sum(s.get("prompt_tokens") or 0 for s in spans)
+            cached_tokens = sum(s.get("cached_tokens") or 0 for s in spans)
+            rows.append({
+                "kind": kind,
+                "name": name,
+                "count": len(spans),
+                "p50_ms": _quantile(walls, 0.50),
+                "p95_ms": _quantile(walls, 0.95),
+                "p99_ms": _quantile(walls, 0.99),
+                "prompt_tokens": prompt_tokens,
+                "cached_tokens": cached_tokens,
+                "completion_tokens": sum(s.get("completion_tokens") or 0 for s in spans),
+                "payload_bytes": sum(s.get("payload_bytes") or 0 for s in spans),
+                "cache_hit_ratio": sum(cached) / len(cached) if cached else None,
+                # Share of prompt tokens the provider served from its prefix cache
+                "cached_token_ratio": cached_tokens / prompt_tokens if prompt_tokens else None,
+                "errors": sum(1 for s in spans if s.get("error")),
+            })
+        return rows
+
+    def export_jsonl(self, fp):
+        """Write every buffered span as one JSON line to a file object"""
+        for s in list(self._spans):
+            fp.write(json.dumps(s, default=str) + "\n")
+
+    def jsonl(self):
+        return "".join(json.dumps(s, default=str) + "\n" for s in list(self._spans))
+
+    def prometheus(self):
+        """Prometheus text exposition of the spans currently in the buffer"""
+        lines = [
+            "# HELP travel_span_duration_ms Wall time of traced operations in the ring buffer",
+            "# TYPE travel_span_duration_ms summary",
+        ]
+        token_lines, cache_lines, prefix_lines = [], [], []
+        for row in self.summary():
+            labels = f'kind="{row["kind"]}",name="{row["name"]}"'
+            for q in ("0.5", "0.95", "0.99"):
+                key = {"0.5": "p50_ms", "0.95": "p95_ms", "0.99": "p99_ms"}[q]
+                lines.append(f'travel_span_duration_ms{{{labels},quantile="{q}"}} {row[key]:.3f}')
+            spans = self.spans(row["kind"], row["name"])
+            lines.append(f"travel_span_duration_ms_sum{{{labels}}} {sum(s['wall_ms'] for s in spans):.3f}")
+            lines.append(f"travel_span_duration_ms_count{{{labels}}} {row['count']}")
+            if row["prompt_tokens"] or row["completion_tokens"]:
+                token_lines.append(f'travel_tokens{{{labels},type="prompt"}} {row["prompt_tokens"]}')
+                token_lines.append(f'travel_tokens{{{labels},type="completion"}} {row["completion_tokens"]}')
+                token_lines.append(f'travel_tokens{{{labels},type="cached"}} {row["cached_tokens"]}')
+            if row["cached_token_ratio"] is not None:
+                prefix_lines.append(f'travel_cached_token_ratio{{{labels}}} {row["cached_token_ratio"]:.4f}')
+            if row["cache_hit_ratio"] is not None:
+                cache_lines.append(f"travel_cache_hit_ratio{{{labels}}} {row['cache_hit_ratio']:.4f}")
+        if token_lines:
+            lines += ["# HELP travel_tokens Tokens used by traced LLM calls in the ring buffer",
+                      "# TYPE travel_tokens gauge"] + token_lines
+        if cache_lines:
+            lines += ["# HELP travel_cache_hit_ratio Share of traced calls served from cache",
+                      "# TYPE travel_cache_hit_ratio gauge"] + cache_lines
+        if prefix_lines:
+            lines += ["# HELP travel_cached_token_ratio Share of prompt tokens served from the provider's prefix cache",
+                      "# TYPE travel_cached_token_ratio gauge"] + prefix_lines
+        return "\n".join(lines) + "\n"
+
+
+def _quantile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    return statistics.quantiles(sorted_values, n=100, method="inclusive")[round(q * 100) - 1]
+
+
+tracer = Tracer(maxlen=int(os.getenv("TRACE_BUFFER_SIZE", "5000")))
+
+
+@contextlib.contextmanager
+def span(kind, name, **fields):
+    """Time the enclosed block and record it; yields the (mutable) span dict"""
+    record = {"kind": kind, "name": name, **fields}
+    token = _current_span.set(record)
+    start = time.perf_counter()
+    try:
+        yield record
+    except BaseException:
+        record["error"] = True
+        raise
+    finally:
+        record["wall_ms"] = (time.perf_counter() - start) * 1000
+        record["ts"] = time.time()
+        _current_span.reset(token)
+        tracer.add(record)
+
+
+def annotate(**fields):
+    """Attach fields to the innermost active span, if any"""
+    record = _current_span.get()
+    if record is not None:
+        record.update(fields)
+
+
+def payload_size(value):
+    if isinstance(value, (bytes, str)):
+        return len(value)
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return len(str(value))
+
+
+class TracingMiddleware:
+    """ToolRegistry middleware recording one "tool" span per call"""
+
+    def call(self, tool, args, call_next):
+        with span("tool", tool.name) as record:
+            result = call_next(args)
+            record["payload_bytes"] = payload_size(result)
+            return result
+
+    async def acall(self, tool, args, call_next):
+        with span("tool", tool.name) as record:
+            result = await call_next(args)
+            record["payload_bytes"] = payload_size(result)
+            return result
@@ -0,0 +1,38 @@
+"""
+Structured flight and hotel search.
+
+Typed FlightOffer/HotelOffer records come from pluggable providers
+(TRAVEL_SEARCH_PROVIDERS, default "serpapi"). Each search is fanned out to
+every provider at once. The results are merged, deduplicated across
+providers and ranked, so the model gets a handful of small offers instead
+of pages of web results.
+"""
+from travel_core.travel_search.offers import FlightOffer, FlightQuery, HotelOffer, HotelQuery, parse_date
+from travel_core.travel_search.providers import (
+    PROVIDERS,
+    FixtureProvider,
+    Provider,
+    SearchError,
+    SerpApiProvider,
+    build_providers,
+)
+from travel_core.travel_search.engine import TravelSearch, merge, rank_flights, rank_hotels, travel_search
+
+__all__ = [
+    "FlightOffer",
+    "FlightQuery",
+    "HotelOffer",
+    "HotelQuery",
+    "parse_date",
+    "PROVIDERS",
+    "Provider",
+    "SearchError",
+    "SerpApiProvider",
+    "FixtureProvider",
+    "build_providers",
+    "TravelSearch",
+    "travel_search",
+    "merge",
+    "rank_flights",
+    "rank_hotels",
+]
@@ -0,0 +1,116 @@
+"""Fan a search out to every configured provider, then merge, dedupe and rank the offers"""
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from travel_core.tracing import span
+from travel_core.travel_search.providers import SearchError, build_providers
+
+MAX_RESULTS = int(os.getenv("TRAVEL_SEARCH_MAX_RESULTS", "5"))
+
+# Sync searches fan out here; async ones run on the caller's event loop
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="travel-search")
+
+
+def _price(offer):
+    return getattr(offer, "price", None) or getattr(offer, "price_per_night", None) or 0.0
+
+
+def merge(offers):
+    """Drop offers several providers returned, keeping the cheapest copy, in first-seen order"""
+    best = {}
+    for offer in offers:
+        key = offer.key()
+        if key not in best or _price(offer) < _price(best[key]):
+            best[key] = offer
+    return list(best.values())
+
+
+def rank_flights(offers, sort="best"):
+    if not offers:
+        return []
+    if sort == "price":
+        return sorted(offers, key=lambda o: (o.price, o.duration_min))
+    if sort == "duration":
+        return sorted(offers, key=lambda o: (o.duration_min, o.price))
+    cheapest = min(o.price for o in offers) or 1.0
+    fastest = min(o.duration_min for o in offers) or 1
+    # Price and time relative to the best on offer, and every stop costs a bit more
+    return sorted(offers, key=lambda o: o.price / cheapest + 0.5 * o.duration_min / fastest + 0.25 * o.stops)
+
+
+def rank_hotels(offers, sort="best"):
+    if not offers:
+        return []
+    if sort == "price":
+        return sorted(offers, key=lambda o: (o.price_per_night, -(o.rating or 0)))
+    if sort == "rating":
+        return sorted(offers, key=lambda o: (-(o.rating or 0), o.price_per_night))
+    cheapest = min(o.price_per_night for o in offers) or 1.0
+    # Each rating point above or below 4 is worth half the cheapest nightly rate; unrated counts as 3.5
+    return sorted(offers, key=lambda o: o.price_per_night / cheapest - 0.5 * ((o.rating or 3.5) - 4))
+
+
+class TravelSearch:
+    def __init__(self, providers, max_results=MAX_RESULTS):
+        self.providers = providers
+        self.max_results = max_results
+
+    @staticmethod
+    def _failed(record, error):
+        record["error"] = True
+        # SearchError messages are written for the model; anything else is a broken
+        # adapter, which shouldn't take the other providers' results down with it
+        return [], str(error) if isinstance(error, SearchError) else type(error).__name__
+
+    def _one(self, provider, kind, query):
+        """One provider's search: (offers, error message or None)"""
+        with span("search", f"{provider.name}.{kind}") as record:
+            try:
+                offers = getattr(provider, f"search_{kind}")(query)
+            except Exception as e:
+                return self._failed(record, e)
+            record["results"] = len(offers)
+            return offers, None
+
+    async def _aone(self, provider, kind, query):
+        with span("search", f"{provider.name}.{kind}") as record:
+            try:
+                offers = await getattr(provider, f"asearch_{kind}")(query)
+            except Exception as e:
+                return self._failed(record, e)
+            record["results"] = len(offers)
+            return offers, None
+
+    def _collect(self, results, rank, sort, limit):
+        offers, errors = [], {}
+        for provider, (found, error) in zip(self.providers, results):
+            offers.extend(found)
+            if error:
+                errors[provider.name] = error
+        return rank(merge(offers), sort)[:limit or self.max_results], errors
+
+    def _fan_out(self, kind, query):
+        if len(self.providers) == 1:
+            return [self._one(self.providers[0], kind, query)]
+        return list(_executor.map(lambda p: self._one(p, kind, query), self.providers))
+
+    async def _afan_out(self, kind, query):
+        return await asyncio.gather(*(self._aone(p, kind, query) for p in self.providers))
+
+    def search_flights(self, query, sort="best", limit=None):
+        """(ranked FlightOffers, {provider: error}) across every provider"""
+        return self._collect(self._fan_out("flights", query), rank_flights, sort, limit)
+
+    async def asearch_flights(self, query, sort="best", limit=None):
+        return self._collect(await self._afan_out("flights", query), rank_flights, sort, limit)
+
+    def search_hotels(self, query, sort="best", limit=None):
+        """(ranked HotelOffers, {provider: error}) across every provider"""
+        return self._collect(self._fan_out("hotels", query), rank_hotels, sort, limit)
+
+    async def asearch_hotels(self, query, sort="best", limit=None):
+        return self._collect(await self._afan_out("hotels", query), rank_hotels, sort, limit)
+
+
+travel_search = TravelSearch(build_providers(os.getenv("TRAVEL_SEARCH_PROVIDERS", "serpapi")))
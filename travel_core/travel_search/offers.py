@@ -0,0 +1,98 @@
+"""Typed search queries and offers; offers serialize to the few fields the model needs"""
+from dataclasses import asdict, dataclass
+from datetime import date
+
+from travel_core.weather_cache import normalize_city
+
+PRICE_FIELDS = ("price", "price_per_night", "total_price")
+
+
+def _compact(row):
+    """Drop empty fields and write whole-number prices without the ".0" """
+    for field in PRICE_FIELDS:
+        if isinstance(row.get(field), float) and row[field].is_integer():
+            row[field] = int(row[field])
+    return {k: v for k, v in row.items() if v not in (None, "", [])}
+
+
+def parse_date(value, field):
+    """ISO date string, or ValueError with a message the model can act on"""
+    try:
+        return date.fromisoformat(str(value)).isoformat()
+    except ValueError:
+        raise ValueError(f"{field} must be a date like 2025-06-05, got {value!r}") from None
+
+
+@dataclass(slots=True, frozen=True)
+class FlightQuery:
+    origin: str                 # IATA airport or city code, e.g. "JFK" or "PAR"
+    destination: str
+    outbound_date: str          # YYYY-MM-DD
+    return_date: str | None = None
+    adults: int = 1
+    currency: str = "USD"
+
+
+@dataclass(slots=True, frozen=True)
+class HotelQuery:
+    location: str
+    check_in_date: str
+    check_out_date: str
+    adults: int = 2
+    currency: str = "USD"
+
+    @property
+    def nights(self):
+        return max(1, (date.fromisoformat(self.check_out_date) - date.fromisoformat(self.check_in_date)).days)
+
+
+@dataclass(slots=True, frozen=True)
+class FlightOffer:
+    provider: str
+    price: float
+    currency: str
+    airline: str
+    origin: str
+    destination: str
+    departure: str              # local time, "2025-06-05 08:30"
+    arrival: str
+    duration_min: int
+    stops: int
+    flight_numbers: tuple[str, ...] = ()
+
+    def key(self):
+        """Same itinerary from different providers: same flights on the same day"""
+        if self.flight_numbers:
+            return ("flight", self.flight_numbers, self.departure[:10])
+        return ("flight", self.airline.lower(), self.origin, self.destination, self.departure)
+
+    def to_dict(self):
+        row = asdict(self)
+        del row["provider"]
+        row["flight_numbers"] = list(self.flight_numbers)
+        return _compact(row)
+
+
+@dataclass(slots=True, frozen=True)
+class HotelOffer:
+    provider: str
+    name: str
+    price_per_night: float
+    currency: str
+    total_price: float | None = None
+    rating: float | None = None
+    reviews: int | None = None
+    hotel_class: int | None = None
+    lat: float | None = None
+    lon: float | None = None
+    link: str | None = None
+
+    def key(self):
+        """Same property from different providers (results are for one location already)"""
+        return ("hotel", normalize_city(self.name))
+
+    def to_dict(self):
+        row = asdict(self)
+        for field in ("provider", "lat", "lon"):
+            del row[field]
+        return _compact(row)
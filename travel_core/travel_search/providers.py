@@ -0,0 +1,303 @@
+"""
+Provider adapters: each turns a FlightQuery/HotelQuery into a list of offers.
+
+  serpapi   SerpAPI's google_flights and google_hotels engines
+  fixture   offers from a local JSON file, for tests and offline benchmarks
+
+Providers raise SearchError when they can't answer; the engine reports that
+provider as failed and carries on with the others.
+"""
+import asyncio
+import json
+import os
+from datetime import datetime, timedelta
+
+import requests
+
+from travel_core import async_http_client, http_client
+from travel_core.rate_limit import rate_limits
+from travel_core.serp_cache import serp_cache
+from travel_core.tracing import annotate
+from travel_core.travel_search.offers import FlightOffer, HotelOffer
+from travel_core.weather_cache import normalize_city
+
+# Overridable so benchmarks can point the provider at a local stand-in
+SERP_URL = os.getenv("SERP_API_URL", "https://serpapi.com/search")
+FIXTURES_PATH = os.getenv(
+    "TRAVEL_SEARCH_FIXTURES",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                 "data", "travel_search", "fixtures.json"),
+)
+
+
+class SearchError(Exception):
+    """A provider couldn't answer; the message is safe to show the model"""
+
+
+class Provider:
+    """Base adapter; async methods default to the sync ones on a worker thread"""
+
+    name = "provider"
+
+    def search_flights(self, query):
+        return []
+
+    def search_hotels(self, query):
+        return []
+
+    async def asearch_flights(self, query):
+        return await asyncio.to_thread(self.search_flights, query)
+
+    async def asearch_hotels(self, query):
+        return await asyncio.to_thread(self.search_hotels, query)
+
+
+def parse_flights(data, currency, provider="serpapi"):
+    """FlightOffers from a google_flights response (best_flights first)"""
+    offers = []
+    for group in ("best_flights", "other_flights"):
+        for item in data.get(group) or []:
+            legs = item.get("flights") or []
+            if not legs or item.get("price") is None:
+                continue
+            departure = legs[0].get("departure_airport") or {}
+            arrival = legs[-1].get("arrival_airport") or {}
+            airlines = dict.fromkeys(leg["airline"] for leg in legs if leg.get("airline"))
+            offers.append(FlightOffer(
+                provider=provider,
+                price=float(item["price"]),
+                currency=currency,
+                airline=" / ".join(airlines) or "Unknown",
+                origin=departure.get("id", ""),
+                destination=arrival.get("id", ""),
+                departure=departure.get("time", ""),
+                arrival=arrival.get("time", ""),
+                duration_min=int(item.get("total_duration") or sum(leg.get("duration") or 0 for leg in legs)),
+                stops=len(legs) - 1,
+                flight_numbers=tuple(leg["flight_number"] for leg in legs if leg.get("flight_number")),
+            ))
+    return offers
+
+
+def parse_hotels(data, currency, provider="serpapi"):
+    """HotelOffers from a google_hotels response; properties without a nightly rate are skipped"""
+    offers = []
+    for prop in data.get("properties") or []:
+        nightly = (prop.get("rate_per_night") or {}).get("extracted_lowest")
+        if nightly is None or not prop.get("name"):
+            continue
+        total = (prop.get("total_rate") or {}).get("extracted_lowest")
+        gps = prop.get("gps_coordinates") or {}
+        offers.append(HotelOffer(
+            provider=provider,
+            name=prop["name"],
+            price_per_night=float(nightly),
+            currency=currency,
+            total_price=float(total) if total is not None else None,
+            rating=prop.get("overall_rating"),
+            reviews=prop.get("reviews"),
+            hotel_class=prop.get("extracted_hotel_class"),
+            lat=gps.get("latitude"),
+            lon=gps.get("longitude"),
+            link=prop.get("link"),
+        ))
+    return offers
+
+
+class SerpApiProvider(Provider):
+    name = "serpapi"
+
+    def __init__(self, base_url=SERP_URL):
+        self.base_url = base_url
+
+    def _params(self, engine, **params):
+        serp_api_key = os.getenv("SERP_API_KEY")
+        if serp_api_key is None:
+            raise SearchError("SERP API key is not set")
+        return {
+            "engine": engine,
+            "hl": "en",
+            "gl": "us",
+            **{k: v for k, v in params.items() if v is not None},
+            "api_key": serp_api_key,
+        }
+
+    @staticmethod
+    def _flight_params(query):
+        return {
+            "departure_id": query.origin.upper(),
+            "arrival_id": query.destination.upper(),
+            "outbound_date": query.outbound_date,
+            "return_date": query.return_date,
+            "type": "1" if query.return_date else "2",  # round trip / one way
+            "adults": query.adults,
+            "currency": query.currency,
+        }
+
+    @staticmethod
+    def _hotel_params(query):
+        return {
+            "q": query.location,
+            "check_in_date": query.check_in_date,
+            "check_out_date": query.check_out_date,
+            "adults": query.adults,
+            "currency": query.currency,
+        }
+
+    @staticmethod
+    def _decode(raw):
+        try:
+            data = json.loads(raw)
+        except (TypeError, ValueError):
+            raise SearchError("unreadable response") from None
+        if not isinstance(data, dict):
+            raise SearchError("unreadable response")
+        if data.get("error"):
+            raise SearchError(str(data["error"]))
+        return data
+
+    def _fetch(self, search_params):
+        cached = serp_cache.get(search_params)
+        annotate(cache_hit=cached is not None)
+        if cached is not None:
+            return self._decode(cached)
+
+        rate_limits["serp"].acquire()
+        try:
+            response = http_client.get(self.base_url, params=search_params)
+        except requests.RequestException as e:
+            # Don't echo the exception text, it contains the URL with the API key
+            raise SearchError(type(e).__name__) from None
+        if response.status_code != 200:
+            raise SearchError(f"HTTP {response.status_code}")
+        data = self._decode(response.content)
+        serp_cache.put(search_params, response.content)
+        return data
+
+    async def _afetch(self, search_params):
+        # Only the async path needs httpx, so it isn't imported with the module
+        import httpx
+
+        cached = serp_cache.get(search_params)
+        annotate(cache_hit=cached is not None)
+        if cached is not None:
+            return self._decode(cached)
+
+        await rate_limits["serp"].aacquire()
+        try:
+            response = await async_http_client.get(self.base_url, params=search_params)
+        except httpx.HTTPError as e:
+            raise SearchError(type(e).__name__) from None
+        if response.status_code != 200:
+            raise SearchError(f"HTTP {response.status_code}")
+        data = self._decode(response.content)
+        serp_cache.put(search_params, response.content)
+        return data
+
+    def search_flights(self, query):
+        data = self._fetch(self._params("google_flights", **self._flight_params(query)))
+        return parse_flights(data, query.currency, self.name)
+
+    async def asearch_flights(self, query):
+        data = await self._afetch(self._params("google_flights", **self._flight_params(query)))
+        return parse_flights(data, query.currency, self.name)
+
+    def search_hotels(self, query):
+        data = self._fetch(self._params("google_hotels", **self._hotel_params(query)))
+        return parse_hotels(data, query.currency, self.name)
+
+    async def asearch_hotels(self, query):
+        data = await self._afetch(self._params("google_hotels", **self._hotel_params(query)))
+        return parse_hotels(data, query.currency, self.name)
+
+
+class FixtureProvider(Provider):
+    """
+    Offers from a JSON file: {"flights": [...], "hotels": [...]}. Flights match
+    on origin/destination and depart on the query's date, arriving
+    duration_min later (times are treated as one clock); hotels match on the city
+    part of "location". Prices are used as-is, whatever the query's currency.
+    """
+
+    name = "fixture"
+
+    def __init__(self, path=FIXTURES_PATH):
+        self.path = path
+        self._data = None
+
+    def _fixtures(self):
+        if self._data is None:
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    self._data = json.load(f)
+            except (OSError, ValueError) as e:
+                raise SearchError(f"no fixtures at {self.path} ({type(e).__name__})") from None
+        return self._data
+
+    def search_flights(self, query):
+        route = (query.origin.upper(), query.destination.upper())
+        offers = []
+        for item in self._fixtures().get("flights") or []:
+            if (item["origin"].upper(), item["destination"].upper()) != route:
+                continue
+            # Arrival follows from the duration, so overnight flights land the next day
+            departure = datetime.strptime(f"{query.outbound_date} {item['departure_time']}", "%Y-%m-%d %H:%M")
+            arrival = departure + timedelta(minutes=int(item["duration_min"]))
+            offers.append(FlightOffer(
+                provider=self.name,
+                price=float(item["price"]),
+                currency=item.get("currency", query.currency),
+                airline=item["airline"],
+                origin=item["origin"],
+                destination=item["destination"],
+                departure=departure.strftime("%Y-%m-%d %H:%M"),
+                arrival=arrival.strftime("%Y-%m-%d %H:%M"),
+                duration_min=int(item["duration_min"]),
+                stops=int(item.get("stops", 0)),
+                flight_numbers=tuple(item.get("flight_numbers") or ()),
+            ))
+        return offers
+
+    def search_hotels(self, query):
+        city = normalize_city(query.location).split(",")[0]
+        nights = query.nights
+        offers = []
+        for item in self._fixtures().get("hotels") or []:
+            if normalize_city(item["location"]).split(",")[0] != city:
+                continue
+            offers.append(HotelOffer(
+                provider=self.name,
+                name=item["name"],
+                price_per_night=float(item["price_per_night"]),
+                currency=item.get("currency", query.currency),
+                total_price=float(item["price_per_night"]) * nights,
+                rating=item.get("rating"),
+                reviews=item.get("reviews"),
+                hotel_class=item.get("hotel_class"),
+                link=item.get("link"),
+            ))
+        return offers
+
+    async def asearch_flights(self, query):
+        return self.search_flights(query)
+
+    async def asearch_hotels(self, query):
+        return self.search_hotels(query)
+
+
+PROVIDERS = {
+    "serpapi": SerpApiProvider,
+    "fixture": FixtureProvider,
+}
+
+
+def build_providers(names):
+    """Provider instances for a comma-separated list of names ("serpapi,fixture")"""
+    providers = []
+    for name in (n.strip().lower() for n in names.split(",")):
+        if not name:
+            continue
+        if name not in PROVIDERS:
+            raise ValueError(f"unknown travel search provider {name!r}; known: {', '.join(PROVIDERS)}")
+        providers.append(PROVIDERS[name]())
+    return providers
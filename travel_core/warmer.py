@@ -0,0 +1,97 @@
+"""
+Background pre-computation of the UI's quick-action answers.
+
+The quick-action buttons send fixed prompts, so their answers (and the
+weather for the cities they mention) are computed ahead of time on a
+schedule. get() serves whatever is stored immediately and, when the entry
+is older than max_age, kicks off a refresh in the background.
+"""
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from travel_core.agent_runner import run_agent
+from travel_core.tools import registry
+
+
+class QuickActionWarmer:
+    """Keeps fresh answers for a fixed set of prompts"""
+
+    def __init__(self, agent, prompts, cities=(), max_age=1800.0, interval=60.0):
+        self.agent = agent
+        self.prompts = list(prompts)
+        self.cities = list(cities)
+        self.max_age = max_age
+        self.interval = interval
+        self._answers = {}  # prompt -> (answer, computed_at)
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="warmer")
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="quick-action-warmer", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def get(self, prompt):
+        """(answer, computed_at) for a warmed prompt, or None if not computed yet"""
+        with self._lock:
+            entry = self._answers.get(prompt)
+        if entry is None or time.time() - entry[1] > self.max_age:
+            self.refresh_async(prompt)
+        return entry
+
+    def refresh_async(self, prompt):
+        with self._lock:
+            if prompt in self._refreshing:
+                return
+            self._refreshing.add(prompt)
+        self._executor.submit(self._refresh, prompt)
+
+    def _refresh(self, prompt):
+        # Scratch thread so the warm-up run never leaks into a user's conversation
+        thread_id = f"warm-{uuid.uuid4().hex}"
+        try:
+            result = run_agent(self.agent, prompt, thread_id)
+            answer = next(
+                (m.content for m in reversed(result["messages"])
+                 if m.type == "ai" and isinstance(m.content, str) and m.content.strip()),
+                None,
+            )
+            if answer:
+                with self._lock:
+                    self._answers[prompt] = (answer, time.time())
+        except Exception as e:
+            print(f"Quick action warm-up failed for {prompt!r}: {e}")
+        finally:
+            self.agent.checkpointer.delete_thread(thread_id)
+            with self._lock:
+                self._refreshing.discard(prompt)
+
+    def _run(self):
+        while True:
+            # Weather goes through the shared cache, so this only refetches expired cities
+            for city in self.cities:
+                try:
+                    registry.call("get_weather", {"city": city})
+                except Exception as e:
+                    print(f"Quick action weather warm-up failed for {city!r}: {e}")
+            # One bad pass must not end the loop: the thread is never restarted
+            try:
+                now = time.time()
+                for prompt in self.prompts:
+                    with self._lock:
+                        entry = self._answers.get(prompt)
+                    if entry is None or now - entry[1] > self.max_age:
+                        self.refresh_async(prompt)
+            except Exception as e:
+                print(f"Quick action warm-up pass failed: {e}")
+            if self._stop.wait(self.interval):
+                return
@@ -0,0 +1,121 @@
+"""
+Process-wide TTL + LRU cache for OpenWeatherMap lookups.
+
+Every entry point (main.py, langchain/main.py, chat_ui.py) shares the same
+cache, so a city asked about by one user is served from memory for the
+next one until the entry expires.
+"""
+import os
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+
+def normalize_city(city):
+    """Turn a free-form city name into a cache key ("  São Paulo , BR" -> "sao paulo,br")"""
+    text = str(city)
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text)
+        text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    parts = [" ".join(part.split()).lower() for part in text.split(",")]
+    return ",".join(part for part in parts if part)
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after `ttl` seconds"""
+
+    def __init__(self, maxsize=1024, ttl=600.0, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value, ttl=None):
+        expires_at = self._clock() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        """Snapshot of the hit/miss/eviction counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+class WeatherCache:
+    """TTLCache keyed on gazetteer ids (int) or normalized city names"""
+
+    def __init__(self, maxsize=1024, ttl=600.0):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    @staticmethod
+    def _key(city):
+        return city if isinstance(city, int) else normalize_city(city)
+
+    def get(self, city):
+        return self._cache.get(self._key(city))
+
+    def put(self, city, weather):
+        key = self._key(city)
+        self._cache.put(key, weather)
+        if isinstance(key, int):
+            return
+        # "Paris" resolves to Paris, FR upstream, so remember it under the
+        # qualified key too and let "Paris, FR" hit the same entry.
+        country = weather.get("sys", {}).get("country") if isinstance(weather, dict) else None
+        if country and "," not in key:
+            self._cache.put(f"{key},{country.lower()}", weather)
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self):
+        return self._cache.stats()
+
+
+weather_cache = WeatherCache(
+    maxsize=int(os.getenv("WEATHER_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("WEATHER_CACHE_TTL", "600")),
+)